@@ -56,11 +56,11 @@ tab1, tab2 = st.tabs(["📤 Upload Document", "📊 My Submissions"])
 
 with tab1:
     st.markdown("### Upload Company Document")
-    st.write("Upload your company information PDF for automated verification.")
+    st.write("Upload your company information PDF, or a text, Markdown or email (.eml) version, for automated verification.")
     
     uploaded_file = st.file_uploader(
-        "Choose PDF file",
-        type="pdf",
+        "Choose file",
+        type=["pdf", "txt", "md", "eml"],
         help="Company registration, profile, or certification"
     )
     
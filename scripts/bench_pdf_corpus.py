@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+PDF extraction throughput and accuracy over a synthetic corpus
+
+Drives PDFExtractor.extract_many over a corpus written by
+scripts/generate_test_pdfs.py --corpus N and reports documents and pages
+per second, the peak RSS of the benchmark process and of its largest
+worker, and per-field accuracy against the generator's ground truth:
+"exact" counts values extracted exactly (whitespace collapsed), "found"
+values the extracted text contains, so the gap is over-capture by a
+pattern rather than a miss. Pages per second counts every page of each
+document, read or not, so --stop-when-complete and --max-pages runs
+compare directly with full reads.
+"""
+import argparse
+import json
+import resource
+import sys
+import time
+from pathlib import Path
+
+# Ensure project root is in path
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from tabulate import tabulate
+
+from src.tools.pdf_extractor import PDFExtractor
+
+
+def _peak_rss_mib(who: int) -> float:
+    """ru_maxrss in MiB: kilobytes on Linux, bytes on macOS"""
+    peak = resource.getrusage(who).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+def _normalize(value) -> str:
+    return " ".join(str(value or "").split())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark PDF extraction over a synthetic corpus')
+    parser.add_argument('corpus', nargs='?', default='data/corpus',
+                        help='Directory written by generate_test_pdfs.py --corpus')
+    parser.add_argument('--limit', type=int, help='Only the first N documents')
+    parser.add_argument('--workers', type=int, help='Extraction processes (default: one per core)')
+    parser.add_argument('--timeout', type=float, default=60.0, help='Per-document timeout in seconds')
+    parser.add_argument('--max-pages', type=int, help='PDFExtractor max_pages')
+    parser.add_argument('--stop-when-complete', action='store_true',
+                        help='Stop reading each document once every field is found')
+    parser.add_argument('--json', type=str, help='Also write the results to this file')
+    args = parser.parse_args()
+
+    corpus = Path(args.corpus)
+    truth_file = corpus / 'ground_truth.jsonl'
+    if not truth_file.exists():
+        parser.error(f"No {truth_file} (run scripts/generate_test_pdfs.py --corpus N --output {corpus})")
+    with open(truth_file) as f:
+        docs = [json.loads(line) for line in f]
+    docs = docs[:args.limit] if args.limit else docs
+    by_path = {str(corpus / doc['file']): doc for doc in docs}
+
+    extractor = PDFExtractor(max_pages=args.max_pages, stop_when_complete=args.stop_when_complete)
+    fields = list(docs[0]['fields'])
+    exact = dict.fromkeys(fields, 0)
+    found = dict.fromkeys(fields, 0)
+    failed = []
+
+    start = time.perf_counter()
+    for done, (path, result) in enumerate(extractor.extract_many(by_path, args.workers, args.timeout), 1):
+        if not result.success:
+            failed.append((path, result.error))
+        data = result.data or {}
+        for field, expected in by_path[path]['fields'].items():
+            value, expected = _normalize(data.get(field)), _normalize(expected)
+            exact[field] += value == expected
+            found[field] += bool(value) and expected in value
+        if done % 500 == 0:
+            print(f"\r  {done}/{len(docs)} documents", end="", flush=True)
+    elapsed = time.perf_counter() - start
+    if len(docs) >= 500:
+        print()
+
+    pages = sum(doc['pages'] for doc in docs)
+    results = {
+        "documents": len(docs),
+        "pages": pages,
+        "seconds": elapsed,
+        "documents_per_s": len(docs) / elapsed,
+        "pages_per_s": pages / elapsed,
+        "peak_rss_mib": _peak_rss_mib(resource.RUSAGE_SELF),
+        "peak_worker_rss_mib": _peak_rss_mib(resource.RUSAGE_CHILDREN),
+        "failed": len(failed),
+        "accuracy": {field: {"exact": exact[field] / len(docs), "found": found[field] / len(docs)}
+                     for field in fields},
+    }
+
+    print(f"{len(docs)} documents, {pages} pages in {elapsed:.1f}s: "
+          f"{results['documents_per_s']:.1f} documents/s, {results['pages_per_s']:.1f} pages/s")
+    print(f"Peak RSS: {results['peak_rss_mib']:.0f} MiB (benchmark), "
+          f"{results['peak_worker_rss_mib']:.0f} MiB (largest worker); {len(failed)} failed")
+    for path, error in failed[:5]:
+        print(f"  ✗ {path}: {error}")
+    print(tabulate(
+        [[field, f"{r['exact']:.1%}", f"{r['found']:.1%}"] for field, r in results["accuracy"].items()],
+        headers=["Field", "Exact", "Found"], tablefmt="simple",
+    ))
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+        print(f"✓ Wrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+PDF field extraction microbenchmark on the bundled test PDFs
+
+Text is extracted from every PDF once; field extraction then runs
+--repeat times over all texts, with the precompiled patterns and with the
+previous per-call re.search(pattern, text, flags), and the table gives the
+mean time per document. Both must extract identical fields.
+"""
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+# Ensure project root is in path
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from tabulate import tabulate
+
+from src.tools.pdf_extractor import PDFExtractor
+
+
+def search_each(extractor: PDFExtractor, text: str) -> dict:
+    """Field extraction as it was before the patterns were precompiled"""
+    values = {}
+    for field, patterns in extractor.patterns.items():
+        for pattern in patterns:
+            match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
+            if match:
+                values[field] = match.group(1).strip()
+                break
+    return values
+
+
+def time_per_doc(extract, texts: list[str], repeat: int) -> float:
+    """Mean microseconds per document"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            extract(text)
+    return (time.perf_counter() - start) / (repeat * len(texts)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark PDF field extraction')
+    parser.add_argument('--pdf-dir', type=str, default='data/test_pdfs')
+    parser.add_argument('--repeat', type=int, default=500)
+    parser.add_argument('--json', type=str, help='Also write the results to this file')
+    args = parser.parse_args()
+
+    pdfs = sorted(Path(args.pdf_dir).glob('*.pdf'))
+    if not pdfs:
+        parser.error(f"No PDFs in {args.pdf_dir} (run scripts/generate_test_pdfs.py)")
+
+    extractor = PDFExtractor()
+    start = time.perf_counter()
+    texts = [extractor.extract_text(pdf) for pdf in pdfs]
+    text_us = (time.perf_counter() - start) / len(pdfs) * 1e6
+
+    mismatched = [pdf.name for pdf, text in zip(pdfs, texts)
+                  if extractor.extract_fields(text) != search_each(extractor, text)]
+    if mismatched:
+        print(f"✗ Field extraction differs for: {', '.join(mismatched)}")
+        sys.exit(1)
+
+    results = [
+        {"step": "text (PyPDF2)", "us_per_doc": text_us},
+        {"step": "fields, re.search per call", "us_per_doc": time_per_doc(
+            lambda text: search_each(extractor, text), texts, args.repeat)},
+        {"step": "fields, precompiled", "us_per_doc": time_per_doc(
+            extractor.extract_fields, texts, args.repeat)},
+    ]
+
+    chars = sum(len(text) for text in texts) / len(texts)
+    print(f"{len(pdfs)} PDFs, {chars:.0f} chars of text on average, {args.repeat} repeats")
+    print(tabulate([[r["step"], f"{r['us_per_doc']:.1f}"] for r in results],
+                   headers=["Step", "µs/doc"], tablefmt="simple"))
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+        print(f"✓ Wrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Sanctions screening benchmark with brute-force recall ground truth
+
+Generates seeded synthetic sanctions lists (1k, 10k and 100k entries by
+default) and noisy vendor queries: typos, legal suffix changes, token swaps,
+transliterated spellings and unrelated names. Every matcher screens the same
+queries; the table gives load time, retained memory, p50/p95/p99 latency,
+throughput and recall against brute force, which is the original
+check_sanctions loop: the best of ratio, partial_ratio and token_sort_ratio
+over every raw list name, with no index and none of the checker's code.
+
+Recall is the share of brute-force matches a matcher reports with the same
+entry name; "Extra" counts matches brute force does not make (phonetic
+matches, by design). "Variants" is the share of transliterated queries
+matched to the entry they were spelled from, which brute force mostly
+misses at the 85 threshold.
+"""
+import argparse
+import gc
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# Ensure project root is in path
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from fuzzywuzzy import fuzz
+from tabulate import tabulate
+
+from src.models import CompanyInfo
+from src.tools.sanctions_checker import SanctionsChecker
+from src.tools.sanctions_snapshot import compile_snapshot
+
+_PREFIXES = (
+    "Global Northern Eastern Golden Silver Iron Red Blue Green Alpha Omega Delta Sigma Atlas Orion "
+    "Phoenix Falcon Eagle Tiger Dragon Lotus Cedar Oak River Ocean Mountain Desert Steel Copper "
+    "Crystal Star Nova Prime Apex Summit Vertex Zenith Titan Horizon Meridian Pacific Baltic Caspian"
+).split()
+_TRADES = (
+    "Trading Holdings Industries Logistics Shipping Petroleum Energy Capital Finance Investments "
+    "Group Partners Ventures Enterprises Resources Mining Metals Chemicals Technologies Systems "
+    "Services Import Export Construction Marine Aviation Defense Textiles Agro Pharma Exchange"
+).split()
+_SUFFIXES = ("Ltd", "LLC", "Inc", "Corp", "Co", "Limited", "SA", "GmbH", "PLC", "AG")
+_SYLLABLES = (
+    "ka ro mi tan zel vor ash eb lin qu dra sho pet iv har mun gol bek sar yu nov ov al ib rah "
+    "im os ten gra"
+).split()
+_LISTS = ("OFAC SDN", "UN Sanctions", "EU Sanctions", "UK HMT")
+_NOISE = ("typo", "suffix", "swap", "transliteration", "unrelated")
+
+# Spelling swaps between romanisations ("sh"/"sch", "yu"/"iu", ...)
+_RESPELLINGS = (
+    ("sh", "sch"), ("yu", "iu"), ("ov", "off"), ("ka", "ca"), ("qu", "kv"),
+    ("rah", "ra"), ("ib", "yb"), ("im", "ym"), ("ash", "ach"), ("dra", "dhra"),
+)
+# Latin to Cyrillic, digraphs first, for names written in Cyrillic script
+_TO_CYRILLIC = (
+    ("shch", "щ"), ("sh", "ш"), ("ch", "ч"), ("zh", "ж"), ("kh", "х"), ("ts", "ц"),
+    ("yu", "ю"), ("ya", "я"), ("a", "а"), ("b", "б"), ("v", "в"), ("g", "г"),
+    ("d", "д"), ("e", "е"), ("z", "з"), ("i", "и"), ("y", "ы"), ("k", "к"),
+    ("l", "л"), ("m", "м"), ("n", "н"), ("o", "о"), ("p", "п"), ("r", "р"),
+    ("s", "с"), ("t", "т"), ("u", "у"), ("f", "ф"), ("h", "х"), ("q", "к"),
+    ("c", "к"), ("w", "в"), ("x", "кс"), ("j", "дж"),
+)
+
+# SanctionsChecker's default match threshold
+MATCH_THRESHOLD = 85
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+
+
+def make_list(size: int, seed: int) -> list[tuple[str, str, str]]:
+    """(name, list, details) rows of made-up companies and coined names"""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(size):
+        tokens = [_word(rng) for _ in range(rng.randint(1, 2))]
+        if rng.random() < 0.5:
+            tokens.insert(0, rng.choice(_PREFIXES))
+        tokens.append(rng.choice(_TRADES))
+        if rng.random() < 0.7:
+            tokens.append(rng.choice(_SUFFIXES))
+        rows.append((" ".join(tokens), rng.choice(_LISTS), f"Synthetic entry {i}"))
+    return rows
+
+
+def _cyrillic(word: str) -> str:
+    """A Latin word written in Cyrillic script"""
+    word = word.lower()
+    for latin, cyrillic in _TO_CYRILLIC:
+        word = word.replace(latin, cyrillic)
+    return word
+
+
+def _transliteration(tokens: list[str], rng: random.Random) -> str:
+    """A name respelled in another romanisation, or its coined words in Cyrillic"""
+    known = set(_PREFIXES) | set(_TRADES) | set(_SUFFIXES)
+    coined = [i for i, token in enumerate(tokens) if token not in known]
+    if coined and rng.random() < 0.3:
+        return " ".join(_cyrillic(t) if i in coined else t for i, t in enumerate(tokens))
+
+    respelled = []
+    for i, token in enumerate(tokens):
+        if i in coined:
+            for old, new in rng.sample(_RESPELLINGS, len(_RESPELLINGS)):
+                if old in token.lower():
+                    token = token.lower().replace(old, new, 1).capitalize()
+                    break
+        respelled.append(token)
+    if respelled == tokens and coined:
+        respelled[coined[0]] = _cyrillic(tokens[coined[0]])
+    return " ".join(respelled)
+
+
+def make_queries(names: list[str], count: int, seed: int) -> list[tuple[str, str, str]]:
+    """
+    (noise kind, query, source name) triples cycling through typo, suffix,
+    swap, transliteration and unrelated; unrelated queries have no source
+    """
+    rng = random.Random(seed)
+    queries = []
+    for i in range(count):
+        kind = _NOISE[i % len(_NOISE)]
+        name = rng.choice(names)
+        tokens = name.split()
+        if kind == "typo":
+            chars = list(name)
+            pos = rng.randrange(len(chars))
+            edit = rng.random()
+            if edit < 1 / 3:
+                chars[pos] = rng.choice("abcdefghijklmnopqrstuvwxyz")
+            elif edit < 2 / 3:
+                del chars[pos]
+            else:
+                chars.insert(pos, rng.choice("abcdefghijklmnopqrstuvwxyz"))
+            query = "".join(chars)
+        elif kind == "suffix":
+            if tokens[-1] in _SUFFIXES:
+                tokens = tokens[:-1] if rng.random() < 0.5 else tokens[:-1] + [rng.choice(_SUFFIXES)]
+            else:
+                tokens.append(rng.choice(_SUFFIXES))
+            query = " ".join(tokens)
+        elif kind == "swap" and len(tokens) > 1:
+            i = rng.randrange(len(tokens) - 1)
+            tokens[i], tokens[i + 1] = tokens[i + 1], tokens[i]
+            query = " ".join(tokens)
+        elif kind == "transliteration":
+            query = _transliteration(tokens, rng)
+        else:
+            query = " ".join([_word(rng), rng.choice(_TRADES), rng.choice(_SUFFIXES)])
+            name = ""
+        queries.append((kind, query, name))
+    return queries
+
+
+def _retained_mib(load) -> float:
+    """Memory still allocated after a load, measured on a separate load (tracing slows it down)"""
+    gc.collect()
+    tracemalloc.start()
+    loaded = load()
+    retained = tracemalloc.get_traced_memory()[0] / 2 ** 20
+    tracemalloc.stop()
+    loaded.close()
+    return retained
+
+
+def _loader(list_file: Path, snapshot_file: Path, top_k: int = 0, phonetic: bool = False,
+            workers: int = 1):
+    def load():
+        checker = SanctionsChecker(str(list_file), snapshot_file=str(snapshot_file),
+                                   auto_reload=False, workers=workers)
+        checker.top_k = top_k
+        checker.phonetic_threshold = 65 if phonetic else None
+        if phonetic:
+            checker._phonetic_index()  # Count the build in load time and memory
+        return checker
+    return load
+
+
+class BruteForce:
+    """The original check_sanctions loop over the raw list rows"""
+
+    def __init__(self, rows: list[tuple[str, str, str]]):
+        self.rows = rows
+
+    def screen(self, query: str) -> dict:
+        """match, matched_name and match_score of the best entry"""
+        company_name = query.lower()
+        best_match, best_score = None, 0
+        for row in self.rows:
+            name = row[0].lower()
+            score = max(fuzz.ratio(company_name, name), fuzz.partial_ratio(company_name, name),
+                        fuzz.token_sort_ratio(company_name, name))
+            if score > best_score:
+                best_match, best_score = row, score
+        match = best_score >= MATCH_THRESHOLD
+        return {"match": match, "matched_name": best_match[0] if match else None,
+                "match_score": best_score / 100.0}
+
+    def close(self) -> None:
+        pass
+
+
+def _brute_force(brute_force: BruteForce, query: str) -> dict:
+    return brute_force.screen(query)
+
+
+def _single(checker: SanctionsChecker, query: str) -> dict:
+    return checker.check_sanctions(CompanyInfo(company_name=query)).data
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))]
+
+
+def bench_size(size: int, args) -> list[dict]:
+    """Results of every matcher on one synthetic list size"""
+    rows = make_list(size, args.seed)
+    queries = make_queries([row[0] for row in rows], args.queries, args.seed + 1)
+    with tempfile.TemporaryDirectory() as tmp:
+        list_file = Path(tmp) / "sanctions_list.txt"
+        list_file.write_text("".join(f"{n} | {l} | {d}\n" for n, l, d in rows))
+        snapshot_file = compile_snapshot(list_file, Path(tmp) / "compiled.snap")
+        no_snapshot = Path(tmp) / "missing.snap"
+
+        matchers = [
+            ("brute-force", lambda: BruteForce(rows), _brute_force),
+            ("indexed", _loader(list_file, no_snapshot), _single),
+            ("snapshot", _loader(list_file, snapshot_file), _single),
+            ("ranked top-5", _loader(list_file, no_snapshot, top_k=5), _single),
+            ("phonetic", _loader(list_file, no_snapshot, phonetic=True), _single),
+            ("batch", _loader(list_file, no_snapshot), None),
+        ]
+        if args.workers > 1:
+            matchers.append((f"{args.workers} shards", _loader(list_file, no_snapshot, workers=args.workers),
+                             _single))
+
+        truth = None
+        results = []
+        for label, load, screen in matchers:
+            memory = _retained_mib(load) if args.memory else None
+            start = time.perf_counter()
+            checker = load()
+            load_time = time.perf_counter() - start
+            try:
+                latencies = []
+                if screen is None:
+                    start = time.perf_counter()
+                    outcomes = [r.model_dump() for r in checker.check_sanctions_batch(
+                        [CompanyInfo(company_name=query) for _, query, _ in queries])]
+                    total = time.perf_counter() - start
+                else:
+                    outcomes = []
+                    for _, query, _ in queries:
+                        start = time.perf_counter()
+                        outcomes.append(screen(checker, query))
+                        latencies.append(time.perf_counter() - start)
+                    total = sum(latencies)
+            finally:
+                checker.close()
+
+            if truth is None:
+                truth = outcomes
+            expected = [t["matched_name"] for t in truth if t["match"]]
+            found = sum(1 for t, o in zip(truth, outcomes) if t["match"] and o["matched_name"] == t["matched_name"])
+            extra = sum(1 for t, o in zip(truth, outcomes) if o["match"] and not t["match"])
+            variants = [(source, o) for (kind, _, source), o in zip(queries, outcomes)
+                        if kind == "transliteration"]
+            variant_hits = sum(1 for source, o in variants if o["match"] and o["matched_name"] == source)
+            latencies.sort()
+            results.append({
+                "size": size,
+                "matcher": label,
+                "load_s": round(load_time, 3),
+                "memory_mib": round(memory, 1) if memory is not None else None,
+                "p50_ms": round(_percentile(latencies, 50) * 1000, 2) if latencies else None,
+                "p95_ms": round(_percentile(latencies, 95) * 1000, 2) if latencies else None,
+                "p99_ms": round(_percentile(latencies, 99) * 1000, 2) if latencies else None,
+                "queries_per_s": round(len(queries) / total, 1),
+                "recall": round(found / len(expected), 4) if expected else None,
+                "extra_matches": extra,
+                "variant_recall": round(variant_hits / len(variants), 4) if variants else None,
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark sanctions screening matchers')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--queries', type=int, default=200,
+                        help='Queries per list size (brute force scans the whole list for each)')
+    parser.add_argument('--workers', type=int, default=1, help='Also benchmark N shard workers')
+    parser.add_argument('--no-memory', dest='memory', action='store_false',
+                        help='Skip the traced second load that measures memory')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', type=str, help='Also write the results to this file')
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        results.extend(bench_size(size, args))
+
+    def fmt(value, spec):
+        return "-" if value is None else format(value, spec)
+
+    print(f"{args.queries} queries per list ({', '.join(_NOISE)}), seed {args.seed}")
+    print(tabulate(
+        [[r["size"], r["matcher"], fmt(r["load_s"], ".2f"), fmt(r["memory_mib"], ".1f"),
+          fmt(r["p50_ms"], ".1f"), fmt(r["p95_ms"], ".1f"), fmt(r["p99_ms"], ".1f"),
+          fmt(r["queries_per_s"], ".1f"), fmt(r["recall"], ".3f"), r["extra_matches"],
+          fmt(r["variant_recall"], ".3f")]
+         for r in results],
+        headers=["Entries", "Matcher", "Load s", "MiB", "p50 ms", "p95 ms", "p99 ms",
+                 "Queries/s", "Recall", "Extra", "Variants"],
+        tablefmt="simple",
+    ))
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+        print(f"✓ Wrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
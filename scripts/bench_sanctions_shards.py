@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Scaling of sharded sanctions screening from 1 to N worker processes
+
+Screens the same queries with workers=1 (in-process) and with 2..N shard
+workers, checks that every result matches the in-process one, and prints
+latency and throughput per worker count.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Ensure project root is in path
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from tabulate import tabulate
+
+from src.models import CompanyInfo
+from src.tools.sanctions_checker import SanctionsChecker
+
+
+def make_queries(names: list[str], count: int, seed: int) -> list[str]:
+    """List names with a character dropped or swapped, plus unrelated names"""
+    rng = random.Random(seed)
+    queries = []
+    for name in rng.sample(names, min(count // 2, len(names))):
+        i = rng.randrange(len(name))
+        queries.append(name[:i] + name[i + 1:] if rng.random() < 0.5 else name[:i] + "x" + name[i + 1:])
+    while len(queries) < count:
+        queries.append(" ".join(rng.choice(name.split()) for name in rng.sample(names, 2)))
+    return queries
+
+
+def run(checker: SanctionsChecker, queries: list[str], batch: list[CompanyInfo]) -> tuple[list, list, float, list]:
+    latencies, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(checker.check_sanctions(CompanyInfo(company_name=query)).data)
+        latencies.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    batch_results = checker.check_sanctions_batch(batch)
+    return latencies, results, time.perf_counter() - start, batch_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark sharded sanctions screening')
+    parser.add_argument('sanctions_file', nargs='?', default='data/sanctions_list.txt')
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--top-k', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    baseline = None
+    rows = []
+    queries = None
+    for workers in range(1, args.max_workers + 1):
+        start = time.perf_counter()
+        checker = SanctionsChecker(args.sanctions_file, auto_reload=False, workers=workers)
+        load = time.perf_counter() - start
+        checker.top_k = args.top_k
+        if queries is None:
+            queries = make_queries(list(checker.sanctions_list.names), args.queries, args.seed)
+            batch = [CompanyInfo(company_name=q) for q in queries]
+        try:
+            latencies, results, batch_time, batch_results = run(checker, queries, batch)
+        finally:
+            checker.close()
+
+        # candidates_pruned depends on the sharding; everything else must match
+        for result in results:
+            result.pop("candidates_pruned", None)
+        if baseline is None:
+            baseline = (results, batch_results)
+        identical = results == baseline[0] and batch_results == baseline[1]
+
+        latencies.sort()
+        rows.append([
+            workers,
+            f"{load:.2f}",
+            f"{statistics.median(latencies) * 1000:.1f}",
+            f"{latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f}",
+            f"{len(queries) / sum(latencies):.1f}",
+            f"{len(batch) / batch_time:.1f}",
+            "yes" if identical else "NO",
+        ])
+
+    print(f"{args.sanctions_file}: {len(queries)} queries, top_k={args.top_k}, {os.cpu_count()} CPUs")
+    print(tabulate(rows, headers=["Workers", "Load s", "p50 ms", "p95 ms", "Queries/s",
+                                  "Batch names/s", "Identical"], tablefmt="simple"))
+
+
+if __name__ == "__main__":
+    main()
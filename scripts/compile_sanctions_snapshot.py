@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Compile the sanctions list into a memory-mappable snapshot
+
+SanctionsChecker picks up <list>.snap automatically while it matches the
+text list, so re-run this after every list update.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Ensure project root is in path
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.tools.sanctions_snapshot import compile_snapshot
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile a sanctions list into a snapshot')
+    parser.add_argument('source', nargs='?', default='data/sanctions_list.txt',
+                        help='Pipe-delimited sanctions list')
+    parser.add_argument('-o', '--output', type=str, help='Snapshot path (default: <source>.snap)')
+    args = parser.parse_args()
+
+    output = compile_snapshot(Path(args.source), Path(args.output) if args.output else None)
+    print(f"✓ Wrote {output} ({output.stat().st_size / 1024:.1f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,23 @@
 #!/usr/bin/env python3
 """
 Generate comprehensive test PDFs for all RiskLens AI scenarios
+
+With --corpus N, generates N synthetic vendor PDFs instead, for measuring
+extraction at volume: varied page counts (1-60), layouts, field labels and
+field placements, each document seeded from (--seed, its index) so a
+corpus is reproducible whatever the worker count. ground_truth.jsonl in
+the output directory lists every document's pages, layout and expected
+field values; scripts/bench_pdf_corpus.py measures PDFExtractor against it.
 """
+import argparse
+import json
 import os
+import random
+from concurrent.futures import ProcessPoolExecutor
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
+from reportlab.pdfgen import canvas
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib import colors
 from datetime import datetime
@@ -363,7 +375,159 @@ def create_vendor_pdf(scenario_name, data, output_dir="data/test_pdfs"):
     return filename
 
 
+# Corpus vocabulary
+_SYLLABLES = "ka ro mi tan zel vor ash eb lin qu dra sho pet iv har mun gol bek sar yu nov al ib os ten".split()
+_TRADES = ("Trading", "Logistics", "Technologies", "Holdings", "Consulting", "Engineering",
+           "Supplies", "Marine", "Pharma", "Textiles", "Energy", "Foods")
+_SUFFIXES = ("Ltd", "LLC", "Inc", "GmbH", "SA", "PLC", "Limited", "Corp")
+_BUSINESS_TYPES = ("Technology Services", "Logistics and Supply Chain", "Import/Export Trading",
+                   "Manufacturing", "Financial Services", "Construction", "Healthcare Supplies",
+                   "Wholesale Distribution", "Management Consulting", "Marine Shipping")
+_COUNTRIES = (("GB", "London", "United Kingdom"), ("US", "Dover", "USA"), ("DE", "Hamburg", "Germany"),
+              ("FR", "Lyon", "France"), ("NL", "Rotterdam", "Netherlands"), ("AE", "Dubai", "UAE"),
+              ("SG", "Singapore", "Singapore"), ("CH", "Zurich", "Switzerland"))
+_FILLER = ("the supplier shall deliver goods in accordance with the schedule agreed between the parties "
+           "payment terms are thirty days from the date of invoice unless otherwise stated in writing "
+           "liability for loss or damage in transit remains with the carrier until delivery is accepted "
+           "this appendix forms part of the master services agreement and survives its termination").split()
+
+# Field labels per field, each matched by one of PDFExtractor's patterns
+_LABELS = {
+    "company_name": ("Company Name", "Business Name", "Legal Name"),
+    "registration_number": ("Registration Number", "Registration No.", "Company Number", "Reg. No."),
+    "incorporation_date": ("Incorporation Date", "Date of Incorporation", "Incorporated on"),
+    "business_type": ("Business Type", "Industry", "Sector"),
+    "address": ("Registered Address", "Business Address", "Address"),
+    "contact_email": ("Email", "E-mail"),
+    "contact_phone": ("Phone", "Tel", "Telephone"),
+    "bank_account": ("Bank Account", "Account Number"),
+}
+CORPUS_LAYOUTS = ("inline", "stacked", "columns")
+CORPUS_PLACEMENTS = ("first_page", "split", "after_cover")
+
+
+def _corpus_word(rng):
+    return "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+
+
+def make_corpus_document(index, seed):
+    """Ground truth of corpus document index: layout, pages and field values"""
+    rng = random.Random(f"{seed}:{index}")
+    code, city, country = rng.choice(_COUNTRIES)
+    name = f"{_corpus_word(rng)} {rng.choice(_TRADES)} {rng.choice(_SUFFIXES)}"
+    domain = name.split()[0].lower()
+    separator = rng.choice("-/")
+    fields = {
+        "company_name": name,
+        "registration_number": f"{code}-{rng.randint(100000, 99999999)}",
+        "incorporation_date": separator.join((f"{rng.randint(1, 28):02d}", f"{rng.randint(1, 12):02d}",
+                                              str(rng.randint(1990, 2024)))),
+        "business_type": rng.choice(_BUSINESS_TYPES),
+        "address": f"{rng.randint(1, 400)} {_corpus_word(rng)} Street, {city} {rng.randint(1000, 99999)}, {country}",
+        "contact_email": f"{rng.choice(('info', 'contact', 'finance', 'ops'))}@{domain}.example",
+        "contact_phone": f"+{rng.randint(1, 99)} {rng.randint(10, 999)} {rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+        "bank_account": f"{code}{rng.randint(10, 99)}{_corpus_word(rng).upper()[:4]}{rng.randint(10**13, 10**14 - 1)}",
+    }
+    # Page counts skew small, with a tail of long vendor packs
+    roll = rng.random()
+    pages = rng.randint(1, 3) if roll < 0.6 else rng.randint(4, 15) if roll < 0.9 else rng.randint(16, 60)
+    placement = rng.choice(CORPUS_PLACEMENTS) if pages > 1 else "first_page"
+    return {
+        "index": index,
+        "file": f"{index // 1000:03d}/vendor_{index:06d}.pdf",
+        "pages": pages,
+        "layout": rng.choice(CORPUS_LAYOUTS),
+        "placement": placement,
+        "labels": {field: rng.choice(labels) for field, labels in _LABELS.items()},
+        "fields": fields,
+        "filler_seed": rng.randrange(2**32),
+    }
+
+
+def write_corpus_pdf(path, doc):
+    """Draw a corpus document; fields go on the pages its placement gives"""
+    rng = random.Random(doc["filler_seed"])
+    pages = doc["pages"]
+    order = list(_LABELS)
+    if doc["placement"] == "split":
+        field_pages = {0: order[:4], rng.randint(1, pages - 1): order[4:]}
+    elif doc["placement"] == "after_cover":
+        field_pages = {min(rng.randint(1, 3), pages - 1): order}
+    else:
+        field_pages = {0: order}
+
+    pdf = canvas.Canvas(path, pagesize=letter)
+    width, height = letter
+    for page in range(pages):
+        y = height - 60
+        pdf.setFont("Helvetica-Bold", 14)
+        pdf.drawString(50, y, "VENDOR ONBOARDING APPLICATION" if page == 0 else f"APPENDIX {page}")
+        y -= 30
+        for field in field_pages.get(page, ()):
+            label, value = doc["labels"][field] + ":", doc["fields"][field]
+            pdf.setFont("Helvetica-Bold", 10)
+            pdf.drawString(50, y, label)
+            pdf.setFont("Helvetica", 10)
+            if doc["layout"] == "inline":
+                pdf.drawString(55 + pdf.stringWidth(label, "Helvetica-Bold", 10), y, value)
+            elif doc["layout"] == "columns":
+                pdf.drawString(210, y, value)
+            else:
+                y -= 14
+                pdf.drawString(50, y, value)
+            y -= 22
+        pdf.setFont("Helvetica", 9)
+        while y > 60:
+            pdf.drawString(50, y, " ".join(rng.choice(_FILLER) for _ in range(rng.randint(8, 16))))
+            y -= 12
+        pdf.showPage()
+    pdf.save()
+
+
+def _write_corpus_chunk(output_dir, seed, indexes):
+    docs = []
+    for index in indexes:
+        doc = make_corpus_document(index, seed)
+        path = os.path.join(output_dir, doc["file"])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_corpus_pdf(path, doc)
+        del doc["filler_seed"]
+        docs.append(doc)
+    return docs
+
+
+def generate_corpus(count, output_dir, seed=42, workers=None):
+    """Write count corpus PDFs and ground_truth.jsonl across a process pool"""
+    os.makedirs(output_dir, exist_ok=True)
+    chunk = 250
+    total_pages = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool, \
+            open(os.path.join(output_dir, "ground_truth.jsonl"), "w") as truth:
+        futures = [pool.submit(_write_corpus_chunk, output_dir, seed, range(start, min(start + chunk, count)))
+                   for start in range(0, count, chunk)]
+        for done, future in enumerate(futures, 1):
+            for doc in future.result():
+                truth.write(json.dumps(doc) + "\n")
+                total_pages += doc["pages"]
+            print(f"\r  {min(done * chunk, count)}/{count} documents", end="", flush=True)
+    print()
+    return total_pages
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Generate test PDFs, or a synthetic corpus with --corpus")
+    parser.add_argument("--corpus", type=int, help="Generate this many synthetic vendor PDFs instead")
+    parser.add_argument("--output", type=str, default="data/corpus", help="Corpus directory")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, help="Generator processes (default: one per core)")
+    args = parser.parse_args()
+    
+    if args.corpus:
+        print(f"Generating {args.corpus} corpus PDFs in {args.output}/ (seed {args.seed})...")
+        pages = generate_corpus(args.corpus, args.output, args.seed, args.workers)
+        print(f"✓ {args.corpus} documents, {pages} pages, ground truth in {args.output}/ground_truth.jsonl")
+        return
+    
     print("╔══════════════════════════════════════════════════════════╗")
     print("║     RiskLens AI - Test PDF Generator                    ║")
     print("╚══════════════════════════════════════════════════════════╝")
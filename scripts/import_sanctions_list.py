@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Convert an OFAC or EU sanctions export into the pipe-delimited list format
+
+The checker reads XML and CSV lists directly, but a pipe-delimited copy is
+easier to review and diff between list releases. The export is streamed, so
+lists of any size convert in constant memory. Pass --snapshot to compile
+the converted list as well.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Ensure project root is in path
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.tools.sanctions_import import detect_format, import_rows
+from src.tools.sanctions_snapshot import compile_snapshot
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Import an OFAC/EU XML or CSV sanctions list')
+    parser.add_argument('source', help='OFAC SDN XML, EU consolidated XML/CSV, or CSV with a name column')
+    parser.add_argument('-o', '--output', type=str, default='data/sanctions_list.txt',
+                        help='Pipe-delimited list to write (default: data/sanctions_list.txt)')
+    parser.add_argument('--format', choices=['ofac_xml', 'eu_xml', 'csv'],
+                        help='Source format (default: detected from the content)')
+    parser.add_argument('--snapshot', action='store_true', help='Also compile <output>.snap')
+    args = parser.parse_args()
+
+    source, output = Path(args.source), Path(args.output)
+    fmt = args.format or detect_format(source)
+    if fmt == 'pipe':
+        parser.error(f"{source} is already a pipe-delimited list")
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output.with_name(output.name + '.tmp')
+    count = 0
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(f"# Imported from {source.name} ({fmt})\n")
+        f.write("# Entity Name | List Name | Details | Address | Identifiers\n")
+        for row in import_rows(source, fmt):
+            f.write(" | ".join(row).rstrip(" |") + "\n")
+            count += 1
+    tmp.replace(output)
+    print(f"✓ Wrote {count} entries to {output}")
+
+    if args.snapshot:
+        snapshot = compile_snapshot(output)
+        print(f"✓ Wrote {snapshot} ({snapshot.stat().st_size / 1024:.1f} KB)")
+
+
+if __name__ == "__main__":
+    main()
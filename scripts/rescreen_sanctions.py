@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Rescreen stored vendors against sanctions list changes
+
+Diffs the sanctions list against the version screened on the previous run
+and screens only the added and removed entries. Run it after every list
+update (or on a schedule).
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Ensure project root is in path
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.sanctions_rescreen import SanctionsRescreener
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rescreen stored vendors against sanctions list changes')
+    parser.add_argument('sanctions_file', nargs='?', default='data/sanctions_list.txt',
+                        help='Current pipe-delimited sanctions list')
+    parser.add_argument('--baseline', type=str,
+                        help='List version screened last time (default: <list>.screened.txt)')
+    parser.add_argument('--state-dir', type=str, default='state', help='Agent state directory')
+    parser.add_argument('--dry-run', action='store_true', help='Report changes without saving them')
+    args = parser.parse_args()
+
+    rescreener = SanctionsRescreener(args.sanctions_file, args.baseline, args.state_dir)
+    report = rescreener.rescreen(write=not args.dry_run)
+
+    mode = "full list (no baseline)" if report.full_rescreen else \
+        f"+{report.entries_added} / -{report.entries_removed} entries"
+    print(f"Rescreened {report.vendors_screened} vendors against {mode}")
+    print(f"  New matches:     {len(report.new_matches)} {', '.join(report.new_matches)}")
+    print(f"  Removed matches: {len(report.removed_matches)} {', '.join(report.removed_matches)}")
+    print(f"  Score updates:   {len(report.score_updates)}")
+    if args.dry_run:
+        print("Dry run: nothing saved")
+
+
+if __name__ == "__main__":
+    main()
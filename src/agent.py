@@ -3,9 +3,11 @@
 This is the new agentic version that uses Nemotron-powered specialist agents
 that reason, collaborate, and dynamically decide actions using function calling.
 """
+import asyncio
 import json
+import threading
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Iterable, Optional, TypeVar
 from colorama import Fore, Style, init
 
 from src.models import (
@@ -13,6 +15,7 @@ from src.models import (
     RiskScore, RiskExplanation, AgentDecision, AccessRecommendation
 )
 from src.state_manager import StateManager
+from src.llm_cache import LLMResponseCache
 from src.agents import (
     CoordinatorAgent, ExtractorAgent, VerificationAgent,
     RiskAnalystAgent, AgentCommunication
@@ -21,10 +24,29 @@ from src.tools import (
     PDFExtractor, RegistryChecker, SanctionsChecker,
     RiskCalculator, RiskExplainer, AccessRecommender
 )
+from src.tools.pdf_cache import PDFExtractionCache
+from src.tools.text_store import DocumentTextStore
+from src.tools.sanctions_cache import SanctionsResultCache
 
 # Initialize colorama
 init(autoreset=True)
 
+T = TypeVar("T")
+
+# The sanctions checker (its parsed list, index and shards) and the on-disk
+# caches are built once per process and shared by every agent, as the LLM
+# clients share their HTTP pools; each is safe to use across threads
+_shared_tools: dict[str, object] = {}
+_shared_tools_lock = threading.Lock()
+
+
+def _shared(name: str, build: Callable[[], T]) -> T:
+    """The process's instance of a shared tool or cache, built on first use"""
+    with _shared_tools_lock:
+        if name not in _shared_tools:
+            _shared_tools[name] = build()
+        return _shared_tools[name]
+
 
 class RiskLensAgent:
     """
@@ -39,7 +61,18 @@ class RiskLensAgent:
     Workflow: Coordinator reasons → Specialist reasons → Tool execution → Repeat
     """
     
-    def __init__(self, state_manager: StateManager):
+    max_iterations = 20
+    
+    # Call sites that can answer from an LLM response cache
+    llm_call_sites = ("coordinator", "extractor", "verifier", "risk_analyst",
+                      "risk_calculator", "risk_explainer")
+    
+    def __init__(self, state_manager: StateManager, llm_cache: Optional[LLMResponseCache] = None,
+                 llm_cache_sites: Optional[Iterable[str]] = None):
+        """
+        llm_cache, if given, answers repeated LLM requests from disk at the
+        llm_cache_sites chosen (all of llm_call_sites by default).
+        """
         self.state_manager = state_manager
         
         # Initialize specialist agents (Nemotron-powered)
@@ -52,12 +85,34 @@ class RiskLensAgent:
         self.communication = AgentCommunication()
         
         # Initialize tools (agents call these via function calling)
-        self.pdf_extractor = PDFExtractor()
+        # Bounded, so one malformed or huge upload cannot hold up the run
+        self.pdf_extractor = PDFExtractor(
+            cache=_shared("pdf_cache", lambda: PDFExtractionCache("data/pdf_cache.db")),
+            text_store=_shared("text_store", DocumentTextStore),
+            max_pages=500, time_budget=60.0, max_page_bytes=8 * 2**20, max_text_chars=2_000_000,
+        )
         self.registry_checker = RegistryChecker()
-        self.sanctions_checker = SanctionsChecker()
+        self.sanctions_checker = _shared(
+            "sanctions_checker",
+            lambda: SanctionsChecker(cache=SanctionsResultCache("data/sanctions_cache.db")),
+        )
         self.risk_calculator = RiskCalculator()
         self.risk_explainer = RiskExplainer()
         self.access_recommender = AccessRecommender()
+        
+        # Opt-in LLM response cache, per call site
+        self.llm_cache = llm_cache
+        if llm_cache is not None:
+            sites = dict(zip(self.llm_call_sites, (
+                self.coordinator, self.extractor, self.verifier, self.risk_analyst,
+                self.risk_calculator, self.risk_explainer,
+            )))
+            chosen = list(llm_cache_sites) if llm_cache_sites is not None else list(sites)
+            unknown = [site for site in chosen if site not in sites]
+            if unknown:
+                raise ValueError(f"Unknown LLM call sites: {', '.join(unknown)}")
+            for site in chosen:
+                sites[site].llm_cache = llm_cache
     
     def run(self, pdf_path: str, session_id: Optional[str] = None) -> AgentState:
         """
@@ -70,38 +125,15 @@ class RiskLensAgent:
         4. Tools execute and update state
         5. Repeat until workflow complete or human review needed
         """
-        # Initialize or load state
-        if session_id:
-            state = self.state_manager.load_state(session_id)
-            self._log("info", f"Resuming session {session_id}")
-            
-            # If resuming after human approval, generate access recommendation
-            if state.human_decision == "approved" and not state.access_recommendation:
-                result = self.access_recommender.recommend_access(
-                    state.risk_score,
-                    state.human_decision,
-                    state.human_notes
-                )
-                if result.success:
-                    state.access_recommendation = AccessRecommendation(**result.data)
-                    state.workflow_complete = True
-                    self.state_manager.save_state(state)
-                return state
-        else:
-            # Generate unique session ID with microseconds to prevent collisions
-            import uuid
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            unique_id = str(uuid.uuid4())[:8]  # Short UUID suffix
-            session_id = f"{timestamp}_{unique_id}"
-            state = AgentState(session_id=session_id, pdf_path=pdf_path)
-            self._log("info", f"Starting new agentic session {session_id}")
+        state, finished = self._start_session(pdf_path, session_id)
+        if finished:
+            return state
         
         # Agentic Loop
-        max_iterations = 20
         iteration = 0
         last_3_agents = []  # Track last 3 agents to prevent looping
         
-        while not state.workflow_complete and iteration < max_iterations:
+        while not state.workflow_complete and iteration < self.max_iterations:
             iteration += 1
             
             self._log("observe", f"Iteration {iteration}")
@@ -114,78 +146,171 @@ class RiskLensAgent:
                 self._log("info", "Coordinator: Workflow complete or awaiting human review")
                 break
             
-            # LOOP PREVENTION: Check if same agent called 3 times in a row
-            last_3_agents.append(next_agent_id)
-            if len(last_3_agents) > 3:
-                last_3_agents.pop(0)
-            
-            if len(last_3_agents) == 3 and len(set(last_3_agents)) == 1:
-                self._log("warning", f"⚠️ Agent {next_agent_id} called 3 times in a row - forcing workflow to continue")
-                # Force extraction as complete if extractor is looping
-                if next_agent_id == "extractor" and not state.company_info:
-                    self._log("warning", "Extractor stuck - moving forward with partial data")
-                    # Move to next phase anyway
-                    next_agent_id = "verifier"
-                    last_3_agents = [next_agent_id]  # Reset counter
-                elif next_agent_id == "verifier":
-                    # Move to risk analyst
-                    next_agent_id = "risk_analyst"
-                    last_3_agents = [next_agent_id]
-            
-            self._log("decide", f"Coordinator delegates to: {next_agent_id}")
-            self._log("decide", f"Reasoning: {coordinator_reasoning[:150]}...")
-            
-            state.current_agent = next_agent_id
-            
-            # Get the specialist agent
+            next_agent_id = self._delegate(state, next_agent_id, coordinator_reasoning, last_3_agents)
             agent = self._get_agent(next_agent_id)
             
             # AGENT REASONING: Specialist reasons about what to do
-            self._log("act", f"{next_agent_id.upper()}: Reasoning about action...")
             decision = agent.reason(state=state, coordinator_guidance=coordinator_reasoning)
-            
-            # Log agent's reasoning
-            self._log("act", f"{next_agent_id.upper()}: {decision.reasoning[:200]}...")
-            state.agent_decisions.append(decision)
+            self._record_decision(state, next_agent_id, decision)
             
             # TOOL EXECUTION: Execute agent's tool calls
-            if decision.tool_calls:
-                for tool_call in decision.tool_calls:
-                    self._execute_tool_call(tool_call, state, next_agent_id)
-            
-            # Save state after each agent action (before checking for human review)
-            self.state_manager.save_state(state)
+            for tool_call in decision.tool_calls:
+                self._execute_tool_call(tool_call, state, next_agent_id)
             
-            # Check if agent requests human review
-            if decision.requests_human_review:
-                state.requires_human_review = True
-                if not state.review_reason:
-                    state.review_reason = decision.reasoning
-                self._log("info", "Agent requests human review")
-                # Save state with human review flag before breaking
-                self.state_manager.save_state(state)
+            if self._stop_after_action(state, decision):
                 break
+        
+        if iteration >= self.max_iterations:
+            self._log("error", "Max iterations reached - workflow stopped")
+        
+        return state
+    
+    async def arun(self, pdf_path: str, session_id: Optional[str] = None) -> AgentState:
+        """
+        run() for asyncio
+        
+        Agents reason with areason() and the LLM-backed tools are awaited,
+        so a session waiting on Nemotron does not hold a thread; PDF
+        extraction, registry and sanctions checks, which are local work,
+        run in the default thread pool. Many sessions can share one event
+        loop, each with its own RiskLensAgent (agents keep per-session
+        conversation history):
+        
+            states = await asyncio.gather(*(RiskLensAgent(manager).arun(path) for path in paths))
+        """
+        state, finished = await asyncio.to_thread(self._start_session, pdf_path, session_id)
+        if finished:
+            return state
+        
+        iteration = 0
+        last_3_agents = []
+        
+        while not state.workflow_complete and iteration < self.max_iterations:
+            iteration += 1
             
-            # Automatically require human review after risk assessment is complete
-            if state.risk_score and state.risk_explanation and not state.requires_human_review:
-                state.requires_human_review = True
-                state.review_reason = "Risk assessment complete - human approval required"
-                # Keep current_agent set so frontend can show which agent completed
-                # Don't clear it - helps with visibility
-                self._log("info", "Risk assessment complete → requesting human review")
-                # Save state with human review flag before breaking
-                self.state_manager.save_state(state)
+            self._log("observe", f"Iteration {iteration}")
+            self._print_state_summary(state)
+            
+            next_agent_id, coordinator_reasoning = self._plan_from_decision(
+                state, await self.coordinator.areason(state=state)
+            )
+            
+            if next_agent_id is None:
+                self._log("info", "Coordinator: Workflow complete or awaiting human review")
                 break
             
-            # Check if human review needed based on state
-            if state.requires_human_review:
+            next_agent_id = self._delegate(state, next_agent_id, coordinator_reasoning, last_3_agents)
+            agent = self._get_agent(next_agent_id)
+            
+            decision = await agent.areason(state=state, coordinator_guidance=coordinator_reasoning)
+            self._record_decision(state, next_agent_id, decision)
+            
+            for tool_call in decision.tool_calls:
+                await self._aexecute_tool_call(tool_call, state, next_agent_id)
+            
+            if self._stop_after_action(state, decision):
                 break
         
-        if iteration >= max_iterations:
+        if iteration >= self.max_iterations:
             self._log("error", "Max iterations reached - workflow stopped")
         
         return state
     
+    def _start_session(self, pdf_path: str, session_id: Optional[str]) -> tuple[AgentState, bool]:
+        """
+        (state, finished): a new session's state, or a resumed one's
+        
+        A session resumed after human approval only needs its access
+        recommendation, and is finished once that is generated.
+        """
+        if session_id:
+            state = self.state_manager.load_state(session_id)
+            self._log("info", f"Resuming session {session_id}")
+            
+            # If resuming after human approval, generate access recommendation
+            if state.human_decision == "approved" and not state.access_recommendation:
+                result = self.access_recommender.recommend_access(
+                    state.risk_score,
+                    state.human_decision,
+                    state.human_notes
+                )
+                if result.success:
+                    state.access_recommendation = AccessRecommendation(**result.data)
+                    state.workflow_complete = True
+                    self.state_manager.save_state(state)
+                return state, True
+        else:
+            # Generate unique session ID with microseconds to prevent collisions
+            import uuid
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            unique_id = str(uuid.uuid4())[:8]  # Short UUID suffix
+            session_id = f"{timestamp}_{unique_id}"
+            state = AgentState(session_id=session_id, pdf_path=pdf_path)
+            self._log("info", f"Starting new agentic session {session_id}")
+        return state, False
+    
+    def _delegate(self, state: AgentState, next_agent_id: str, coordinator_reasoning: str,
+                  last_3_agents: list[str]) -> str:
+        """The id of the specialist to act next, after loop prevention"""
+        # LOOP PREVENTION: Check if same agent called 3 times in a row
+        last_3_agents.append(next_agent_id)
+        if len(last_3_agents) > 3:
+            last_3_agents.pop(0)
+        
+        if len(last_3_agents) == 3 and len(set(last_3_agents)) == 1:
+            self._log("warning", f"⚠️ Agent {next_agent_id} called 3 times in a row - forcing workflow to continue")
+            # Force extraction as complete if extractor is looping
+            if next_agent_id == "extractor" and not state.company_info:
+                self._log("warning", "Extractor stuck - moving forward with partial data")
+                # Move to next phase anyway
+                next_agent_id = "verifier"
+                last_3_agents[:] = [next_agent_id]  # Reset counter
+            elif next_agent_id == "verifier":
+                # Move to risk analyst
+                next_agent_id = "risk_analyst"
+                last_3_agents[:] = [next_agent_id]
+        
+        self._log("decide", f"Coordinator delegates to: {next_agent_id}")
+        self._log("decide", f"Reasoning: {coordinator_reasoning[:150]}...")
+        
+        state.current_agent = next_agent_id
+        self._log("act", f"{next_agent_id.upper()}: Reasoning about action...")
+        return next_agent_id
+    
+    def _record_decision(self, state: AgentState, agent_id: str, decision: AgentDecision):
+        """Log a specialist's reasoning and add it to the state"""
+        self._log("act", f"{agent_id.upper()}: {decision.reasoning[:200]}...")
+        state.agent_decisions.append(decision)
+    
+    def _stop_after_action(self, state: AgentState, decision: AgentDecision) -> bool:
+        """Save state after an agent's action; True if the loop should stop for human review"""
+        # Save state after each agent action (before checking for human review)
+        self.state_manager.save_state(state)
+        
+        # Check if agent requests human review
+        if decision.requests_human_review:
+            state.requires_human_review = True
+            if not state.review_reason:
+                state.review_reason = decision.reasoning
+            self._log("info", "Agent requests human review")
+            # Save state with human review flag before breaking
+            self.state_manager.save_state(state)
+            return True
+        
+        # Automatically require human review after risk assessment is complete
+        if state.risk_score and state.risk_explanation and not state.requires_human_review:
+            state.requires_human_review = True
+            state.review_reason = "Risk assessment complete - human approval required"
+            # Keep current_agent set so frontend can show which agent completed
+            # Don't clear it - helps with visibility
+            self._log("info", "Risk assessment complete → requesting human review")
+            # Save state with human review flag before breaking
+            self.state_manager.save_state(state)
+            return True
+        
+        # Check if human review needed based on state
+        return state.requires_human_review
+    
     def _agentic_planning(self, state: AgentState) -> tuple[Optional[str], str]:
         """
         Use Coordinator Agent to decide which specialist should act next
@@ -193,8 +318,10 @@ class RiskLensAgent:
         This replaces the deterministic if/else planner with Nemotron reasoning
         """
         # Coordinator reasons about next step
-        decision = self.coordinator.reason(state=state)
-        
+        return self._plan_from_decision(state, self.coordinator.reason(state=state))
+    
+    def _plan_from_decision(self, state: AgentState, decision: AgentDecision) -> tuple[Optional[str], str]:
+        """(next agent or None to stop, coordinator's reasoning) from the coordinator's decision"""
         # Parse coordinator's decision
         reasoning = decision.reasoning
         
@@ -324,25 +451,7 @@ class RiskLensAgent:
         function_name = tool_call["function"]
         arguments = tool_call["arguments"]
         
-        # Safety check: Skip redundant tool calls
-        if function_name == "extract_from_pdf" and state.company_info:
-            self._log("warning", f"  ⚠️ Skipping {function_name} - already extracted: {state.company_info.company_name}")
-            return
-        
-        if function_name == "search_registry" and state.registry_result:
-            self._log("warning", f"  ⚠️ Skipping {function_name} - registry already checked")
-            return
-        
-        if function_name == "check_sanctions" and state.sanctions_result:
-            self._log("warning", f"  ⚠️ Skipping {function_name} - sanctions already checked")
-            return
-        
-        if function_name == "compute_risk" and state.risk_score:
-            self._log("warning", f"  ⚠️ Skipping {function_name} - risk already computed: {state.risk_score.total_score}")
-            return
-        
-        if function_name == "explain_risk" and state.risk_explanation:
-            self._log("warning", f"  ⚠️ Skipping {function_name} - explanation already generated")
+        if self._redundant_tool_call(function_name, state):
             return
         
         self._log("act", f"  Calling tool: {function_name}")
@@ -351,9 +460,19 @@ class RiskLensAgent:
             if function_name == "extract_from_pdf":
                 result = self.pdf_extractor.extract_from_pdf(state.pdf_path)
                 if result.success and result.data:
+                    document_text = result.data.pop("document_text", "")
+                    result.data.pop("truncated", False)
+                    state.document_truncated = result.data.pop("truncation_reason", None)
                     state.company_info = CompanyInfo(**result.data)
                     state.completed_steps.append("extract_from_pdf")
                     self._log("success", f"  ✓ Extracted: {state.company_info.company_name}")
+                    if state.document_truncated:
+                        self._log("warning", f"  ⚠️ Extraction truncated: {state.document_truncated}")
+                    
+                    # Sanctioned parents, shareholders or banks named anywhere in the document
+                    state.document_mentions = self.sanctions_checker.scan_document(document_text)
+                    for mention in state.document_mentions:
+                        self._log("warning", f"  ⚠️ Document mentions {mention.name} ({mention.list_name})")
             
             elif function_name == "search_registry":
                 result = self.registry_checker.search_registry(state.company_info)
@@ -379,21 +498,17 @@ class RiskLensAgent:
                     state.sanctions_result,
                     flags
                 )
-                if result.success and result.data:
-                    state.risk_score = RiskScore(**result.data)
-                    state.completed_steps.append("compute_risk")
-                    self._log("success", f"  ✓ Risk Score: {state.risk_score.total_score} ({state.risk_score.risk_level})")
-                    
-                    # Generate explanation using LLM
+                if self._apply_risk_score(state, result):
+                    # Generate explanation using LLM, with the document text
+                    # stored at extraction rather than parsed again
                     explain_result = self.risk_explainer.explain_risk(
                         state.company_info,
                         state.registry_result,
                         state.sanctions_result,
-                        state.risk_score
+                        state.risk_score,
+                        self._document_text(state)
                     )
-                    if explain_result.success and explain_result.data:
-                        state.risk_explanation = RiskExplanation(**explain_result.data)
-                        state.completed_steps.append("explain_risk")
+                    self._apply_explanation(state, explain_result)
             
             elif function_name == "get_additional_info":
                 query = arguments.get("query", "")
@@ -452,10 +567,101 @@ class RiskLensAgent:
         except Exception as e:
             self._log("error", f"  ✗ Tool execution failed: {str(e)}")
     
+    async def _aexecute_tool_call(self, tool_call: dict, state: AgentState, agent_id: str):
+        """
+        _execute_tool_call() for arun
+        
+        Risk scoring and explanation are awaited; the other tools do local
+        or blocking work and run in a worker thread.
+        """
+        if tool_call["function"] != "compute_risk":
+            await asyncio.to_thread(self._execute_tool_call, tool_call, state, agent_id)
+            return
+        
+        if self._redundant_tool_call("compute_risk", state):
+            return
+        
+        self._log("act", "  Calling tool: compute_risk")
+        
+        try:
+            result = await self.risk_calculator.acompute_risk(
+                state.company_info,
+                state.registry_result,
+                state.sanctions_result,
+                tool_call["arguments"].get("flags", {})
+            )
+            if self._apply_risk_score(state, result):
+                document_text = await asyncio.to_thread(self._document_text, state)
+                explain_result = await self.risk_explainer.aexplain_risk(
+                    state.company_info,
+                    state.registry_result,
+                    state.sanctions_result,
+                    state.risk_score,
+                    document_text
+                )
+                self._apply_explanation(state, explain_result)
+        
+        except Exception as e:
+            self._log("error", f"  ✗ Tool execution failed: {str(e)}")
+    
+    def _redundant_tool_call(self, function_name: str, state: AgentState) -> bool:
+        """Safety check: True, with a warning, for a tool whose result is already in the state"""
+        if function_name == "extract_from_pdf" and state.company_info:
+            self._log("warning", f"  ⚠️ Skipping {function_name} - already extracted: {state.company_info.company_name}")
+            return True
+        
+        if function_name == "search_registry" and state.registry_result:
+            self._log("warning", f"  ⚠️ Skipping {function_name} - registry already checked")
+            return True
+        
+        if function_name == "check_sanctions" and state.sanctions_result:
+            self._log("warning", f"  ⚠️ Skipping {function_name} - sanctions already checked")
+            return True
+        
+        if function_name == "compute_risk" and state.risk_score:
+            self._log("warning", f"  ⚠️ Skipping {function_name} - risk already computed: {state.risk_score.total_score}")
+            return True
+        
+        if function_name == "explain_risk" and state.risk_explanation:
+            self._log("warning", f"  ⚠️ Skipping {function_name} - explanation already generated")
+            return True
+        
+        return False
+    
+    def _apply_risk_score(self, state: AgentState, result) -> bool:
+        """Record a compute_risk result; True if it gave a score"""
+        if not (result.success and result.data):
+            return False
+        state.risk_score = RiskScore(**result.data)
+        state.completed_steps.append("compute_risk")
+        self._log("success", f"  ✓ Risk Score: {state.risk_score.total_score} ({state.risk_score.risk_level})")
+        return True
+
+    def _apply_explanation(self, state: AgentState, result):
+        """Record an explain_risk result"""
+        if result.success and result.data:
+            state.risk_explanation = RiskExplanation(**result.data)
+            state.completed_steps.append("explain_risk")
+
+    def _document_text(self, state: AgentState) -> Optional[str]:
+        """The submission's extracted text, from the text store; None if unavailable"""
+        if not state.pdf_path:
+            return None
+        try:
+            return self.pdf_extractor.document_text(state.pdf_path)
+        except Exception as e:
+            self._log("warning", f"  ⚠️ Document text unavailable: {str(e)}")
+            return None
+
     def _get_additional_info(self, query: str, state: AgentState) -> str:
         """Simple RAG: Return context-specific information"""
         query_lower = query.lower()
-        
+
+        if "document" in query_lower:
+            document_text = self._document_text(state)
+            if document_text:
+                return f"Document text (start): {' '.join(document_text[:500].split())}"
+
         if "registry" in query_lower and state.registry_result:
             return f"Registry verification: Match={state.registry_result.match}, Status={state.registry_result.status}, Confidence={state.registry_result.confidence:.0%}"
         
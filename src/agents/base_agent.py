@@ -1,10 +1,10 @@
 """Base agent class with Nemotron reasoning capabilities"""
-import os
 import json
 from abc import ABC, abstractmethod
 from typing import Optional, Any
-from openai import OpenAI
 
+from src.llm_cache import LLMResponseCache, acached_completion, cached_completion
+from src.llm_clients import DEFAULT_MODEL, get_async_llm_client, get_llm_client
 from src.models import AgentState, AgentDecision, AgentMessage
 
 
@@ -19,29 +19,23 @@ class BaseAgent(ABC):
     - Communication with other agents
     """
     
-    def __init__(self, agent_id: str, system_prompt: str):
+    def __init__(self, agent_id: str, system_prompt: str,
+                 llm_cache: Optional[LLMResponseCache] = None):
         """
         Initialize base agent
         
         Args:
             agent_id: Unique identifier for this agent
             system_prompt: System prompt defining agent's role and capabilities
+            llm_cache: Optional response cache, keyed by this agent's id as call site
         """
         self.agent_id = agent_id
         self.system_prompt = system_prompt
         
-        # Initialize Nemotron client
-        self.api_key = os.getenv("NVIDIA_API_KEY")
-        self.base_url = os.getenv("NVIDIA_BASE_URL", "https://integrate.api.nvidia.com/v1")
-        
-        if not self.api_key:
-            raise ValueError("NVIDIA_API_KEY not found in environment")
-        
-        self.client = OpenAI(
-            api_key=self.api_key,
-            base_url=self.base_url
-        )
-        self.model = "nvidia/llama-3.3-nemotron-super-49b-v1.5"
+        # Nemotron client, shared with every other agent and tool
+        self.model = DEFAULT_MODEL
+        self.client = get_llm_client(self.model)
+        self.llm_cache = llm_cache
         
         # Conversation history for this agent
         self.conversation_history = []
@@ -63,6 +57,40 @@ class BaseAgent(ABC):
         Returns:
             AgentDecision with reasoning, tool calls, and recommendations
         """
+        context, messages = self._prepare_messages(state, coordinator_guidance, additional_context)
+        try:
+            content = cached_completion(self.client, self._completion_args(messages),
+                                        self.llm_cache, self.agent_id)
+            return self._decide(context, content)
+        except Exception as e:
+            return self._failed_decision(e)
+    
+    async def areason(
+        self,
+        state: AgentState,
+        coordinator_guidance: Optional[str] = None,
+        additional_context: Optional[str] = None
+    ) -> AgentDecision:
+        """
+        reason() for asyncio: the Nemotron call is awaited on the running
+        event loop instead of blocking a thread
+        """
+        context, messages = self._prepare_messages(state, coordinator_guidance, additional_context)
+        try:
+            content = await acached_completion(get_async_llm_client(self.model),
+                                               self._completion_args(messages),
+                                               self.llm_cache, self.agent_id)
+            return self._decide(context, content)
+        except Exception as e:
+            return self._failed_decision(e)
+    
+    def _prepare_messages(
+        self,
+        state: AgentState,
+        coordinator_guidance: Optional[str],
+        additional_context: Optional[str]
+    ) -> tuple[str, list[dict]]:
+        """(context, chat messages) for a reasoning call"""
         # Build context for Nemotron
         context = self._build_context(state, coordinator_guidance, additional_context)
         
@@ -84,59 +112,59 @@ class BaseAgent(ABC):
         
         # Add conversation history
         messages.extend(self.conversation_history[-4:])  # Last 2 exchanges
+        return context, messages
+    
+    def _completion_args(self, messages: list[dict]) -> dict:
+        """Arguments of the chat completion call, sync or async"""
+        # Without function calling - tools are parsed from the response instead
+        # NVIDIA NIM doesn't fully support OpenAI function calling protocol yet
+        return {
+            "model": self.model,
+            "messages": messages,
+            "temperature": 0.3,  # Lower for more deterministic reasoning
+            "max_tokens": 1500,
+        }
+    
+    def _decide(self, context: str, content: Optional[str]) -> AgentDecision:
+        """Record Nemotron's response and turn it into a decision"""
+        reasoning = content or "No explicit reasoning provided"
         
-        try:
-            # Call Nemotron (without function calling - parse from response instead)
-            # NVIDIA NIM doesn't fully support OpenAI function calling protocol yet
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=0.3,  # Lower for more deterministic reasoning
-                max_tokens=1500
-            )
-            
-            # Extract response
-            message = response.choices[0].message
-            reasoning = message.content or "No explicit reasoning provided"
-            
-            # Save to conversation history
-            self.conversation_history.append({"role": "user", "content": context})
-            self.conversation_history.append({
-                "role": "assistant",
-                "content": reasoning
-            })
-            
-            # Parse tool calls from reasoning text
-            # Agents will specify tools in their response like:
-            # "TOOL: extract_from_pdf" or "TOOLS: search_registry, check_sanctions"
-            tool_calls = self._parse_tool_calls_from_text(reasoning)
-            
-            # Check if agent requests human review
-            requests_review = any(
-                tc["function"] == "request_human_review" 
-                for tc in tool_calls
-            )
-            
-            # Create decision object
-            decision = AgentDecision(
-                agent_id=self.agent_id,
-                reasoning=reasoning,
-                tool_calls=tool_calls,
-                confidence=self._estimate_confidence(reasoning, tool_calls),
-                requests_human_review=requests_review
-            )
-            
-            return decision
+        # Save to conversation history
+        self.conversation_history.append({"role": "user", "content": context})
+        self.conversation_history.append({
+            "role": "assistant",
+            "content": reasoning
+        })
         
-        except Exception as e:
-            # Fallback decision if Nemotron fails
-            return AgentDecision(
-                agent_id=self.agent_id,
-                reasoning=f"Error during reasoning: {str(e)}. Falling back to default behavior.",
-                tool_calls=[],
-                confidence=0.0,
-                requests_human_review=True  # Request human review on errors
-            )
+        # Parse tool calls from reasoning text
+        # Agents will specify tools in their response like:
+        # "TOOL: extract_from_pdf" or "TOOLS: search_registry, check_sanctions"
+        tool_calls = self._parse_tool_calls_from_text(reasoning)
+        
+        # Check if agent requests human review
+        requests_review = any(
+            tc["function"] == "request_human_review" 
+            for tc in tool_calls
+        )
+        
+        # Create decision object
+        return AgentDecision(
+            agent_id=self.agent_id,
+            reasoning=reasoning,
+            tool_calls=tool_calls,
+            confidence=self._estimate_confidence(reasoning, tool_calls),
+            requests_human_review=requests_review
+        )
+    
+    def _failed_decision(self, error: Exception) -> AgentDecision:
+        """Fallback decision if Nemotron fails"""
+        return AgentDecision(
+            agent_id=self.agent_id,
+            reasoning=f"Error during reasoning: {str(error)}. Falling back to default behavior.",
+            tool_calls=[],
+            confidence=0.0,
+            requests_human_review=True  # Request human review on errors
+        )
     
     def _build_context(
         self,
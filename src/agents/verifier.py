@@ -113,6 +113,8 @@ IMPORTANT: Always explicitly mention the tool names you want to use in your resp
                 summary += f"⚠ MATCH FOUND: {state.sanctions_result.matched_name}\n"
                 summary += f"  List: {state.sanctions_result.list_name}\n"
                 summary += f"  Score: {state.sanctions_result.match_score:.0%}\n"
+                if state.sanctions_result.matched_field:
+                    summary += f"  Matched on: {state.sanctions_result.matched_field}\n"
                 summary += "  🚨 CRITICAL: Requires immediate human review\n"
             else:
                 summary += f"✓ CLEAR (match score: {state.sanctions_result.match_score:.0%})\n"
@@ -122,5 +124,15 @@ IMPORTANT: Always explicitly mention the tool names you want to use in your resp
             summary += "○ SANCTIONS CHECK: NOT DONE (CRITICAL)\n"
             summary += "  Action needed: Screen against sanctions lists\n"
         
+        # Sanctions list names found anywhere in the document
+        if state.document_mentions:
+            summary += "\nDOCUMENT MENTIONS OF SANCTIONED ENTITIES:\n"
+            for mention in state.document_mentions:
+                summary += f"⚠ \"{mention.text}\" → {mention.name} ({mention.list_name})\n"
+            summary += "  🚨 CRITICAL: Requires human review of the vendor's relationship to these entities\n"
+        
+        if state.document_truncated:
+            summary += f"\n⚠ Document only partly read ({state.document_truncated}): mentions beyond that point were not screened\n"
+        
         return summary
 
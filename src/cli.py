@@ -1,6 +1,7 @@
 """Command-line interface for RiskLens AI"""
 import sys
 from pathlib import Path
+from typing import Optional
 
 # Ensure project root is in path
 project_root = Path(__file__).parent.parent
@@ -13,6 +14,7 @@ from tabulate import tabulate
 from src.models import AgentState
 from src.state_manager import StateManager
 from src.agent import RiskLensAgent
+from src.llm_cache import LLMResponseCache
 from src.industry_config import detect_industry, get_industry_profile
 
 # Initialize colorama
@@ -22,9 +24,9 @@ init(autoreset=True)
 class RiskLensCLI:
     """Interactive CLI for human-in-the-loop approval"""
     
-    def __init__(self):
+    def __init__(self, llm_cache: Optional[LLMResponseCache] = None):
         self.state_manager = StateManager()
-        self.agent = RiskLensAgent(self.state_manager)
+        self.agent = RiskLensAgent(self.state_manager, llm_cache=llm_cache)
     
     def run(self, pdf_path: str = None):
         """Main CLI entry point"""
@@ -59,7 +61,7 @@ class RiskLensCLI:
             choice = input(f"\n{Fore.GREEN}Select option: {Style.RESET_ALL}").strip()
             
             if choice == "1":
-                pdf_path = input(f"{Fore.GREEN}Enter PDF path: {Style.RESET_ALL}").strip()
+                pdf_path = input(f"{Fore.GREEN}Enter PDF (or .txt/.md/.eml) path: {Style.RESET_ALL}").strip()
                 if pdf_path:
                     self._process_new_submission(pdf_path)
             
@@ -81,7 +83,7 @@ class RiskLensCLI:
         pdf_file = Path(pdf_path)
         
         if not pdf_file.exists():
-            print(f"{Fore.RED}Error: PDF file not found: {pdf_path}{Style.RESET_ALL}")
+            print(f"{Fore.RED}Error: File not found: {pdf_path}{Style.RESET_ALL}")
             return
         
         print(f"\n{Fore.CYAN}{'='*60}")
@@ -267,7 +269,41 @@ class RiskLensCLI:
         
         print(tabulate(results, headers=["Check", "Result", "Details", "Confidence"], tablefmt="simple"))
         print()
-    
+
+        # Closest sanctions entries, so reviewers can judge near misses
+        if state.sanctions_result and state.sanctions_result.candidates:
+            print(f"{Fore.CYAN}Closest Sanctions Entries:{Style.RESET_ALL}")
+            rows = [
+                [c.name, c.list_name, f"{c.score:.0%}", f"{c.ratio:.0%}",
+                 f"{c.partial_ratio:.0%}", f"{c.token_sort_ratio:.0%}"]
+                for c in state.sanctions_result.candidates
+            ]
+            print(tabulate(rows, headers=["Entity", "List", "Score", "Ratio", "Partial", "Token Sort"],
+                           tablefmt="simple"))
+            print()
+
+        # Which of the vendor's fields matched a sanctions entry
+        if state.sanctions_result and state.sanctions_result.field_matches:
+            print(f"{Fore.CYAN}Sanctions Field Matches:{Style.RESET_ALL}")
+            rows = [
+                [m.field.replace("_", " ").title(), m.value, m.name, m.list_name, f"{m.score:.0%}"]
+                for m in state.sanctions_result.field_matches
+            ]
+            print(tabulate(rows, headers=["Field", "Vendor Value", "Entity", "List", "Score"],
+                           tablefmt="simple"))
+            print()
+
+        # Sanctions list names found anywhere in the document
+        if state.document_mentions:
+            print(f"{Fore.RED}Sanctioned Entities Mentioned in Document:{Style.RESET_ALL}")
+            rows = [[m.text, m.name, m.list_name, f"{m.start}-{m.end}"] for m in state.document_mentions]
+            print(tabulate(rows, headers=["Text", "Entity", "List", "Offsets"], tablefmt="simple"))
+            print()
+
+        if state.document_truncated:
+            print(f"{Fore.YELLOW}⚠ Document only partly read: {state.document_truncated}{Style.RESET_ALL}")
+            print()
+
     def _display_risk_assessment(self, state: AgentState):
         """Display risk assessment with industry context"""
         if not state.risk_score:
@@ -412,11 +448,13 @@ def main():
     import argparse
     
     parser = argparse.ArgumentParser(description='RiskLens AI - Automated Vendor Onboarding')
-    parser.add_argument('--pdf', type=str, help='Path to vendor PDF document')
+    parser.add_argument('--pdf', type=str, help='Path to vendor PDF document (or .txt/.md/.eml)')
+    parser.add_argument('--llm-cache', action='store_true',
+                        help='Answer repeated LLM requests from data/llm_cache.db')
     
     args = parser.parse_args()
     
-    cli = RiskLensCLI()
+    cli = RiskLensCLI(LLMResponseCache("data/llm_cache.db") if args.llm_cache else None)
     cli.run(args.pdf)
 
 
@@ -143,6 +143,39 @@ def mark_submission_status(submission_id: str, status: str) -> None:
         conn.commit()
 
 
+def update_after_rescreen(session_id: str, risk_score: Optional[int], risk_level: Optional[str],
+                          status: str = "pending_review") -> None:
+    """Update a processed submission after a sanctions list rescreen changed its outcome."""
+    now = _utc_now()
+    with _get_connection() as conn:
+        conn.execute(
+            """
+            UPDATE submissions
+            SET
+                risk_score = COALESCE(?, risk_score),
+                risk_level = COALESCE(?, risk_level),
+                status = ?,
+                updated_at = ?
+            WHERE session_id = ?
+            """,
+            (risk_score, risk_level, status, now, session_id),
+        )
+        conn.commit()
+
+
+def get_screened_submissions() -> List[Dict[str, Any]]:
+    """Get processed submissions with a known vendor name (for sanctions rescreening)."""
+    with _get_connection() as conn:
+        cur = conn.execute(
+            """
+            SELECT *
+            FROM submissions
+            WHERE session_id IS NOT NULL AND vendor_name IS NOT NULL
+            """
+        )
+        return [dict(row) for row in cur.fetchall()]
+
+
 def get_pending_submissions() -> List[Dict[str, Any]]:
     """Get submissions that need admin attention (uploaded or pending_review)."""
     with _get_connection() as conn:
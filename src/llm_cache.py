@@ -0,0 +1,150 @@
+"""
+Disk-backed cache of LLM responses
+
+Reprocessing a session, re-running tests or onboarding a resubmitted vendor
+sends the same prompts to the endpoint again. Responses are kept in a
+SQLite file keyed by the SHA-256 of the request (model, messages,
+temperature, max_tokens), so an identical request is answered from disk.
+
+Caching is opt-in per call site: an agent or tool only uses a cache it has
+been given (RiskLensAgent(llm_cache=..., llm_cache_sites=...)), and hits
+and misses are counted per site. Entries expire ttl seconds after they
+were stored, and the least recently used are evicted once their total
+size exceeds max_bytes.
+"""
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from typing import Optional
+
+from src.sqlite_lru import SQLiteLRU
+
+# Request arguments that determine the response
+KEY_FIELDS = ("model", "messages", "temperature", "max_tokens")
+
+
+def request_key(args: dict) -> str:
+    """SHA-256 of the request fields a response depends on"""
+    fields = {field: args.get(field) for field in KEY_FIELDS}
+    return hashlib.sha256(
+        json.dumps(fields, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+
+
+class LLMResponseCache:
+    """SQLite cache of chat completion text per request"""
+
+    def __init__(self, db_path: str = "data/llm_cache.db", ttl: Optional[float] = 7 * 24 * 3600,
+                 max_bytes: int = 64 * 2**20):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self._sites: dict[str, list[int]] = {}  # site: [hits, misses]
+        self._table = SQLiteLRU(
+            db_path, "llm_responses",
+            """
+            CREATE TABLE IF NOT EXISTS llm_responses (
+                request_sha256 TEXT PRIMARY KEY,
+                site TEXT NOT NULL,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """,
+            key=("request_sha256",),
+            max_size=max_bytes,
+            size_column="size",
+        )
+        self.db_path = self._table.db_path
+
+    def get(self, site: str, args: dict) -> Optional[str]:
+        """Cached response to a request, or None if absent or expired"""
+        key = (request_key(args),)
+        expired = False
+        row = self._table.select(key, "response, created")
+        if row and self.ttl is not None and time.time() - row[1] > self.ttl:
+            self._table.delete_key(key)
+            row, expired = None, True
+        elif row:
+            self._table.touch(key)
+
+        with self._lock:
+            counts = self._sites.setdefault(site, [0, 0])
+            if row is None:
+                self.misses += 1
+                self.expired += expired
+                counts[1] += 1
+                return None
+            self.hits += 1
+            counts[0] += 1
+            return row[0]
+
+    def put(self, site: str, args: dict, response: str) -> None:
+        """Cache the response to a request"""
+        now = time.time()
+        evicted = self._table.put({
+            "request_sha256": request_key(args), "site": site, "response": response,
+            "size": len(response.encode("utf-8")), "created": now, "last_used": now,
+        })
+        if evicted:
+            with self._lock:
+                self.evictions += evicted
+
+    def stats(self) -> dict:
+        """Hit, miss, expiry and eviction counters, overall and per site, and the cache's size"""
+        entries, size = self._table.size()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": entries,
+                "bytes": size,
+                "sites": {
+                    site: {"hits": hits, "misses": misses,
+                           "hit_rate": hits / (hits + misses) if hits + misses else 0.0}
+                    for site, (hits, misses) in self._sites.items()
+                },
+            }
+
+    def close(self) -> None:
+        """Close the database connection"""
+        self._table.close()
+
+
+def cached_completion(client, args: dict, cache: Optional[LLMResponseCache] = None,
+                      site: str = "") -> Optional[str]:
+    """Content of a chat completion, from the cache when it holds this request"""
+    if cache is not None:
+        content = cache.get(site, args)
+        if content is not None:
+            return content
+    response = client.chat.completions.create(**args)
+    content = response.choices[0].message.content
+    if cache is not None and content is not None:
+        cache.put(site, args, content)
+    return content
+
+
+async def acached_completion(client, args: dict, cache: Optional[LLMResponseCache] = None,
+                             site: str = "") -> Optional[str]:
+    """cached_completion() with an async client; SQLite runs in a worker thread"""
+    if cache is not None:
+        content = await asyncio.to_thread(cache.get, site, args)
+        if content is not None:
+            return content
+    response = await client.chat.completions.create(**args)
+    content = response.choices[0].message.content
+    if cache is not None and content is not None:
+        await asyncio.to_thread(cache.put, site, args, content)
+    return content
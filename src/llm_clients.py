@@ -0,0 +1,185 @@
+"""
+Process-wide pool of LLM clients
+
+Every agent and LLM-backed tool used to build its own OpenAI client, so one
+RiskLensAgent opened connections from six of them and each session (the
+live page builds an agent per background thread) paid for new TLS
+handshakes. Clients now come from one registry per process: all of them
+send through a single keep-alive HTTP connection pool, and one client is
+built per endpoint and shared by every caller.
+
+Pool limits come from the environment (LLM_MAX_CONNECTIONS,
+LLM_MAX_KEEPALIVE_CONNECTIONS, LLM_KEEPALIVE_EXPIRY, in seconds) and
+settings can differ per model (endpoint, key, timeout, retries):
+
+    registry = get_llm_registry()
+    registry.configure_model("meta/llama-3.1-8b-instruct", timeout=20.0)
+    client = registry.client("meta/llama-3.1-8b-instruct")
+
+async_client() gives AsyncOpenAI clients for coroutines, pooled the same
+way. An async HTTP client belongs to the event loop it was used on, so
+each running loop gets its own pool.
+
+The pools are openai's own DefaultHttpxClient and DefaultAsyncHttpxClient,
+so they use whichever HTTP library the installed openai is built on (httpx,
+or its httpx2 fork in newer releases) with the SDK's defaults.
+"""
+import asyncio
+import importlib
+import os
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Optional
+
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+
+DEFAULT_MODEL = "nvidia/llama-3.3-nemotron-super-49b-v1.5"
+DEFAULT_BASE_URL = "https://integrate.api.nvidia.com/v1"
+
+
+def _pool_limits(max_connections: int, max_keepalive_connections: int, keepalive_expiry: float):
+    """Connection pool limits, as the Limits of the HTTP library openai uses"""
+    http_library = importlib.import_module(DefaultHttpxClient.__mro__[1].__module__.partition(".")[0])
+    return http_library.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=keepalive_expiry,
+    )
+
+
+@dataclass(frozen=True)
+class ModelSettings:
+    """Endpoint and request settings for one model"""
+    base_url: Optional[str] = None  # NVIDIA_BASE_URL when None
+    api_key: Optional[str] = None  # NVIDIA_API_KEY when None
+    timeout: float = 60.0  # seconds per request
+    max_retries: int = 2
+
+
+class LLMClientRegistry:
+    """
+    OpenAI-compatible clients sharing one pooled HTTP client
+
+    Clients are built on first use and cached per (endpoint, key, timeout,
+    retries), so models with the same settings share a client. Each client
+    sends its model's timeout with every request, so the pool has none of
+    its own. The pools are thread-safe, so the clients are shared across
+    threads too.
+    """
+
+    def __init__(self, max_connections: int = 20, max_keepalive_connections: int = 10,
+                 keepalive_expiry: float = 30.0):
+        self.limits = _pool_limits(max_connections, max_keepalive_connections, keepalive_expiry)
+        self._lock = threading.Lock()
+        self._settings: dict[str, ModelSettings] = {}
+        self._clients: dict[tuple, OpenAI] = {}
+        self._http_client: Optional[DefaultHttpxClient] = None
+        # Per event loop: (pooled async HTTP client, {settings key: AsyncOpenAI})
+        self._async_pools = weakref.WeakKeyDictionary()
+
+    def configure_model(self, model: str, **settings) -> ModelSettings:
+        """Set a model's ModelSettings fields; unset ones keep their defaults"""
+        with self._lock:
+            self._settings[model] = ModelSettings(**settings)
+            return self._settings[model]
+
+    def settings(self, model: str) -> ModelSettings:
+        """A model's settings, defaults unless configured"""
+        return self._settings.get(model, ModelSettings())
+
+    def _client_key(self, model: str) -> tuple:
+        """(base_url, api_key, timeout, max_retries) for a model's client"""
+        settings = self.settings(model)
+        api_key = settings.api_key or os.getenv("NVIDIA_API_KEY")
+        if not api_key:
+            raise ValueError("NVIDIA_API_KEY not found in environment")
+        base_url = settings.base_url or os.getenv("NVIDIA_BASE_URL", DEFAULT_BASE_URL)
+        return base_url, api_key, settings.timeout, settings.max_retries
+
+    def client(self, model: str = DEFAULT_MODEL) -> OpenAI:
+        """
+        The shared client for a model
+
+        Raises ValueError when no API key is configured or in the
+        environment.
+        """
+        key = self._client_key(model)
+        base_url, api_key, timeout, max_retries = key
+        with self._lock:
+            if key not in self._clients:
+                if self._http_client is None:
+                    self._http_client = DefaultHttpxClient(limits=self.limits)
+                self._clients[key] = OpenAI(
+                    api_key=api_key,
+                    base_url=base_url,
+                    timeout=timeout,
+                    max_retries=max_retries,
+                    http_client=self._http_client,
+                )
+            return self._clients[key]
+
+    def async_client(self, model: str = DEFAULT_MODEL) -> AsyncOpenAI:
+        """
+        The shared async client for a model on the running event loop
+
+        Must be called from a coroutine. Raises ValueError like client().
+        """
+        key = self._client_key(model)
+        base_url, api_key, timeout, max_retries = key
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if loop not in self._async_pools:
+                self._async_pools[loop] = (DefaultAsyncHttpxClient(limits=self.limits), {})
+            http_client, clients = self._async_pools[loop]
+            if key not in clients:
+                clients[key] = AsyncOpenAI(
+                    api_key=api_key,
+                    base_url=base_url,
+                    timeout=timeout,
+                    max_retries=max_retries,
+                    http_client=http_client,
+                )
+            return clients[key]
+
+    async def aclose(self) -> None:
+        """Close the running event loop's pooled connections"""
+        with self._lock:
+            pool = self._async_pools.pop(asyncio.get_running_loop(), None)
+        if pool is not None:
+            await pool[0].aclose()
+
+    def close(self) -> None:
+        """Close the pooled connections; clients are rebuilt on next use"""
+        with self._lock:
+            if self._http_client is not None:
+                self._http_client.close()
+            self._http_client = None
+            self._clients.clear()
+
+
+_registry: Optional[LLMClientRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_llm_registry() -> LLMClientRegistry:
+    """The process's registry, created from the environment on first use"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = LLMClientRegistry(
+                max_connections=int(os.getenv("LLM_MAX_CONNECTIONS", "20")),
+                max_keepalive_connections=int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "10")),
+                keepalive_expiry=float(os.getenv("LLM_KEEPALIVE_EXPIRY", "30")),
+            )
+        return _registry
+
+
+def get_llm_client(model: str = DEFAULT_MODEL) -> OpenAI:
+    """Shorthand for get_llm_registry().client(model)"""
+    return get_llm_registry().client(model)
+
+
+def get_async_llm_client(model: str = DEFAULT_MODEL) -> AsyncOpenAI:
+    """Shorthand for get_llm_registry().async_client(model)"""
+    return get_llm_registry().async_client(model)
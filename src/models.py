@@ -27,6 +27,37 @@ class RegistryResult(BaseModel):
     confidence: float = 0.0
 
 
+class SanctionsCandidate(BaseModel):
+    """A ranked sanctions entry with its per-algorithm scores"""
+    name: str
+    list_name: str
+    details: Optional[str] = None
+    score: float  # best of the three below
+    ratio: float
+    partial_ratio: float
+    token_sort_ratio: float
+
+
+class SanctionsFieldMatch(BaseModel):
+    """A sanctions entry matched by one field of the vendor's details"""
+    field: Literal["name", "address", "bank_account", "registration_number"]
+    value: str  # the vendor's value that matched
+    name: str
+    list_name: str
+    details: Optional[str] = None
+    score: float
+
+
+class SanctionsMention(BaseModel):
+    """A sanctions list name found in a submission's document text"""
+    name: str
+    list_name: str
+    details: Optional[str] = None
+    start: int  # character offsets into the extracted text
+    end: int
+    text: str  # the text as it appears in the document
+
+
 class SanctionsResult(BaseModel):
     """Sanctions check result"""
     match: bool
@@ -34,6 +65,24 @@ class SanctionsResult(BaseModel):
     list_name: Optional[str] = None
     match_score: float = 0.0
     details: Optional[str] = None
+    list_version: Optional[int] = None  # SanctionsChecker.list_version screened against
+    candidates: list[SanctionsCandidate] = Field(default_factory=list)  # top-k, best first
+    candidates_pruned: Optional[int] = None  # entries skipped without exact scoring
+    match_type: Optional[Literal["fuzzy", "phonetic", "exact"]] = None  # how a match was found
+    matched_field: Optional[Literal["name", "address", "bank_account", "registration_number"]] = None
+    field_matches: list[SanctionsFieldMatch] = Field(default_factory=list)  # every matching field
+
+
+class RescreenReport(BaseModel):
+    """Outcome of rescreening stored vendors after a sanctions list change"""
+    entries_added: int = 0
+    entries_removed: int = 0
+    full_rescreen: bool = False  # no previous list version to diff against
+    vendors_screened: int = 0
+    new_matches: list[str] = Field(default_factory=list)  # session ids
+    removed_matches: list[str] = Field(default_factory=list)
+    score_updates: list[str] = Field(default_factory=list)
+    list_sha256: Optional[str] = None
 
 
 class RiskScore(BaseModel):
@@ -92,6 +141,8 @@ class AgentState(BaseModel):
     # Verification results
     registry_result: Optional[RegistryResult] = None
     sanctions_result: Optional[SanctionsResult] = None
+    document_mentions: list[SanctionsMention] = Field(default_factory=list)  # list names anywhere in the PDF
+    document_truncated: Optional[str] = None  # why extraction stopped before the end of the PDF
     
     # Risk assessment
     risk_score: Optional[RiskScore] = None
@@ -0,0 +1,193 @@
+"""
+Delta rescreening of stored vendors after a sanctions list change
+
+Only the entries that differ between two list versions are screened, so a
+list update costs O(vendors x changed entries) instead of a full re-run of
+every vendor through the pipeline:
+
+- Added entries are screened against every vendor in the state store and
+  the submissions table.
+- Vendors whose current match is a removed entry are re-screened against
+  the full new list.
+
+The list version last rescreened against is kept as a baseline copy next to
+the sanctions list, so each run diffs against the previous one.
+"""
+import os
+import shutil
+from pathlib import Path
+from typing import Optional
+
+from src import db
+from src.models import AgentState, CompanyInfo, RescreenReport, RiskScore, SanctionsResult
+from src.state_manager import StateManager
+from src.tools.risk_calculator import RiskCalculator
+from src.tools.sanctions_checker import SanctionsChecker
+from src.tools.sanctions_snapshot import source_digest
+from src.tools.sanctions_store import diff_rows, parse_sanctions_file
+
+
+def default_baseline_path(sanctions_file: Path) -> Path:
+    """Where the last rescreened list version is kept unless one is given"""
+    return Path(sanctions_file).with_suffix(".screened.txt")
+
+
+class SanctionsRescreener:
+    """Re-screens stored vendors against the entries changed since the last run"""
+
+    def __init__(self, sanctions_file: str = "data/sanctions_list.txt",
+                 baseline_file: Optional[str] = None, state_dir: str = "state"):
+        self.sanctions_file = Path(sanctions_file)
+        self.baseline_file = Path(baseline_file) if baseline_file else default_baseline_path(self.sanctions_file)
+        self.state_manager = StateManager(state_dir)
+
+    def rescreen(self, write: bool = True) -> RescreenReport:
+        """
+        Diff the list against the baseline and rescreen affected vendors
+
+        With write=False nothing is saved and the baseline is left alone, so
+        the report shows what a real run would change. Without a baseline
+        every vendor is screened against the whole list once.
+        """
+        new_rows = list(parse_sanctions_file(self.sanctions_file))
+        if self.baseline_file.exists():
+            added, removed = diff_rows(parse_sanctions_file(self.baseline_file), new_rows)
+            full = False
+        else:
+            added, removed, full = new_rows, [], True
+
+        report = RescreenReport(
+            entries_added=len(added),
+            entries_removed=len(removed),
+            full_rescreen=full,
+            list_sha256=source_digest(self.sanctions_file),
+        )
+        vendors = self._load_vendors()
+        report.vendors_screened = len(vendors)
+
+        updates = {}
+        if added and vendors:
+            delta = SanctionsChecker.from_rows(added)
+            session_ids = list(vendors)
+            results = delta.check_sanctions_batch([vendors[sid][0] for sid in session_ids])
+            for session_id, result in zip(session_ids, results):
+                state = vendors[session_id][1]
+                if state is None and not result.match:
+                    continue  # Only a new match changes a submission without state
+                if self._improves(result, self._current_result(state)):
+                    updates[session_id] = result
+
+        # Vendors matched to a removed entry need the full list to find their new best
+        removed_keys = {(name, list_name) for name, list_name, *_ in removed}
+        orphaned = [
+            session_id for session_id, (_, state) in vendors.items()
+            if session_id not in updates and state and state.sanctions_result
+            and state.sanctions_result.match
+            and (state.sanctions_result.matched_name, state.sanctions_result.list_name) in removed_keys
+        ]
+        if orphaned:
+            full_list = SanctionsChecker(str(self.sanctions_file), auto_reload=False)
+            results = full_list.check_sanctions_batch([vendors[sid][0] for sid in orphaned])
+            updates.update(zip(orphaned, results))
+
+        risk_calculator = RiskCalculator() if write else None
+        for session_id, result in updates.items():
+            result = result.model_copy(update={"list_version": None})
+            company_info, state = vendors[session_id]
+            current = self._current_result(state)
+            if result.match and not current.match:
+                report.new_matches.append(session_id)
+            elif current.match and not result.match:
+                report.removed_matches.append(session_id)
+            else:
+                report.score_updates.append(session_id)
+            if write:
+                self._write_back(session_id, company_info, state, current, result, risk_calculator)
+
+        if write:
+            self._update_baseline()
+        return report
+
+    def _load_vendors(self) -> dict[str, tuple[CompanyInfo, Optional[AgentState]]]:
+        """session_id -> (company info, state) for every screenable vendor"""
+        vendors = {}
+        for session_id in self.state_manager.list_sessions():
+            try:
+                state = self.state_manager.load_state(session_id)
+            except (OSError, ValueError):
+                continue  # Unreadable or incomplete session
+            if state.company_info and state.company_info.company_name:
+                vendors[session_id] = (state.company_info, state)
+
+        # Submissions whose session state is gone are still screened by name
+        for submission in db.get_screened_submissions():
+            vendors.setdefault(submission["session_id"], (CompanyInfo(company_name=submission["vendor_name"]), None))
+        return vendors
+
+    @staticmethod
+    def _current_result(state: Optional[AgentState]) -> SanctionsResult:
+        if state and state.sanctions_result:
+            return state.sanctions_result
+        return SanctionsResult(match=False)
+
+    @staticmethod
+    def _improves(result: SanctionsResult, current: SanctionsResult) -> bool:
+        """
+        Whether a result against added entries supersedes the stored one
+
+        Without a match either side, the scores are bests over different
+        lists (the added entries against the whole list) and say nothing
+        about each other, so only a new match or a better-scoring match
+        counts.
+        """
+        if result.match != current.match:
+            return result.match
+        return result.match and result.match_score > current.match_score
+
+    def _write_back(self, session_id: str, company_info: CompanyInfo, state: Optional[AgentState],
+                    current: SanctionsResult, result: SanctionsResult,
+                    risk_calculator: RiskCalculator) -> None:
+        """
+        Save the new result and send changed outcomes back to review
+
+        company_info is the vendor as screened: the session's, or for a
+        submission without state, the one built from its vendor name.
+        """
+        risk_score = None
+        if result.match and not current.match:
+            # A sanctions match is high risk regardless of the earlier assessment
+            registry_result = state.registry_result if state else None
+            risk = risk_calculator.compute_risk(company_info, registry_result, result)
+            risk_score = RiskScore(**risk.data)
+
+        if state:
+            state.sanctions_result = result
+            if risk_score:
+                state.risk_score = risk_score
+                state.access_recommendation = None
+                state.human_decision = None
+                state.workflow_complete = False
+                state.requires_human_review = True
+                state.review_reason = (
+                    f"[HIGH] Sanctions list update: now matches {result.matched_name} ({result.list_name})"
+                )
+            elif current.match and not result.match:
+                state.requires_human_review = True
+                state.review_reason = (
+                    f"[MEDIUM] Sanctions list update: {current.matched_name} was removed from "
+                    f"{current.list_name}; re-assess risk"
+                )
+            self.state_manager.save_state(state)
+
+        if result.match != current.match:
+            db.update_after_rescreen(
+                session_id,
+                risk_score.total_score if risk_score else None,
+                risk_score.risk_level if risk_score else None,
+            )
+
+    def _update_baseline(self) -> None:
+        """Record the list version just rescreened against"""
+        tmp = self.baseline_file.with_name(self.baseline_file.name + ".tmp")
+        shutil.copyfile(self.sanctions_file, tmp)
+        os.replace(tmp, self.baseline_file)
@@ -0,0 +1,149 @@
+"""
+Least-recently-used SQLite table shared by the on-disk caches
+
+The sanctions result, PDF extraction and LLM response caches each keep one
+table in a SQLite file and evict the least recently used rows once it
+outgrows a limit. SQLiteLRU holds what they share: one connection per
+cache, last_used bookkeeping and eviction. The table's total size is kept
+in a side table and adjusted by every write, so a put never re-scans the
+table, and processes sharing the file share the total.
+"""
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
+
+
+class SQLiteLRU:
+    """
+    A cache table with a last_used column, bounded by its total size
+
+    schema is the table's CREATE TABLE IF NOT EXISTS statement and key its
+    primary key columns. Rows are weighed by size_column, or count 1 each
+    without one, so max_size is then an entry count.
+    """
+
+    def __init__(self, db_path, table: str, schema: str, key: Sequence[str], max_size: int,
+                 size_column: Optional[str] = None):
+        self.db_path = Path(db_path)
+        self.table = table
+        self.key = tuple(key)
+        self.max_size = max_size
+        self.size_column = size_column
+        self._weight = size_column or "1"
+        self._where = " AND ".join(f"{column} = ?" for column in self.key)
+        self._lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit; writes open their own transactions (see _write)
+        self._conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None,
+                                     check_same_thread=False)
+        with self._write() as conn:
+            conn.execute(schema)
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_last_used ON {table} (last_used)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS lru_sizes (name TEXT PRIMARY KEY, total INTEGER NOT NULL)"
+            )
+            # Summed once, for a file written before sizes were tracked
+            conn.execute(
+                f"INSERT OR IGNORE INTO lru_sizes SELECT ?, COALESCE(SUM({self._weight}), 0) FROM {table}",
+                (table,),
+            )
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """The connection inside a write transaction, rolled back on error"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _grow(self, conn: sqlite3.Connection, delta: int) -> int:
+        """Add delta to the tracked total and return the new total"""
+        conn.execute("UPDATE lru_sizes SET total = total + ? WHERE name = ?", (delta, self.table))
+        return conn.execute("SELECT total FROM lru_sizes WHERE name = ?", (self.table,)).fetchone()[0]
+
+    def select(self, key: Sequence, columns: str) -> Optional[tuple]:
+        """columns of the row with this key, or None"""
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT {columns} FROM {self.table} WHERE {self._where}", tuple(key)
+            ).fetchone()
+
+    def touch(self, key: Sequence) -> None:
+        """Mark a row as just used"""
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE {self.table} SET last_used = ? WHERE {self._where}", (time.time(), *key)
+            )
+
+    def put(self, values: dict) -> int:
+        """
+        Insert or replace a row, then evict least recently used rows until
+        the table fits max_size again; returns how many were evicted
+
+        last_used is set to now unless values has it.
+        """
+        values = {"last_used": time.time(), **values}
+        key = tuple(values[column] for column in self.key)
+        weight = values[self.size_column] if self.size_column else 1
+        columns = ", ".join(values)
+        placeholders = ", ".join("?" * len(values))
+        with self._write() as conn:
+            old = conn.execute(
+                f"SELECT {self._weight} FROM {self.table} WHERE {self._where}", key
+            ).fetchone()
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} ({columns}) VALUES ({placeholders})",
+                tuple(values.values()),
+            )
+            excess = self._grow(conn, weight - (old[0] if old else 0)) - self.max_size
+            if excess <= 0:
+                return 0
+
+            evicted, freed = [], 0
+            for rowid, row_weight in conn.execute(
+                f"SELECT rowid, {self._weight} FROM {self.table} ORDER BY last_used"
+            ):
+                if freed >= excess:
+                    break
+                evicted.append((rowid,))
+                freed += row_weight
+            conn.executemany(f"DELETE FROM {self.table} WHERE rowid = ?", evicted)
+            self._grow(conn, -freed)
+        return len(evicted)
+
+    def delete(self, where: str, params: Sequence = ()) -> int:
+        """Delete the rows matching a WHERE clause; returns how many there were"""
+        with self._write() as conn:
+            count, weight = conn.execute(
+                f"SELECT COUNT(*), COALESCE(SUM({self._weight}), 0) FROM {self.table} WHERE {where}",
+                tuple(params),
+            ).fetchone()
+            if count:
+                conn.execute(f"DELETE FROM {self.table} WHERE {where}", tuple(params))
+                self._grow(conn, -weight)
+        return count
+
+    def delete_key(self, key: Sequence) -> int:
+        """Delete the row with this key, if any"""
+        return self.delete(self._where, key)
+
+    def size(self) -> tuple[int, int]:
+        """(rows, total size) of the table"""
+        with self._lock:
+            entries = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+            total = self._conn.execute(
+                "SELECT total FROM lru_sizes WHERE name = ?", (self.table,)
+            ).fetchone()[0]
+        return entries, total
+
+    def close(self) -> None:
+        """Close the connection"""
+        with self._lock:
+            self._conn.close()
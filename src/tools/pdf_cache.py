@@ -0,0 +1,107 @@
+"""
+Content-addressed cache of PDF extractions
+
+The vendor dashboard stores every upload under a new filename, and
+reprocessing a session extracts its PDF again, so the same document is
+often parsed more than once. Extractions are kept in a SQLite file keyed by
+the SHA-256 of the PDF bytes: a re-upload under any name skips PyPDF2.
+
+Each entry records the text extractor version and the field pattern
+version it was produced with. Text from another PyPDF2 version is not
+served; when only the patterns changed, the cached text is served without
+its fields, which the extractor recomputes in microseconds.
+"""
+import json
+import threading
+from typing import Optional
+
+from src.sqlite_lru import SQLiteLRU
+
+
+class PDFExtractionCache:
+    """
+    SQLite cache of (text, fields) per PDF content hash
+
+    Entries are evicted least recently used first once their total size
+    exceeds max_bytes.
+    """
+
+    def __init__(self, db_path: str = "data/pdf_cache.db", max_bytes: int = 256 * 2**20):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.text_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._table = SQLiteLRU(
+            db_path, "pdf_extractions",
+            """
+            CREATE TABLE IF NOT EXISTS pdf_extractions (
+                pdf_sha256 TEXT PRIMARY KEY,
+                text_version TEXT NOT NULL,
+                pattern_version TEXT NOT NULL,
+                fields TEXT NOT NULL,
+                text TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """,
+            key=("pdf_sha256",),
+            max_size=max_bytes,
+            size_column="size",
+        )
+        self.db_path = self._table.db_path
+
+    def get(self, pdf_sha256: str, text_version: str,
+            pattern_version: str) -> tuple[Optional[str], Optional[dict]]:
+        """
+        (text, fields) cached for a PDF, each None unless still valid
+
+        fields is only returned with text, and only when it was extracted
+        with the current patterns.
+        """
+        row = self._table.select((pdf_sha256,), "text_version, pattern_version, fields, text")
+        if row and row[0] == text_version:
+            self._table.touch((pdf_sha256,))
+
+        with self._lock:
+            if not row or row[0] != text_version:
+                self.misses += 1
+                return None, None
+            if row[1] != pattern_version:
+                self.text_hits += 1
+                return row[3], None
+            self.hits += 1
+            return row[3], json.loads(row[2])
+
+    def put(self, pdf_sha256: str, text_version: str, pattern_version: str,
+            fields: dict, text: str) -> None:
+        """Cache the text and fields extracted from a PDF"""
+        fields_json = json.dumps(fields)
+        size = len(text.encode("utf-8")) + len(fields_json)
+        evicted = self._table.put({
+            "pdf_sha256": pdf_sha256, "text_version": text_version,
+            "pattern_version": pattern_version, "fields": fields_json, "text": text, "size": size,
+        })
+        if evicted:
+            with self._lock:
+                self.evictions += evicted
+
+    def stats(self) -> dict:
+        """Hit, miss and eviction counters and the cache's current size"""
+        entries, size = self._table.size()
+        with self._lock:
+            lookups = self.hits + self.text_hits + self.misses
+            return {
+                "hits": self.hits,
+                "text_hits": self.text_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits + self.text_hits) / lookups if lookups else 0.0,
+                "entries": entries,
+                "bytes": size,
+            }
+
+    def close(self) -> None:
+        """Close the database connection"""
+        self._table.close()
@@ -1,15 +1,319 @@
 """PDF extraction tool"""
+import email
+import hashlib
+import html
+import itertools
+import json
+import multiprocessing
+import os
 import re
+import signal
+import threading
+import time
+import zlib
+from email import policy
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from datetime import datetime
+from typing import Iterable, Iterator, Optional
+import PyPDF2
 from PyPDF2 import PdfReader
+from PyPDF2.generic import ArrayObject, DecodedStreamObject
 from src.models import CompanyInfo, ToolResult
+from src.tools.pdf_cache import PDFExtractionCache
+from src.tools.text_store import DocumentTextStore, file_digest
+
+# Cached text from another PyPDF2 version is extracted again
+TEXT_VERSION = f"PyPDF2 {PyPDF2.__version__}"
+
+# Sources read as text, without PDF parsing
+TEXT_SUFFIXES = (".txt", ".md", ".eml")
+
+_MARKDOWN_MARKUP = re.compile(r"\*\*|__|`|^\s{0,3}(?:#{1,6}|[-*+]|>)\s+", re.MULTILINE)
+_MARKDOWN_TABLE_ROW = re.compile(r"^\s*\|([^|\n]+)\|([^|\n]+)\|\s*$", re.MULTILINE)
+_HTML_TAG = re.compile(r"<[^>]+>")
+
+# Lines of the previous page searched with each page, so a label at the
+# foot of one page still finds its value at the top of the next
+_CARRY_LINES = 2
+
+# Start of every truncation reason given for a read the time budget stopped
+_BUDGET_USED = "time budget of {:g}s used"
+
+def _markdown_to_text(text: str) -> str:
+    """Markdown with emphasis, heading and list markers dropped and
+    two-column table rows as "label: value" lines"""
+    text = _MARKDOWN_TABLE_ROW.sub(lambda m: f"{m.group(1).strip()}: {m.group(2).strip()}", text)
+    return _MARKDOWN_MARKUP.sub("", text)
+
+
+def _email_to_text(data: bytes) -> str:
+    """Subject and body of an email, the plain text part preferred"""
+    message = email.message_from_bytes(data, policy=policy.default)
+    body = message.get_body(preferencelist=("plain", "html"))
+    content = body.get_content() if body is not None else ""
+    if body is not None and body.get_content_type() == "text/html":
+        content = html.unescape(_HTML_TAG.sub("\n", content))
+    return f"Subject: {message.get('subject', '')}\n\n{content}"
+
+
+def _inflated_size(data: bytes, limit: int) -> int:
+    """Size of zlib data inflated 64 KiB at a time, counted only until it passes limit"""
+    inflater = zlib.decompressobj()
+    size = 0
+    while data and size <= limit:
+        size += len(inflater.decompress(data, 2**16))
+        data = inflater.unconsumed_tail
+    if size <= limit:
+        size += len(inflater.flush())
+    return size
+
+
+def _content_size(page, limit: int) -> int:
+    """
+    Decoded size of a page's content streams, counted only until it
+    passes limit, without parsing them
+
+    Unfiltered streams are sized by their raw length and Flate streams are
+    inflated piecewise, so an oversized page is never decoded whole. Other
+    filters (ASCII encodings, which only shrink, and the LZW, run-length
+    and chained filters that are rare in content streams) are decoded to
+    be measured.
+    """
+    contents = page.get("/Contents")
+    if contents is None:
+        return 0
+    contents = contents.get_object()
+    streams = contents if isinstance(contents, ArrayObject) else [contents]
+    size = 0
+    for stream in streams:
+        stream = stream.get_object()
+        filters = stream.get("/Filter", ())
+        filters = [filters] if isinstance(filters, str) else list(filters)
+        # _data is the stream's raw bytes as read from the file
+        if not filters or isinstance(stream, DecodedStreamObject):
+            size += len(stream._data)
+        elif filters in (["/FlateDecode"], ["/Fl"]):
+            try:
+                size += _inflated_size(stream._data, limit - size)
+            except zlib.error:
+                size += len(stream.get_data())  # PyPDF2 recovers what it can
+        else:
+            size += len(stream.get_data())
+        if size > limit:
+            break
+    return size
+
+
+# State of an extract_many worker process: its own extractor
+_worker_extractor = None
+
+
+class _Timeout(BaseException):
+    """Raised in an extract_many worker when a document runs past its timeout"""
+
+
+def _on_timeout(signum, frame):
+    raise _Timeout()
+
+
+class _BudgetExceeded(BaseException):
+    """Raised inside a PyPDF2 call that runs past the extractor's time budget"""
+
+
+def _on_budget(signum, frame):
+    raise _BudgetExceeded()
+
+
+def _call_within(deadline: Optional[float], call, *args):
+    """
+    call(*args), interrupted with _BudgetExceeded once time.monotonic()
+    passes deadline
+
+    Uses SIGALRM, so it only interrupts on the main thread of a POSIX
+    process (as in extract_many workers); elsewhere the call runs to
+    completion and the budget is checked after it. An interval timer
+    already running, such as extract_many's per-document timeout, is left
+    to fire if it is due first and is re-armed afterwards otherwise.
+    """
+    if (deadline is None or not hasattr(signal, "setitimer")
+            or threading.current_thread() is not threading.main_thread()):
+        return call(*args)
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise _BudgetExceeded()
+    outer, _ = signal.getitimer(signal.ITIMER_REAL)
+    if outer and outer <= remaining:
+        return call(*args)
+    started = time.monotonic()
+    previous = signal.signal(signal.SIGALRM, _on_budget)
+    signal.setitimer(signal.ITIMER_REAL, remaining)
+    try:
+        try:
+            return call(*args)
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    finally:
+        # Restored even when the alarm lands just as the call returns
+        signal.signal(signal.SIGALRM, previous)
+        if outer:
+            signal.setitimer(signal.ITIMER_REAL, max(outer - (time.monotonic() - started), 1e-6))
+
+
+def _init_worker(patterns: dict, limits: dict, cache_path: Optional[str], cache_max_bytes: int,
+                 text_store_args: Optional[tuple]) -> None:
+    global _worker_extractor
+    cache = PDFExtractionCache(cache_path, cache_max_bytes) if cache_path else None
+    text_store = DocumentTextStore(*text_store_args) if text_store_args else None
+    _worker_extractor = PDFExtractor(cache, text_store=text_store, **limits)
+    _worker_extractor.patterns = patterns
+    _worker_extractor._compile_patterns()
+
+
+def _extract_in_worker(pdf_path: str, timeout: Optional[float]) -> ToolResult:
+    # Interval timers are POSIX only; elsewhere documents run to completion
+    timed = bool(timeout) and hasattr(signal, "setitimer")
+    if timed:
+        signal.signal(signal.SIGALRM, _on_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return _worker_extractor.extract_from_pdf(pdf_path)
+    except _Timeout:
+        return ToolResult(
+            tool_name="extract_from_pdf",
+            success=False,
+            error=f"Timed out after {timeout:g}s extracting PDF: {pdf_path}"
+        )
+    finally:
+        if timed:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+# Seconds a parse worker is given past the time budget to send back what
+# it read, before it is killed
+_KILL_GRACE = 5.0
+
+
+def _serve_reads(conn) -> None:
+    """Body of a parse worker: read each (path, patterns, limits) sent"""
+    while True:
+        try:
+            pdf_path, patterns, limits = conn.recv()
+        except EOFError:
+            return
+        extractor = PDFExtractor(**limits)
+        extractor.patterns = patterns
+        extractor._compile_patterns()
+        truncation = []
+        try:
+            text, fields = extractor._parse(pdf_path, truncation)
+        except Exception as e:
+            conn.send((None, None, str(e) or type(e).__name__))
+        else:
+            conn.send((text, fields, truncation))
+
+
+class _ParseWorker:
+    """
+    A spawned process reading PDFs for threads SIGALRM cannot interrupt
+
+    The read runs on the worker's main thread, where the time budget
+    interrupts PyPDF2 mid-page, and a worker still busy past the budget
+    is killed.
+    """
+
+    def __init__(self):
+        context = multiprocessing.get_context("spawn")
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_serve_reads, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+
+    def read(self, pdf_path: str, patterns: dict, limits: dict,
+             timeout: float) -> Optional[tuple[str, Optional[dict], object]]:
+        """(text, fields, truncation or error) of a PDF, None after timeout seconds"""
+        self.conn.send((pdf_path, patterns, limits))
+        if not self.conn.poll(timeout):
+            return None
+        return self.conn.recv()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+# Idle parse workers, reused across reads and threads
+_idle_workers: list[_ParseWorker] = []
+_idle_lock = threading.Lock()
+
+
+def _read_in_worker(pdf_path: str, patterns: dict, limits: dict, truncation: list) -> tuple[str, Optional[dict]]:
+    """
+    (text, fields or None) of a PDF read in a parse worker, within
+    limits["time_budget"]
+
+    A worker that overruns the budget is killed, and the read gives no
+    text. A worker that fails to read the PDF raises RuntimeError.
+    """
+    budget = limits["time_budget"]
+    with _idle_lock:
+        worker = _idle_workers.pop() if _idle_workers else None
+    worker = worker or _ParseWorker()
+    try:
+        outcome = worker.read(str(pdf_path), patterns, limits, budget + _KILL_GRACE)
+    except (EOFError, OSError):
+        worker.kill()
+        raise RuntimeError(f"Parse worker exited while reading PDF: {pdf_path}")
+    if outcome is None:
+        worker.kill()
+        truncation.append(_BUDGET_USED.format(budget) + "; the read was stopped")
+        return "", None
+    with _idle_lock:
+        _idle_workers.append(worker)
+    text, fields, reasons = outcome
+    if text is None:
+        raise RuntimeError(reasons)
+    truncation.extend(reasons)
+    return text, fields
 
 
 class PDFExtractor:
-    """Extracts company information from PDF documents"""
+    """
+    Extracts company information from PDF documents
     
-    def __init__(self):
+    Pages are read one at a time, up to max_pages. With stop_when_complete,
+    fields are matched page by page and reading stops as soon as every
+    field is found; the document text then covers only the pages read, and
+    field values can differ from a full read (see extract_until_complete).
+    
+    A per-document budget bounds what a malformed or huge upload can cost:
+    reading stops after time_budget seconds or max_text_chars characters,
+    and pages whose decoded content exceeds max_page_bytes are skipped
+    without being parsed, the pages after them still read. The time budget
+    interrupts PyPDF2 mid-page on the main thread of a POSIX process, as in
+    extract_many workers. Called from another thread, a budgeted read runs
+    in a parse worker process instead, which is killed if it overruns. A
+    document cut short by any limit or a skipped page, or by a page that
+    cannot be parsed, gives the text and fields read with "truncated" set.
+    
+    With a text_store, the text of each PDF is kept beside it and later
+    stages read it through document_text(), so a document is parsed at
+    most once.
+    """
+    
+    def __init__(self, cache: Optional[PDFExtractionCache] = None,
+                 max_pages: Optional[int] = None, stop_when_complete: bool = False,
+                 time_budget: Optional[float] = None, max_page_bytes: Optional[int] = None,
+                 max_text_chars: Optional[int] = None, text_store: Optional[DocumentTextStore] = None):
+        self.cache = cache
+        self.text_store = text_store
+        self.max_pages = max_pages
+        self.stop_when_complete = stop_when_complete
+        self.time_budget = time_budget
+        self.max_page_bytes = max_page_bytes
+        self.max_text_chars = max_text_chars
         self.patterns = {
             'company_name': [
                 r'company\s*name[:\s]+([^\n]+)',
@@ -49,9 +353,306 @@ class PDFExtractor:
                 r'sector[:\s]+([^\n]+)',
             ],
         }
+        self._compile_patterns()
+    
+    def _compile_patterns(self):
+        """
+        Precompile self.patterns for extract_fields; call again after
+        changing them
+        
+        pattern_version hashes the patterns, so cached fields extracted
+        with other patterns are not reused.
+        """
+        flags = re.IGNORECASE | re.MULTILINE
+        self.pattern_version = hashlib.sha256(
+            json.dumps(self.patterns, sort_keys=True).encode("utf-8")
+        ).hexdigest()[:16]
+        self._compiled = {
+            field: [re.compile(pattern, flags) for pattern in patterns]
+            for field, patterns in self.patterns.items()
+        }
+    
+    @property
+    def text_version(self) -> str:
+        """
+        What stored text depends on: the PyPDF2 version and how far it was
+        read
+        
+        The time budget is left out, as reads it stops are never stored.
+        """
+        version = TEXT_VERSION
+        for limit in ("max_pages", "max_page_bytes", "max_text_chars"):
+            if getattr(self, limit) is not None:
+                version += f"; {limit}={getattr(self, limit)}"
+        if self.stop_when_complete:
+            # Such text is stored with the fields matched page by page
+            version += f"; fields by page {self.pattern_version}"
+        return version
+    
+    def iter_page_texts(self, pdf_path: str, truncation: Optional[list] = None) -> Iterator[str]:
+        """
+        Text of each page in order, within the extractor's limits
+        
+        Pages are parsed lazily. If any page is skipped or reading stops
+        before the last page, the reasons are appended to truncation as one
+        entry.
+        """
+        deadline = time.monotonic() + self.time_budget if self.time_budget is not None else None
+        skipped, reason = [], None
+        try:
+            reader = _call_within(deadline, PdfReader, str(pdf_path))
+            page_count = len(reader.pages)
+        except _BudgetExceeded:
+            reader, reason = None, _BUDGET_USED.format(self.time_budget) + " opening the PDF"
+        chars = 0
+        for number, page in enumerate(reader.pages if reader else ()):
+            if self.max_pages is not None and number >= self.max_pages:
+                reason = f"page limit of {self.max_pages} reached ({page_count} pages)"
+                break
+            if deadline is not None and time.monotonic() > deadline:
+                reason = _BUDGET_USED.format(self.time_budget) + f" after {number} of {page_count} pages"
+                break
+            try:
+                if self.max_page_bytes is not None and _call_within(
+                        deadline, _content_size, page, self.max_page_bytes) > self.max_page_bytes:
+                    skipped.append(str(number + 1))
+                    continue
+                text = _call_within(deadline, page.extract_text) + "\n"
+            except _BudgetExceeded:
+                reason = _BUDGET_USED.format(self.time_budget) + f" on page {number + 1} of {page_count}"
+                break
+            except Exception as e:
+                reason = f"page {number + 1} could not be read: {e}"
+                break
+            if self.max_text_chars is not None and chars + len(text) > self.max_text_chars:
+                yield text[:self.max_text_chars - chars]
+                reason = f"text limit of {self.max_text_chars} characters reached on page {number + 1} of {page_count}"
+                break
+            chars += len(text)
+            yield text
+        reasons = [reason] if reason else []
+        if skipped:
+            pages = "page" if len(skipped) == 1 else "pages"
+            reasons.insert(0, f"{pages} {', '.join(skipped)} skipped: content exceeds {self.max_page_bytes} bytes")
+        if reasons and truncation is not None:
+            truncation.append("; ".join(reasons))
+    
+    def extract_text(self, pdf_path: str, truncation: Optional[list] = None) -> str:
+        """Text of a PDF within the extractor's limits, pages separated by newlines"""
+        return "".join(self.iter_page_texts(pdf_path, truncation))
+    
+    def extract_until_complete(self, pdf_path: str, truncation: Optional[list] = None) -> tuple[str, dict]:
+        """
+        (text read, fields) with fields matched page by page
+        
+        Each page is searched, together with the last lines of the previous
+        one, for the fields not found yet, and a field takes its value from
+        the first page where one of its patterns matches. Reading stops once
+        every field is found.
+        
+        The values are not always those of extract_fields on the full text.
+        A match ends at the end of its page, where on the full text a greedy
+        pattern runs on into the next page (on the sample vendor PDFs the
+        full-text bank_account also takes the "Bank Name" label after it),
+        and a lower-priority pattern on an earlier page wins over a
+        higher-priority one further on.
+        """
+        pages, fields, carry = [], {}, ""
+        for page in self.iter_page_texts(pdf_path, truncation):
+            pages.append(page)
+            window = carry + page
+            fields.update(self.extract_fields(window, skip=fields))
+            if len(fields) == len(self._compiled):
+                break
+            carry = "\n".join(window.rsplit("\n", _CARRY_LINES + 1)[-(_CARRY_LINES + 1):])
+        return "".join(pages), fields
+    
+    def read_text_source(self, path: Path, truncation: Optional[list] = None) -> str:
+        """Text of a .txt, .md or .eml source, within max_text_chars"""
+        if path.suffix.lower() == ".eml":
+            text = _email_to_text(path.read_bytes())
+        else:
+            text = path.read_text(encoding="utf-8", errors="replace")
+            if path.suffix.lower() == ".md":
+                text = _markdown_to_text(text)
+        if self.max_text_chars is not None and len(text) > self.max_text_chars:
+            if truncation is not None:
+                truncation.append(f"text limit of {self.max_text_chars} characters reached")
+            text = text[:self.max_text_chars]
+        return text
+    
+    def extract_fields(self, text: str, skip: Iterable[str] = ()) -> dict:
+        """
+        Field values found in text, for the fields not in skip
+        
+        Each field takes the first match of its highest-priority matching
+        pattern. The patterns are compiled once, in __init__: a single
+        alternation of all of them would scan the text only once, but sre
+        then tries every alternative, case-folded, at every character,
+        which measures 3-7x slower than these literal-prefixed searches.
+        """
+        values = {}
+        for field, patterns in self._compiled.items():
+            if field in skip:
+                continue
+            for pattern in patterns:
+                match = pattern.search(text)
+                if match:
+                    values[field] = match.group(1).strip()
+                    break
+        return values
+    
+    def extract_many(self, pdf_paths: Iterable[str], workers: Optional[int] = None,
+                     timeout: Optional[float] = 60.0) -> Iterator[tuple[str, ToolResult]]:
+        """
+        Extract many PDFs across a process pool, yielding (path, ToolResult)
+        as each document finishes
+        
+        PyPDF2 holds the GIL, so documents are spread over worker processes
+        (os.cpu_count() by default), each with an extractor using this one's
+        patterns, budget, cache and text store. At most two documents per worker
+        are queued at a time, so paths may be a lazy iterable of any length.
+        A document running past timeout seconds, an unreadable file or a
+        crashed worker gives a failed ToolResult for that file only, and the
+        batch goes on.
+        """
+        workers = workers or os.cpu_count() or 1
+        cache_args = (str(self.cache.db_path), self.cache.max_bytes) if self.cache else (None, 0)
+        text_store_args = (self.text_store.dirname, self.text_store.level) if self.text_store else None
+        initargs = (self.patterns, self._limits(), *cache_args, text_store_args)
+        # Spawned rather than forked: the parent may be running threads
+        context = multiprocessing.get_context("spawn")
+        
+        def new_pool() -> ProcessPoolExecutor:
+            return ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                       initializer=_init_worker, initargs=initargs)
+        
+        def outcome(future: Future, path: str) -> ToolResult:
+            try:
+                return future.result()
+            except BrokenProcessPool:
+                error = f"Worker process exited while extracting PDF: {path}"
+            except BaseException as e:
+                error = f"Error extracting PDF: {str(e) or type(e).__name__}"
+            return ToolResult(tool_name="extract_from_pdf", success=False, error=error)
+        
+        pdf_paths = iter(pdf_paths)
+        pool = new_pool()
+        in_flight = {}
+        try:
+            while True:
+                for path in itertools.islice(pdf_paths, 2 * workers - len(in_flight)):
+                    in_flight[pool.submit(_extract_in_worker, str(path), timeout)] = str(path)
+                if not in_flight:
+                    break
+                
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                if any(isinstance(future.exception(), BrokenProcessPool) for future in done):
+                    # Every queued document fails with the pool; report them
+                    # all and carry on with a fresh pool
+                    done, _ = wait(in_flight)
+                    pool.shutdown(wait=False)
+                    pool = new_pool()
+                for future in done:
+                    path = in_flight.pop(future)
+                    yield path, outcome(future, path)
+        finally:
+            pool.shutdown(cancel_futures=True)
+    
+    def _limits(self) -> dict:
+        """The reading limits, as PDFExtractor keyword arguments"""
+        return {
+            "max_pages": self.max_pages, "stop_when_complete": self.stop_when_complete,
+            "time_budget": self.time_budget, "max_page_bytes": self.max_page_bytes,
+            "max_text_chars": self.max_text_chars,
+        }
+    
+    def _parse(self, pdf_path, truncation: list) -> tuple[str, Optional[dict]]:
+        """
+        (text, fields or None) of a PDF parsed within the limits, fields
+        only when matched page by page
+        
+        Where SIGALRM cannot interrupt PyPDF2 (off the main thread, or
+        outside POSIX), a budgeted read is handed to a parse worker process.
+        """
+        if (self.time_budget is not None
+                and (not hasattr(signal, "setitimer")
+                     or threading.current_thread() is not threading.main_thread())):
+            return _read_in_worker(pdf_path, self.patterns, self._limits(), truncation)
+        if self.stop_when_complete:
+            return self.extract_until_complete(pdf_path, truncation)
+        return self.extract_text(pdf_path, truncation), None
+    
+    def _read_document(self, path: Path, truncation: list) -> tuple[str, dict]:
+        """
+        (text, fields) of a document, parsing a PDF only when neither the
+        text store nor the cache has its content
+        
+        .txt, .md and .eml sources are read as text and skip both.
+        """
+        if path.suffix.lower() in TEXT_SUFFIXES:
+            text = self.read_text_source(path, truncation)
+            return text, self.extract_fields(text)
+        
+        text, fields, digest, stored_fields = None, None, None, None
+        if self.cache or self.text_store:
+            digest = file_digest(path)
+        if self.text_store:
+            text, stored_fields = self.text_store.get(
+                path, digest, self.text_version, truncation) or (None, None)
+        stored = text is not None
+        if self.cache and not truncation:
+            cached_text, fields = self.cache.get(digest, self.text_version, self.pattern_version)
+            text = cached_text if text is None else text
+        cached = fields is not None
+        # Fields matched page by page cannot be matched again from the
+        # joined text, so they come from the store with it
+        fields = stored_fields if fields is None else fields
+        
+        if text is None:
+            text, fields = self._parse(path, truncation)
+        if fields is None:
+            fields = self.extract_fields(text)
+        
+        # How far the budget gets depends on the clock, so a read it
+        # stopped is not stored; every other limit is in text_version
+        timed_out = truncation and self.time_budget is not None and (
+            _BUDGET_USED.format(self.time_budget) in truncation[0])
+        if self.text_store and not stored and not timed_out:
+            self.text_store.put(path, digest, self.text_version, text,
+                                truncation[0] if truncation else None,
+                                fields if self.stop_when_complete else None)
+        # A truncated read depends on the budget (and the clock), so it
+        # is not cached
+        if self.cache and not cached and not truncation:
+            self.cache.put(digest, self.text_version, self.pattern_version, fields, text)
+        return text, fields
+    
+    def document_text(self, pdf_path: str) -> Optional[str]:
+        """
+        Extracted text of a document, for the stages after extraction
+        
+        Served from the text store (or cache) when the document was
+        extracted before, and parsed otherwise. None if the file is gone.
+        """
+        path = Path(pdf_path)
+        if not path.exists():
+            return None
+        return self._read_document(path, [])[0]
     
     def extract_from_pdf(self, pdf_path: str) -> ToolResult:
-        """Extract company information from a PDF"""
+        """
+        Extract company information from a PDF
+        
+        data holds the CompanyInfo fields plus "document_text", the full
+        extracted text, for whole-document screening, and "truncated" with
+        its "truncation_reason" when the budget cut the document short.
+        With a text store or cache, a PDF whose content was extracted
+        before is not parsed again.
+        
+        .txt, .md and .eml sources are accepted too; they are read as text
+        and skip PDF parsing, the text store and the cache.
+        """
         try:
             path = Path(pdf_path)
             if not path.exists():
@@ -61,21 +662,10 @@ class PDFExtractor:
                     error=f"PDF file not found: {pdf_path}"
                 )
             
-            # Read PDF
-            reader = PdfReader(str(path))
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-            
-            # Extract fields
-            company_info = CompanyInfo()
-            for field, patterns in self.patterns.items():
-                for pattern in patterns:
-                    match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
-                    if match:
-                        value = match.group(1).strip()
-                        setattr(company_info, field, value)
-                        break
+            truncation = []
+            text, fields = self._read_document(path, truncation)
+            company_info = CompanyInfo(**fields)
+            truncated = truncation[0] if truncation else None
             
             # Check if we extracted anything meaningful
             if not company_info.company_name:
@@ -83,12 +673,18 @@ class PDFExtractor:
                     tool_name="extract_from_pdf",
                     success=False,
                     error="Could not extract company name from PDF"
+                          + (f" (extraction truncated: {truncated})" if truncated else "")
                 )
             
             return ToolResult(
                 tool_name="extract_from_pdf",
                 success=True,
-                data=company_info.model_dump(),
+                data={
+                    **company_info.model_dump(),
+                    "document_text": text,
+                    "truncated": bool(truncated),
+                    "truncation_reason": truncated,
+                },
                 next_action="search_registry"
             )
         
@@ -1,9 +1,10 @@
 """AI-Powered risk scoring engine with industry-aware assessment"""
-import os
 import json
+from typing import Optional
 from datetime import datetime
 from dateutil import parser
-from openai import OpenAI
+from src.llm_cache import LLMResponseCache, acached_completion, cached_completion
+from src.llm_clients import DEFAULT_MODEL, get_async_llm_client, get_llm_client
 from src.models import RiskScore, ToolResult, CompanyInfo, RegistryResult, SanctionsResult
 from src.industry_config import (
     detect_industry, 
@@ -16,7 +17,7 @@ from src.industry_config import (
 class RiskCalculator:
     """Computes risk scores using AI reasoning (agentic) with deterministic fallback"""
     
-    def __init__(self):
+    def __init__(self, llm_cache: Optional[LLMResponseCache] = None):
         # Fallback rules (used if AI fails)
         self.fallback_rules = {
             'registry_match': 30,
@@ -27,18 +28,14 @@ class RiskCalculator:
             'first_time_bank': -10,
         }
         
-        # Initialize AI client for agentic risk assessment
-        self.api_key = os.getenv("NVIDIA_API_KEY")
-        self.base_url = os.getenv("NVIDIA_BASE_URL", "https://integrate.api.nvidia.com/v1")
-        
-        if self.api_key:
-            self.client = OpenAI(
-                api_key=self.api_key,
-                base_url=self.base_url
-            )
-            self.model = "nvidia/llama-3.3-nemotron-super-49b-v1.5"
+        # Shared AI client for agentic risk assessment
+        self.model = DEFAULT_MODEL
+        self.llm_cache = llm_cache
+        try:
+            self.client = get_llm_client(self.model)
             self.use_ai = True
-        else:
+        except ValueError:
+            # No API key
             self.use_ai = False
     
     def compute_risk(
@@ -62,22 +59,60 @@ class RiskCalculator:
         """
         try:
             flags = flags or {}
-            
-            # CRITICAL: Sanctions match = automatic HIGH risk (non-negotiable)
-            if sanctions_result and sanctions_result.match:
-                return self._handle_sanctions_match(sanctions_result)
-            
-            # Use AI-powered risk assessment if available
-            if self.use_ai:
-                return self._ai_compute_risk(company_info, registry_result, sanctions_result, flags)
-            else:
-                # Fallback to deterministic rules
-                return self._deterministic_compute_risk(company_info, registry_result, sanctions_result, flags)
+            result = self._result_without_ai(company_info, registry_result, sanctions_result, flags)
+            if result is None:
+                result = self._ai_compute_risk(company_info, registry_result, sanctions_result, flags)
+            return result
+        
+        except Exception as e:
+            # Fallback on any error
+            return self._deterministic_compute_risk(company_info, registry_result, sanctions_result, flags or {})
+    
+    async def acompute_risk(
+        self,
+        company_info: CompanyInfo,
+        registry_result: RegistryResult,
+        sanctions_result: SanctionsResult,
+        flags: dict = None
+    ) -> ToolResult:
+        """
+        compute_risk() for asyncio, awaiting the Nemotron call
+        
+        Only the call differs: the rules before it and the parsing after
+        it are compute_risk's own.
+        """
+        try:
+            flags = flags or {}
+            result = self._result_without_ai(company_info, registry_result, sanctions_result, flags)
+            if result is None:
+                messages = self._ai_messages(company_info, registry_result, sanctions_result, flags)
+                content = await acached_completion(get_async_llm_client(self.model),
+                                                   self._ai_completion_args(messages),
+                                                   self.llm_cache, "risk_calculator")
+                result = self._ai_result(content, company_info, registry_result, sanctions_result, flags)
+            return result
         
         except Exception as e:
             # Fallback on any error
             return self._deterministic_compute_risk(company_info, registry_result, sanctions_result, flags or {})
     
+    def _result_without_ai(
+        self,
+        company_info: CompanyInfo,
+        registry_result: RegistryResult,
+        sanctions_result: SanctionsResult,
+        flags: dict
+    ) -> Optional[ToolResult]:
+        """The result when no Nemotron call is made, or None when one is needed"""
+        # CRITICAL: Sanctions match = automatic HIGH risk (non-negotiable)
+        if sanctions_result and sanctions_result.match:
+            return self._handle_sanctions_match(sanctions_result)
+        
+        # Fallback to deterministic rules if AI is unavailable
+        if not self.use_ai:
+            return self._deterministic_compute_risk(company_info, registry_result, sanctions_result, flags)
+        return None
+    
     def _handle_sanctions_match(self, sanctions_result: SanctionsResult) -> ToolResult:
         """Handle sanctions match - automatic HIGH risk"""
         result = RiskScore(
@@ -101,6 +136,23 @@ class RiskCalculator:
         flags: dict
     ) -> ToolResult:
         """AI-powered risk assessment using Nemotron with industry awareness"""
+        messages = self._ai_messages(company_info, registry_result, sanctions_result, flags)
+        try:
+            content = cached_completion(self.client, self._ai_completion_args(messages),
+                                        self.llm_cache, "risk_calculator")
+        except Exception as e:
+            # Fallback on API error
+            return self._deterministic_compute_risk(company_info, registry_result, sanctions_result, flags)
+        return self._ai_result(content, company_info, registry_result, sanctions_result, flags)
+    
+    def _ai_messages(
+        self,
+        company_info: CompanyInfo,
+        registry_result: RegistryResult,
+        sanctions_result: SanctionsResult,
+        flags: dict
+    ) -> list[dict]:
+        """Chat messages asking Nemotron for an industry-aware assessment"""
         
         # Detect industry
         industry = detect_industry(company_info.business_type, company_info.address)
@@ -149,74 +201,80 @@ Provide a risk assessment in JSON format:
 
 Be holistic - consider all factors together, not just individual points. A well-established UK tech company should score lower than a new offshore shell company, even if both have similar individual factors."""
 
+        return [
+            {"role": "system", "content": "You are a professional risk analyst. Provide structured risk assessments in JSON format."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def _ai_completion_args(self, messages: list[dict]) -> dict:
+        """Arguments of the risk assessment completion call, sync or async"""
+        return {
+            "model": self.model,
+            "messages": messages,
+            "temperature": 0.2,  # Low temperature for consistent scoring
+            "max_tokens": 800,
+        }
+    
+    def _ai_result(
+        self,
+        content: str,
+        company_info: CompanyInfo,
+        registry_result: RegistryResult,
+        sanctions_result: SanctionsResult,
+        flags: dict
+    ) -> ToolResult:
+        """Risk score from Nemotron's response, or the deterministic one if it cannot be parsed"""
+        # Parse AI response
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a professional risk analyst. Provide structured risk assessments in JSON format."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.2,  # Low temperature for consistent scoring
-                max_tokens=800
+            # Try to extract JSON from response
+            if "```json" in content:
+                json_start = content.find("```json") + 7
+                json_end = content.find("```", json_start)
+                content = content[json_start:json_end].strip()
+            elif "{" in content:
+                json_start = content.find("{")
+                json_end = content.rfind("}") + 1
+                content = content[json_start:json_end]
+        
+            data = json.loads(content)
+        
+            score = int(data.get('score', 0))
+            risk_level = data.get('risk_level', 'medium')
+            breakdown = data.get('breakdown', {})
+            flags = data.get('flags', [])
+            reasoning = data.get('reasoning', '')
+        
+            # Ensure score is in valid range
+            score = max(0, min(100, score))
+        
+            # Ensure risk_level matches score
+            if score >= 70:
+                risk_level = 'high'
+            elif score >= 40:
+                risk_level = 'medium'
+            else:
+                risk_level = 'low'
+        
+            # Add AI reasoning to flags
+            if reasoning:
+                flags.append(f"AI Reasoning: {reasoning}")
+        
+            result = RiskScore(
+                total_score=score,
+                risk_level=risk_level,
+                breakdown=breakdown,
+                flags=flags
             )
-            
-            content = response.choices[0].message.content
-            
-            # Parse AI response
-            try:
-                # Try to extract JSON from response
-                if "```json" in content:
-                    json_start = content.find("```json") + 7
-                    json_end = content.find("```", json_start)
-                    content = content[json_start:json_end].strip()
-                elif "{" in content:
-                    json_start = content.find("{")
-                    json_end = content.rfind("}") + 1
-                    content = content[json_start:json_end]
-                
-                data = json.loads(content)
-                
-                score = int(data.get('score', 0))
-                risk_level = data.get('risk_level', 'medium')
-                breakdown = data.get('breakdown', {})
-                flags = data.get('flags', [])
-                reasoning = data.get('reasoning', '')
-                
-                # Ensure score is in valid range
-                score = max(0, min(100, score))
-                
-                # Ensure risk_level matches score
-                if score >= 70:
-                    risk_level = 'high'
-                elif score >= 40:
-                    risk_level = 'medium'
-                else:
-                    risk_level = 'low'
-                
-                # Add AI reasoning to flags
-                if reasoning:
-                    flags.append(f"AI Reasoning: {reasoning}")
-                
-                result = RiskScore(
-                    total_score=score,
-                    risk_level=risk_level,
-                    breakdown=breakdown,
-                    flags=flags
-                )
-                
-                return ToolResult(
-                    tool_name="compute_risk",
-                    success=True,
-                    data=result.model_dump(),
-                    next_action="explain_risk"
-                )
-            
-            except (json.JSONDecodeError, KeyError, ValueError) as e:
-                # If JSON parsing fails, fall back to deterministic
-                return self._deterministic_compute_risk(company_info, registry_result, sanctions_result, flags)
         
-        except Exception as e:
-            # Fallback on API error
+            return ToolResult(
+                tool_name="compute_risk",
+                success=True,
+                data=result.model_dump(),
+                next_action="explain_risk"
+            )
+        
+        except (json.JSONDecodeError, KeyError, ValueError) as e:
+            # If JSON parsing fails, fall back to deterministic
             return self._deterministic_compute_risk(company_info, registry_result, sanctions_result, flags)
     
     def _build_risk_context_with_industry(
@@ -1,44 +1,102 @@
 """LLM-powered risk explanation tool"""
-import os
-from openai import OpenAI
+import json
+from typing import Optional
+from src.llm_cache import LLMResponseCache, acached_completion, cached_completion
+from src.llm_clients import DEFAULT_MODEL, get_async_llm_client, get_llm_client
 from src.models import (
     RiskExplanation, ToolResult, CompanyInfo, 
     RegistryResult, SanctionsResult, RiskScore
 )
 
 
+# Characters of the vendor's document given to the LLM with the assessment
+DOCUMENT_EXCERPT_CHARS = 2000
+
+
 class RiskExplainer:
     """Generates human-readable risk explanations using LLM"""
     
-    def __init__(self):
-        self.api_key = os.getenv("NVIDIA_API_KEY")
-        self.base_url = os.getenv("NVIDIA_BASE_URL", "https://integrate.api.nvidia.com/v1")
+    def __init__(self, llm_cache: Optional[LLMResponseCache] = None):
+        self.model = DEFAULT_MODEL
+        self.client = get_llm_client(self.model)
+        self.llm_cache = llm_cache
+    
+    def explain_risk(
+        self,
+        company_info: CompanyInfo,
+        registry_result: RegistryResult,
+        sanctions_result: SanctionsResult,
+        risk_score: RiskScore,
+        document_text: Optional[str] = None
+    ) -> ToolResult:
+        """
+        Generate detailed risk explanation using LLM
         
-        if not self.api_key:
-            raise ValueError("NVIDIA_API_KEY not found in environment")
+        document_text, the vendor document's extracted text, is quoted in
+        the prompt up to DOCUMENT_EXCERPT_CHARS characters.
+        """
+        try:
+            messages = self._messages(company_info, registry_result, sanctions_result, risk_score, document_text)
+            
+            # Call NVIDIA NIM API
+            content = cached_completion(self.client, self._completion_args(messages),
+                                        self.llm_cache, "risk_explainer")
+            explanation = self._explanation(content, risk_score)
         
-        self.client = OpenAI(
-            api_key=self.api_key,
-            base_url=self.base_url
+        except Exception as e:
+            # Fallback to rule-based explanation if LLM fails
+            explanation = self._fallback_explanation(risk_score)
+        
+        return ToolResult(
+            tool_name="explain_risk",
+            success=True,
+            data=explanation.model_dump(),
+            next_action="request_human_review"
         )
-        self.model = "nvidia/llama-3.3-nemotron-super-49b-v1.5"
     
-    def explain_risk(
+    async def aexplain_risk(
         self,
         company_info: CompanyInfo,
         registry_result: RegistryResult,
         sanctions_result: SanctionsResult,
-        risk_score: RiskScore
+        risk_score: RiskScore,
+        document_text: Optional[str] = None
     ) -> ToolResult:
-        """Generate detailed risk explanation using LLM"""
+        """explain_risk() for asyncio, awaiting the LLM call"""
         try:
-            # Build context for LLM
-            context = self._build_context(
-                company_info, registry_result, sanctions_result, risk_score
-            )
-            
-            # Create prompt
-            prompt = f"""You are a risk analyst for an AI-powered vendor onboarding system. 
+            messages = self._messages(company_info, registry_result, sanctions_result, risk_score, document_text)
+            content = await acached_completion(get_async_llm_client(self.model),
+                                               self._completion_args(messages),
+                                               self.llm_cache, "risk_explainer")
+            explanation = self._explanation(content, risk_score)
+        
+        except Exception as e:
+            # Fallback to rule-based explanation if LLM fails
+            explanation = self._fallback_explanation(risk_score)
+        
+        return ToolResult(
+            tool_name="explain_risk",
+            success=True,
+            data=explanation.model_dump(),
+            next_action="request_human_review"
+        )
+    
+    def _messages(
+        self,
+        company_info: CompanyInfo,
+        registry_result: RegistryResult,
+        sanctions_result: SanctionsResult,
+        risk_score: RiskScore,
+        document_text: Optional[str]
+    ) -> list[dict]:
+        """Chat messages asking for a structured explanation of the assessment"""
+        # Build context for LLM
+        context = self._build_context(
+            company_info, registry_result, sanctions_result, risk_score, document_text
+        )
+        
+        # Create prompt
+        prompt = f"""You are a risk analyst for an AI-powered vendor onboarding system. 
 Analyze the following company assessment and provide a clear, structured risk explanation.
 
 {context}
@@ -52,58 +110,43 @@ Provide a structured analysis with:
 
 Be objective, factual, and concise. Format your response as JSON with keys: summary, key_factors (array), assumptions (array), unknowns (array), recommendation."""
 
-            # Call NVIDIA NIM API
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a professional risk analyst. Provide structured, objective assessments in JSON format."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,  # Lower temperature for more deterministic output
-                max_tokens=1000
-            )
-            
-            # Parse response
-            content = response.choices[0].message.content
-            
-            # Try to parse as JSON, fallback to text parsing
-            try:
-                import json
-                data = json.loads(content)
-                explanation = RiskExplanation(
-                    summary=data.get('summary', ''),
-                    key_factors=data.get('key_factors', []),
-                    assumptions=data.get('assumptions', []),
-                    unknowns=data.get('unknowns', []),
-                    recommendation=data.get('recommendation', '')
-                )
-            except:
-                # Fallback: parse structured text
-                explanation = self._parse_text_response(content, risk_score)
-            
-            return ToolResult(
-                tool_name="explain_risk",
-                success=True,
-                data=explanation.model_dump(),
-                next_action="request_human_review"
-            )
-        
-        except Exception as e:
-            # Fallback to rule-based explanation if LLM fails
-            explanation = self._fallback_explanation(risk_score)
-            return ToolResult(
-                tool_name="explain_risk",
-                success=True,
-                data=explanation.model_dump(),
-                next_action="request_human_review"
+        return [
+            {"role": "system", "content": "You are a professional risk analyst. Provide structured, objective assessments in JSON format."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def _completion_args(self, messages: list[dict]) -> dict:
+        """Arguments of the explanation completion call, sync or async"""
+        return {
+            "model": self.model,
+            "messages": messages,
+            "temperature": 0.3,  # Lower temperature for more deterministic output
+            "max_tokens": 1000,
+        }
+    
+    def _explanation(self, content: str, risk_score: RiskScore) -> RiskExplanation:
+        """Explanation from the LLM's response, as JSON or structured text"""
+        # Try to parse as JSON, fallback to text parsing
+        try:
+            data = json.loads(content)
+            return RiskExplanation(
+                summary=data.get('summary', ''),
+                key_factors=data.get('key_factors', []),
+                assumptions=data.get('assumptions', []),
+                unknowns=data.get('unknowns', []),
+                recommendation=data.get('recommendation', '')
             )
+        except:
+            # Fallback: parse structured text
+            return self._parse_text_response(content, risk_score)
     
     def _build_context(
         self,
         company_info: CompanyInfo,
         registry_result: RegistryResult,
         sanctions_result: SanctionsResult,
-        risk_score: RiskScore
+        risk_score: RiskScore,
+        document_text: Optional[str] = None
     ) -> str:
         """Build context string for LLM"""
         context = f"""COMPANY INFORMATION:
@@ -130,6 +173,14 @@ RISK SCORE:
 
 FLAGS:
 {chr(10).join(f"- {flag}" for flag in risk_score.flags)}
+"""
+        if document_text:
+            excerpt = document_text[:DOCUMENT_EXCERPT_CHARS].strip()
+            if len(document_text) > DOCUMENT_EXCERPT_CHARS:
+                excerpt += "\n[...]"
+            context += f"""
+DOCUMENT EXCERPT:
+{excerpt}
 """
         return context
     
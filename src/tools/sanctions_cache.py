@@ -0,0 +1,141 @@
+"""
+Two-tier cache of sanctions screening results
+
+Vendor names recur (resubmissions, "request more info" loops, subsidiaries
+sharing a name), and each repeat would otherwise re-screen the whole list.
+Results are kept in a bounded in-memory LRU and, optionally, in a SQLite
+file that survives restarts. Keys include the SHA-256 of the sanctions list
+the result was screened against, so a list change invalidates every cached
+result without any explicit flush.
+"""
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from src.models import SanctionsResult
+from src.sqlite_lru import SQLiteLRU
+
+
+def cache_name(company_name: str) -> str:
+    """
+    Cache key for a vendor name: lowercased
+
+    Screening is case-insensitive, but ratio and partial_ratio count
+    spaces, so whitespace is kept; names differing only in spacing can
+    score differently and must not share a result.
+    """
+    return company_name.lower()
+
+
+class SanctionsResultCache:
+    """
+    Bounded LRU of SanctionsResults with an optional SQLite tier
+
+    A memory miss falls through to the database, and a database hit is
+    promoted into memory. Each tier evicts its least recently used results
+    beyond its limit.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, max_entries: int = 4096,
+                 max_disk_entries: int = 100_000):
+        self.db_path = Path(db_path) if db_path else None
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._disk = SQLiteLRU(
+            db_path, "sanctions_results",
+            """
+            CREATE TABLE IF NOT EXISTS sanctions_results (
+                list_sha256 TEXT NOT NULL,
+                settings TEXT NOT NULL,
+                name TEXT NOT NULL,
+                result TEXT NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (list_sha256, settings, name)
+            )
+            """,
+            key=("list_sha256", "settings", "name"),
+            max_size=max_disk_entries,
+        ) if db_path else None
+
+    def get(self, list_sha256: str, settings: str, name: str) -> Optional[SanctionsResult]:
+        """The cached result for a normalised name, or None"""
+        key = (list_sha256, settings, name)
+        with self._lock:
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return result.model_copy()
+
+        if self._disk:
+            row = self._disk.select(key, "result")
+            if row:
+                self._disk.touch(key)
+                result = SanctionsResult.model_validate_json(row[0])
+                with self._lock:
+                    self.hits += 1
+                    self.disk_hits += 1
+                    self._remember(key, result)
+                return result.model_copy()
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, list_sha256: str, settings: str, name: str, result: SanctionsResult) -> None:
+        """Cache the result screened for a normalised name"""
+        key = (list_sha256, settings, name)
+        result = result.model_copy()
+        with self._lock:
+            self._remember(key, result)
+        if not self._disk:
+            return
+
+        evicted = self._disk.put({
+            "list_sha256": list_sha256, "settings": settings, "name": name,
+            "result": result.model_dump_json(),
+        })
+        if evicted:
+            with self._lock:
+                self.evictions += evicted
+
+    def _remember(self, key: tuple, result: SanctionsResult) -> None:
+        """Insert into the memory tier; caller holds the lock"""
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def discard_other_lists(self, list_sha256: str) -> None:
+        """Drop results screened against any other list version"""
+        with self._lock:
+            for key in [key for key in self._memory if key[0] != list_sha256]:
+                del self._memory[key]
+        if self._disk:
+            self._disk.delete("list_sha256 != ?", (list_sha256,))
+
+    def close(self) -> None:
+        """Close the SQLite tier's connection"""
+        if self._disk:
+            self._disk.close()
+
+    def stats(self) -> dict:
+        """Hit, miss and eviction counters and current sizes"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+            }
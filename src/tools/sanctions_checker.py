@@ -1,21 +1,130 @@
 """Sanctions list checking tool"""
+import heapq
 import os
+import threading
+from collections import Counter
 from pathlib import Path
-from fuzzywuzzy import fuzz
-from src.models import SanctionsResult, ToolResult, CompanyInfo
+from typing import Optional
+from fuzzywuzzy import fuzz, utils
+from src.models import (
+    SanctionsCandidate, SanctionsFieldMatch, SanctionsMention, SanctionsResult, ToolResult, CompanyInfo
+)
+from src.tools.sanctions_cache import SanctionsResultCache, cache_name
+from src.tools.sanctions_fields import FieldIndex
+from src.tools.sanctions_index import NGramIndex
+from src.tools.sanctions_phonetic import PhoneticIndex
+from src.tools.sanctions_scan import WatchlistAutomaton
+from src.tools.sanctions_shards import SanctionsShards
+from src.tools.sanctions_snapshot import default_snapshot_path, load_snapshot, source_digest
+from src.tools.sanctions_store import SanctionsEntries, normalize_name, parse_sanctions_file
+
+# Above this share of the list changing at once, reload in full instead of
+# applying the changes one entry at a time
+_FULL_RELOAD_FRACTION = 0.25
+
+# Thresholds the index is queried at below match_threshold, in turn, while
+# fewer than top_k entries have been found when ranking candidates
+_RANK_THRESHOLDS = (75, 65, 50, 0)
+
+# Part of every result cache key; bump when scoring changes so results cached
+# under the old scores are not served
+_SCORING_VERSION = 3
 
 
 class SanctionsChecker:
-    """Checks company names against sanctions lists"""
+    """
+    Checks company names against sanctions lists
+    
+    With auto_reload, every check first stats the sanctions file. When its
+    content has changed, only the added and removed entries are applied to
+    the loaded list and index, and list_version is incremented. Each
+    SanctionsResult carries the list_version it was screened against.
+    
+    With workers > 1, queries are screened in a pool of worker processes,
+    each holding one shard of the list (see SanctionsShards). Results are the
+    same as in-process screening; call close() to stop the workers.
+    
+    A name with no fuzzy match is looked up in a phonetic index, so spelling
+    variants of transliterated names (Muhammad Aly, Chodorkowski, Cyrillic
+    script) still match; such results have match_type "phonetic".
     
-    def __init__(self, sanctions_file: str = "data/sanctions_list.txt"):
+    Besides the company name, the vendor's address, bank account and
+    registration number are screened against the addresses and identifiers
+    of list entries; matched_field records which field matched.
+    
+    scan_document() reports every list name mentioned anywhere in a
+    submission's text, e.g. as a shareholder or bank.
+    
+    With a SanctionsResultCache, results are cached per normalised name and
+    list SHA-256, so a repeated name is not re-screened until the list
+    changes.
+    """
+    
+    def __init__(self, sanctions_file: str = "data/sanctions_list.txt",
+                 snapshot_file: Optional[str] = None, auto_reload: bool = True,
+                 workers: int = 1, cache: Optional[SanctionsResultCache] = None):
         self.sanctions_file = Path(sanctions_file)
+        self.snapshot_file = Path(snapshot_file) if snapshot_file else default_snapshot_path(self.sanctions_file)
+        self.auto_reload = auto_reload
+        self._lock = threading.RLock()
+        self._source_stat = self._stat_source()
+        self.list_digest = source_digest(self.sanctions_file) if self._source_stat else None
+        self.list_version = 1
+        self._rows = None  # live row -> entry ids, built on the first change
         self.sanctions_list = self._load_sanctions()
         self.match_threshold = 85  # Fuzzy match threshold
+        self.top_k = 5  # Ranked candidates returned for reviewers (0 = best match only)
+        self.phonetic_threshold = 65  # Spelling floor for phonetic matches (None = off)
+        self.address_threshold = 90  # Token sort ratio for an address match
+        self.workers = workers
+        self.cache = cache
+        self.shards = None
+        self._reshard()
+    
+    def __enter__(self) -> "SanctionsChecker":
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
     
-    def _load_sanctions(self) -> list[dict]:
-        """Load sanctions list from file"""
-        sanctions = []
+    def close(self) -> None:
+        """Stop shard workers, if any"""
+        if self.shards:
+            self.shards.close()
+            self.shards = None
+    
+    def _reshard(self) -> None:
+        """(Re)start shard workers over the live entries"""
+        self.close()
+        if self.workers > 1:
+            live = [i for i in range(len(self.sanctions_list)) if i not in self.index.removed]
+            self.shards = SanctionsShards(self.sanctions_list, live, self.workers)
+    
+    @classmethod
+    def from_rows(cls, rows) -> "SanctionsChecker":
+        """Checker over in-memory (name, list, details) rows with no backing file"""
+        checker = cls.__new__(cls)
+        checker.sanctions_file = checker.snapshot_file = None
+        checker.auto_reload = False
+        checker._lock = threading.RLock()
+        checker._source_stat = checker.list_digest = None
+        checker.list_version = 1
+        checker.sanctions_list = checker._build(rows)
+        checker.match_threshold = 85
+        checker.top_k = 0
+        checker.phonetic_threshold = 65
+        checker.address_threshold = 90
+        checker.workers = 1
+        checker.cache = None
+        checker.shards = None
+        return checker
+    
+    def _load_sanctions(self) -> SanctionsEntries:
+        """Load sanctions list from a compiled snapshot or the text file"""
+        # Prefer a compiled snapshot (memory-mapped, prebuilt index)
+        snapshot = self._load_snapshot(self.list_digest)
+        if snapshot:
+            return snapshot
         
         # Default sanctions list if file doesn't exist
         default_sanctions = [
@@ -28,58 +137,194 @@ class SanctionsChecker:
         
         if self.sanctions_file.exists():
             # Load from file
-            with open(self.sanctions_file, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#'):
-                        parts = line.split('|')
-                        if len(parts) >= 2:
-                            sanctions.append({
-                                "name": parts[0].strip(),
-                                "list": parts[1].strip(),
-                                "details": parts[2].strip() if len(parts) > 2 else ""
-                            })
+            rows = parse_sanctions_file(self.sanctions_file)
         else:
-            sanctions = default_sanctions
+            rows = [(entry["name"], entry["list"], entry["details"]) for entry in default_sanctions]
+        
+        return self._build(rows)
+    
+    def _build(self, rows) -> SanctionsEntries:
+        """Build the store and the n-gram index from (name, list, details) rows"""
+        sanctions = SanctionsEntries()
+        for row in rows:
+            sanctions.append(*row)
+        
+        # Build the n-gram index used to narrow each query to a candidate set
+        self.index = NGramIndex(sanctions.lowered, sanctions.keys)
+        self.phonetic = None
+        self.fields = None
+        self.automaton = None
+        self._rows = None
         
         return sanctions
     
-    def check_sanctions(self, company_info: CompanyInfo) -> ToolResult:
-        """Check company against sanctions lists"""
+    def _load_snapshot(self, digest: Optional[str]) -> Optional[SanctionsEntries]:
+        """Map the snapshot if it exists and was compiled from the list with this digest"""
+        if not self.snapshot_file.exists():
+            return None
         try:
-            company_name = company_info.company_name
-            
-            # Fuzzy match against all sanctioned entities
-            best_match = None
-            best_score = 0
+            header, sanctions, index = load_snapshot(self.snapshot_file)
+        except (OSError, ValueError, KeyError):
+            return None
+        
+        # A stale snapshot is ignored rather than trusted
+        if digest and header["source_sha256"] != digest:
+            return None
+        self.index = index
+        self.phonetic = None
+        self.fields = None
+        self.automaton = None
+        self._rows = None
+        return sanctions
+    
+    def _phonetic_index(self) -> PhoneticIndex:
+        """The phonetic index, built on first use so plain fuzzy screening starts fast"""
+        if self.phonetic is None:
+            self.phonetic = PhoneticIndex(self.sanctions_list.names)
+            for entry_id in self.index.removed:
+                self.phonetic.remove(entry_id)
+        return self.phonetic
+    
+    def _field_index(self) -> FieldIndex:
+        """The address and identifier index, built on first use"""
+        if self.fields is None:
+            self.fields = FieldIndex(self.sanctions_list.addresses, self.sanctions_list.identifiers)
+            for entry_id in self.index.removed:
+                self.fields.remove(entry_id)
+        return self.fields
+    
+    def _automaton(self) -> WatchlistAutomaton:
+        """The whole-document scan automaton over the live entries, built on first use"""
+        if self.automaton is None:
+            self.automaton = WatchlistAutomaton(self.sanctions_list.names, self.index.removed)
+        return self.automaton
+    
+    def _stat_source(self) -> Optional[tuple]:
+        """Cheap change signature of the sanctions file (None if it doesn't exist)"""
+        if self.sanctions_file is None:
+            return None
+        try:
+            st = os.stat(self.sanctions_file)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+    
+    def refresh(self) -> bool:
+        """
+        Pick up changes to the sanctions file
+        
+        The file is only hashed when its mtime, size or inode changed. A
+        snapshot compiled from the new content is mapped directly; otherwise
+        the added and removed rows are applied to the loaded list. Returns
+        True if the list changed.
+        """
+        with self._lock:
+            stat = self._stat_source()
+            if stat == self._source_stat:
+                return False
+            self._source_stat = stat
+            if stat is None:
+                # Keep screening against the last list rather than nothing
+                return False
             
-            for sanctioned in self.sanctions_list:
-                # Try multiple matching algorithms
-                ratio = fuzz.ratio(company_name.lower(), sanctioned["name"].lower())
-                partial = fuzz.partial_ratio(company_name.lower(), sanctioned["name"].lower())
-                token_sort = fuzz.token_sort_ratio(company_name.lower(), sanctioned["name"].lower())
-                
-                # Take the best score
-                score = max(ratio, partial, token_sort)
-                
-                if score > best_score:
-                    best_score = score
-                    best_match = sanctioned
+            digest = source_digest(self.sanctions_file)
+            if digest == self.list_digest:
+                return False
             
-            # Determine if it's a match
-            if best_score >= self.match_threshold:
-                result = SanctionsResult(
-                    match=True,
-                    matched_name=best_match["name"],
-                    list_name=best_match["list"],
-                    match_score=best_score / 100.0,
-                    details=best_match["details"]
-                )
+            snapshot = self._load_snapshot(digest)
+            if snapshot:
+                self.sanctions_list = snapshot
             else:
-                result = SanctionsResult(
-                    match=False,
-                    match_score=best_score / 100.0
-                )
+                self._apply_changes(list(parse_sanctions_file(self.sanctions_file)))
+            if self.shards:
+                self._reshard()
+            if self.cache:
+                self.cache.discard_other_lists(digest)
+            self.list_digest = digest
+            self.list_version += 1
+            return True
+    
+    def _apply_changes(self, rows: list[tuple[str, str, str, str, str]]) -> None:
+        """Bring the loaded list in line with rows, touching only what changed"""
+        sanctions = self.sanctions_list
+        if self._rows is None:
+            self._rows = {}
+            for entry_id in range(len(sanctions)):
+                if entry_id not in self.index.removed:
+                    self._rows.setdefault(sanctions.row(entry_id), []).append(entry_id)
+        
+        # Rows are compared as multisets so duplicate lines are kept
+        wanted = Counter(rows)
+        removed, added = [], []
+        for row, entry_ids in self._rows.items():
+            removed.extend(entry_ids[wanted[row]:])
+        for row, count in wanted.items():
+            added.extend([row] * (count - len(self._rows.get(row, ()))))
+        
+        if len(removed) + len(added) > _FULL_RELOAD_FRACTION * len(self.index):
+            self.sanctions_list = self._build(rows)
+            return
+        
+        # Aho-Corasick failure links are global; rebuild on the next scan
+        self.automaton = None
+        
+        for entry_id in removed:
+            self.index.remove(entry_id)
+            if self.phonetic:
+                self.phonetic.remove(entry_id)
+            if self.fields:
+                self.fields.remove(entry_id)
+        for row, entry_ids in list(self._rows.items()):
+            del entry_ids[wanted[row]:]
+            if not entry_ids:
+                del self._rows[row]
+        
+        if added:
+            sanctions.thaw()
+            self.index.thaw(sanctions.lowered, sanctions.keys)
+            if self.phonetic:
+                self.phonetic.names = sanctions.names
+            if self.fields:
+                self.fields.thaw(sanctions.addresses, sanctions.identifiers)
+            for row in added:
+                sanctions.append(*row)
+                entry_id = len(sanctions) - 1
+                self.index.add(entry_id)
+                if self.phonetic:
+                    self.phonetic.add(entry_id)
+                if self.fields:
+                    self.fields.add(entry_id)
+                self._rows.setdefault(row, []).append(entry_id)
+    
+    def check_sanctions(self, company_info: CompanyInfo) -> ToolResult:
+        """
+        Check company against sanctions lists
+        
+        Only entries returned by the n-gram index are scored. Any entry that
+        can reach match_threshold is a candidate, so matches are the same as a
+        full scan.
+        
+        With top_k set, the result also lists the top_k entries by score with
+        their per-algorithm scores. Either way a non-match score is the best
+        over the whole list, as with a full scan, so scores just below
+        match_threshold still reach the review band.
+        
+        The address, bank account and registration number are then screened
+        too (see _screen_fields); a name match takes precedence.
+        """
+        try:
+            if self.auto_reload:
+                self.refresh()
+            
+            company_name = company_info.company_name.lower()
+            name_key = normalize_name(company_name)
+            key = cache_name(company_info.company_name)
+            with self._lock:
+                result = self._cached("single", key)
+                if result is None:
+                    result = self._check(company_name, name_key)
+                    self._cache_result("single", key, result)
+                result = self._screen_fields(company_info, result)
             
             return ToolResult(
                 tool_name="check_sanctions",
@@ -94,4 +339,319 @@ class SanctionsChecker:
                 success=False,
                 error=f"Sanctions check failed: {str(e)}"
             )
-
+    
+    def _check(self, company_name: str, name_key: str) -> SanctionsResult:
+        """Screen a normalised name the way this checker is configured to"""
+        if self.shards and self.top_k:
+            result = self._ranked_result(
+                *self.shards.top(company_name, name_key, self.top_k, self.match_threshold))
+        elif self.shards:
+            result = self._whole_list_score(company_name, name_key, self._best_result(
+                *self.shards.best(company_name, name_key, self.match_threshold)))
+        elif self.top_k:
+            result = self._rank(company_name, name_key, self.top_k)
+        else:
+            candidates = self.index.candidates(company_name, name_key, self.match_threshold)
+            result = self._whole_list_score(
+                company_name, name_key, self._screen(company_name, name_key, candidates))
+        return self._phonetic_fallback(company_name, result)
+    
+    def _whole_list_score(self, company_name: str, name_key: str,
+                          result: SanctionsResult) -> SanctionsResult:
+        """
+        A fuzzy non-match with the best score over the whole list
+        
+        The candidates only hold entries that could reach match_threshold,
+        so their best says nothing about lower scores; the top entry of a
+        ranked pass (see _top) is exact.
+        """
+        if result.match:
+            return result
+        if self.shards:
+            ranked, _ = self.shards.top(company_name, name_key, 1, self.match_threshold)
+        else:
+            ranked, _ = self._top(company_name, name_key, 1)
+        return result.model_copy(update={"match_score": ranked[0][0] / 100.0 if ranked else 0.0})
+    
+    def scan_document(self, text: str) -> list[SanctionsMention]:
+        """
+        Every sanctions list name mentioned anywhere in a document's text
+        
+        One pass of a word-level Aho-Corasick automaton, so the cost depends
+        on the length of the text and not on the size of the list. Mentions
+        are exact up to case, accents, punctuation and trailing legal
+        suffixes, with character offsets into text, in text order; nested
+        names ("Evil Corp" in "Evil Corp International") are each reported.
+        """
+        if self.auto_reload:
+            self.refresh()
+        
+        with self._lock:
+            entries = self.sanctions_list
+            mentions = []
+            for entry_id, start, end in self._automaton().scan(text):
+                entry = entries.entry(entry_id)
+                mentions.append(SanctionsMention(
+                    name=entry["name"], list_name=entry["list"], details=entry["details"],
+                    start=start, end=end, text=text[start:end],
+                ))
+            return mentions
+    
+    def check_sanctions_batch(self, companies: list[CompanyInfo]) -> list[SanctionsResult]:
+        """
+        Screen a whole vendor portfolio in one call
+        
+        Names are lowercased and de-duplicated once, then each distinct name
+        not already cached is scored against the list in bulk with rapidfuzz's C++ LCS kernel (one
+        call per entry-length group) instead of the per-query n-gram index.
+        Results are identical to check_sanctions, other fields and non-match
+        scores (the best over the whole list) included, except that no ranked
+        candidates are returned.
+        
+        Returns one SanctionsResult per company, in input order.
+        """
+        missing = [i for i, company in enumerate(companies) if not company.company_name]
+        if missing:
+            raise ValueError(f"Companies without a name at positions: {missing}")
+        
+        if self.auto_reload:
+            self.refresh()
+        
+        # The whole batch is screened against one list version
+        names = [company.company_name.lower() for company in companies]
+        screened = {}
+        with self._lock:
+            queries = []
+            for name in dict.fromkeys(names):
+                cached = self._cached("batch", cache_name(name))
+                if cached:
+                    screened[name] = cached
+                else:
+                    queries.append((name, normalize_name(name)))
+            
+            if self.shards and queries:
+                bests = self.shards.batch_best(queries, self.match_threshold)
+                for (name, _), best in zip(queries, bests):
+                    screened[name] = self._best_result(*best)
+            else:
+                for name, name_key in queries:
+                    candidates = self.index.bulk_candidates(name, name_key, self.match_threshold)
+                    screened[name] = self._screen(name, name_key, candidates)
+            for name, name_key in queries:
+                result = self._whole_list_score(name, name_key, screened[name])
+                screened[name] = self._phonetic_fallback(name, result)
+                self._cache_result("batch", cache_name(name), screened[name])
+            
+            return [self._screen_fields(company, screened[name]) for company, name in zip(companies, names)]
+    
+    def _screen_fields(self, company_info: CompanyInfo, result: SanctionsResult) -> SanctionsResult:
+        """
+        Add matches on the vendor's other fields to a name screening result
+        
+        Identifiers match exactly (score 1.0) and addresses by token sort
+        ratio >= address_threshold. Without a name match, the first of these
+        becomes the result's match, identifiers ahead of the address. Every
+        matching field is listed in field_matches.
+        """
+        matches = []
+        if result.match:
+            matches.append(SanctionsFieldMatch(
+                field="name", value=company_info.company_name, name=result.matched_name,
+                list_name=result.list_name, details=result.details, score=result.match_score,
+            ))
+        
+        if company_info.bank_account or company_info.registration_number or company_info.address:
+            fields = self._field_index()
+            found = []
+            for field in ("bank_account", "registration_number"):
+                value = getattr(company_info, field)
+                entry_id = fields.match_identifier(value) if value else None
+                if entry_id is not None:
+                    found.append((field, value, 100, entry_id))
+            if company_info.address:
+                score, entry_id = fields.best_address(company_info.address, self.address_threshold)
+                if entry_id is not None:
+                    found.append(("address", company_info.address, score, entry_id))
+            for field, value, score, entry_id in found:
+                entry = self.sanctions_list.entry(entry_id)
+                matches.append(SanctionsFieldMatch(
+                    field=field, value=value, name=entry["name"], list_name=entry["list"],
+                    details=entry["details"], score=score / 100.0,
+                ))
+        
+        update = {"field_matches": matches}
+        if matches and not result.match:
+            first = matches[0]
+            update.update({
+                "match": True,
+                "matched_name": first.name,
+                "list_name": first.list_name,
+                "match_score": first.score,
+                "details": first.details,
+                "match_type": "fuzzy" if first.field == "address" else "exact",
+                "matched_field": first.field,
+            })
+        return result.model_copy(update=update)
+    
+    def _cache_settings(self, mode: str) -> str:
+        """Everything besides the name and list that shapes a result of this mode"""
+        top_k = self.top_k if mode == "single" else 0
+        return f"{mode}:{_SCORING_VERSION}:{self.match_threshold}:{top_k}:{self.phonetic_threshold}"
+    
+    def _cached(self, mode: str, company_name: str) -> Optional[SanctionsResult]:
+        """Cached result for a cache_name() key against the current list, if any"""
+        if self.cache is None or self.list_digest is None:
+            return None
+        result = self.cache.get(self.list_digest, self._cache_settings(mode), company_name)
+        if result is None:
+            return None
+        return result.model_copy(update={"list_version": self.list_version})
+    
+    def _cache_result(self, mode: str, company_name: str, result: SanctionsResult) -> None:
+        if self.cache is not None and self.list_digest is not None:
+            self.cache.put(self.list_digest, self._cache_settings(mode), company_name, result)
+    
+    def _screen(self, company_name: str, name_key: str, candidates: list[int]) -> SanctionsResult:
+        """Score a lowercased name against candidate entries and build the result"""
+        return self._best_result(*self._best(company_name, name_key, candidates))
+    
+    def _best(self, company_name: str, name_key: str, candidates: list[int]) -> tuple[int, Optional[int]]:
+        """(best score, entry id) among candidates; the lowest id wins a tie"""
+        # Fuzzy match against the candidate sanctioned entities
+        best_id = None
+        best_score = 0
+        
+        for entry_id in candidates:
+            # Take the best score
+            score = max(self._scores(company_name, name_key, entry_id))
+            
+            if score > best_score:
+                best_score = score
+                best_id = entry_id
+        
+        return best_score, best_id
+    
+    def _best_result(self, best_score: int, best_id: Optional[int]) -> SanctionsResult:
+        """SanctionsResult for the best-scoring entry"""
+        # Determine if it's a match
+        if best_score >= self.match_threshold:
+            best_match = self.sanctions_list.entry(best_id)
+            return SanctionsResult(
+                match=True,
+                matched_name=best_match["name"],
+                list_name=best_match["list"],
+                match_score=best_score / 100.0,
+                details=best_match["details"],
+                list_version=self.list_version,
+                match_type="fuzzy",
+                matched_field="name"
+            )
+        
+        return SanctionsResult(
+            match=False,
+            match_score=best_score / 100.0,
+            list_version=self.list_version
+        )
+    
+    def _phonetic_fallback(self, company_name: str, result: SanctionsResult) -> SanctionsResult:
+        """Promote a fuzzy non-match to a phonetic match when the index has one"""
+        if result.match or self.phonetic_threshold is None:
+            return result
+        score, entry_id = self._phonetic_index().best(company_name, self.phonetic_threshold)
+        if entry_id is None:
+            return result
+        entry = self.sanctions_list.entry(entry_id)
+        return result.model_copy(update={
+            "match": True,
+            "matched_name": entry["name"],
+            "list_name": entry["list"],
+            "match_score": score / 100.0,
+            "details": entry["details"],
+            "match_type": "phonetic",
+            "matched_field": "name",
+        })
+    
+    def _scores(self, company_name: str, name_key: str, entry_id: int) -> tuple[int, int, int]:
+        """(ratio, partial_ratio, token sort ratio) of a lowercased name against an entry"""
+        entries = self.sanctions_list
+        lowered = entries.lowered[entry_id]
+        
+        # Try multiple matching algorithms; ratio on the precomputed
+        # token-sorted keys is token_sort_ratio without re-sorting the entry
+        return (
+            fuzz.ratio(company_name, lowered),
+            fuzz.partial_ratio(company_name, lowered),
+            fuzz.ratio(name_key, entries.keys[entry_id]),
+        )
+    
+    def _rank(self, company_name: str, name_key: str, top_k: int) -> SanctionsResult:
+        """Screen a lowercased name and rank the top_k entries by score"""
+        return self._ranked_result(*self._top(company_name, name_key, top_k))
+    
+    def _top(self, company_name: str, name_key: str, top_k: int) -> tuple[list[tuple], int]:
+        """
+        The top_k entries as (score, entry_id, per-algorithm scores), best first,
+        and the number of entries pruned without exact scoring
+        
+        The index is queried at falling thresholds, starting at
+        match_threshold, until the k-th best score reaches the current one;
+        an entry left out at threshold t scores below t and cannot displace
+        it. Once k entries are known, the next threshold is the k-th best
+        score itself. Within a pass, entries are scored in order of their
+        upper bound and the pass stops once the bound falls below the k-th
+        best score.
+        """
+        scored = {}
+        top = []  # min-heap of (score, -entry_id): the k-th best at top[0]
+        threshold = self.match_threshold
+        while True:
+            for bound, entry_id in self.index.ranked_candidates(company_name, name_key, threshold):
+                if len(top) == top_k and utils.intr(100 * bound + 1e-6) < top[0][0]:
+                    break
+                if entry_id in scored:
+                    continue
+                scored[entry_id] = self._scores(company_name, name_key, entry_id)
+                item = (max(scored[entry_id]), -entry_id)
+                if len(top) < top_k:
+                    heapq.heappush(top, item)
+                elif item > top[0]:
+                    heapq.heapreplace(top, item)
+            full = len(top) == top_k
+            if threshold <= 0 or (full and top[0][0] >= threshold):
+                break
+            next_level = next((t for t in _RANK_THRESHOLDS if t < threshold), 0)
+            threshold = max(top[0][0], next_level) if full else next_level
+        
+        ranked = [(score, -neg_id, scored[-neg_id]) for score, neg_id in sorted(top, reverse=True)]
+        return ranked, len(self.index) - len(scored)
+    
+    def _ranked_result(self, ranked: list[tuple], pruned: int) -> SanctionsResult:
+        """SanctionsResult carrying the ranked entries as candidates"""
+        entries = self.sanctions_list
+        candidates = []
+        for score, entry_id, (ratio, partial, token_sort) in ranked:
+            entry = entries.entry(entry_id)
+            candidates.append(SanctionsCandidate(
+                name=entry["name"],
+                list_name=entry["list"],
+                details=entry["details"],
+                score=score / 100.0,
+                ratio=ratio / 100.0,
+                partial_ratio=partial / 100.0,
+                token_sort_ratio=token_sort / 100.0,
+            ))
+        
+        best = candidates[0] if candidates else None
+        match = bool(ranked) and ranked[0][0] >= self.match_threshold
+        return SanctionsResult(
+            match=match,
+            matched_name=best.name if match else None,
+            list_name=best.list_name if match else None,
+            match_score=best.score if best else 0.0,
+            details=best.details if match else None,
+            list_version=self.list_version,
+            match_type="fuzzy" if match else None,
+            matched_field="name" if match else None,
+            candidates=candidates,
+            candidates_pruned=pruned,
+        )
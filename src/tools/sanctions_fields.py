@@ -0,0 +1,117 @@
+"""
+Address and identifier index for sanctions entries
+
+A sanctions list line may carry an address and identifiers (bank accounts,
+IBANs, registration numbers) after the details column. Identifiers are
+matched exactly once spacing and punctuation are removed; addresses are
+narrowed through an inverted index of their distinctive tokens and then
+scored with fuzzy token sort ratio, so a vendor's address and accounts are
+screened without scanning the list.
+"""
+from array import array
+from collections.abc import Sequence
+from typing import Optional
+
+from fuzzywuzzy import fuzz, utils
+
+# Tokens that say nothing about which address it is
+_ADDRESS_STOPWORDS = frozenset({
+    "street", "st", "road", "rd", "avenue", "ave", "lane", "ln", "boulevard", "blvd",
+    "building", "bldg", "floor", "fl", "suite", "ste", "unit", "office", "no", "number",
+    "po", "box", "the", "of", "and", "district", "city", "province", "region",
+})
+
+IDENTIFIER_SEPARATOR = ";"
+
+
+def normalize_identifier(value: str) -> str:
+    """Uppercase alphanumerics of an account or registration number"""
+    return "".join(ch for ch in value.upper() if ch.isalnum())
+
+
+def split_identifiers(identifiers: str) -> list[str]:
+    """Normalised identifiers of a ';'-separated list column"""
+    values = (normalize_identifier(value) for value in identifiers.split(IDENTIFIER_SEPARATOR))
+    return [value for value in values if value]
+
+
+def normalize_address(address: str) -> str:
+    """Lowercased address with punctuation stripped and generic words dropped"""
+    tokens = utils.full_process(address, force_ascii=True).split()
+    return " ".join(token for token in tokens if token not in _ADDRESS_STOPWORDS)
+
+
+class FieldIndex:
+    """
+    Identifier and address lookups over the store's address and identifier
+    columns; entries are added and removed by id alongside NGramIndex
+    """
+
+    def __init__(self, addresses: Sequence[str], identifiers: Sequence[str]):
+        self.addresses = addresses
+        self.identifiers = identifiers
+        self.normalized = []  # normalize_address per entry
+        self.identifier_ids = {}
+        self.address_postings = {}
+        self.removed = set()
+        for entry_id in range(len(addresses)):
+            self.add(entry_id)
+
+    def thaw(self, addresses: Sequence[str], identifiers: Sequence[str]) -> None:
+        """Switch to the store's thawed columns"""
+        self.addresses, self.identifiers = addresses, identifiers
+
+    def add(self, entry_id: int) -> None:
+        """Index an entry the store has just appended"""
+        if entry_id != len(self.normalized):
+            raise ValueError(f"Entries must be added in id order (expected {len(self.normalized)})")
+        for value in split_identifiers(self.identifiers[entry_id]):
+            self.identifier_ids.setdefault(value, array('I')).append(entry_id)
+        address = normalize_address(self.addresses[entry_id])
+        self.normalized.append(address)
+        for token in set(address.split()):
+            self.address_postings.setdefault(token, array('I')).append(entry_id)
+
+    def remove(self, entry_id: int) -> None:
+        """Exclude an entry from all future lookups"""
+        self.removed.add(entry_id)
+
+    def match_identifier(self, value: str) -> Optional[int]:
+        """Lowest live entry id listing this identifier, or None"""
+        value = normalize_identifier(value)
+        for entry_id in self.identifier_ids.get(value, ()) if value else ():
+            if entry_id not in self.removed:
+                return entry_id
+        return None
+
+    def best_address(self, address: str, threshold: int) -> tuple[int, Optional[int]]:
+        """
+        (score, id) of the best entry address scoring >= threshold, or (0, None)
+
+        Only entries sharing at least half of the query's address tokens are
+        scored: below that, token sort ratio cannot reach a useful threshold
+        for addresses of similar length. Such an entry must hold one of the
+        len - needed + 1 rarest query tokens, so only their postings are read
+        and common tokens (cities, countries) never are.
+        """
+        query = normalize_address(address)
+        tokens = set(query.split())
+        if not tokens:
+            return 0, None
+        needed = (len(tokens) + 1) // 2
+        rarest = sorted(tokens, key=lambda token: len(self.address_postings.get(token, ())))
+        candidates = set()
+        for token in rarest[:len(tokens) - needed + 1]:
+            candidates.update(self.address_postings.get(token, ()))
+
+        best_score, best_id = 0, None
+        for entry_id in sorted(candidates):
+            if entry_id in self.removed:
+                continue
+            entry_address = self.normalized[entry_id]
+            if len(tokens.intersection(entry_address.split())) < needed:
+                continue
+            score = fuzz.token_sort_ratio(query, entry_address, force_ascii=False, full_process=False)
+            if score >= threshold and score > best_score:
+                best_score, best_id = score, entry_id
+        return best_score, best_id
@@ -0,0 +1,256 @@
+"""
+Streaming importers for official sanctions list formats
+
+Consolidated lists are published as XML (OFAC SDN, EU financial sanctions)
+or CSV files of tens to hundreds of megabytes. Each importer reads its file
+incrementally - ElementTree.iterparse, clearing every entry once it is
+converted, or csv.reader - and yields the (name, list, details, address,
+identifiers) rows that SanctionsEntries and the snapshot compiler take, so
+memory stays flat however large the file is.
+
+Every alias becomes a row of its own, with "Alias of <primary name>" in
+its details, so aliases are screened like primary names.
+"""
+import csv
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+Row = tuple[str, str, str, str, str]
+
+OFAC_LIST = "OFAC SDN"
+EU_LIST = "EU Sanctions List"
+
+
+def _local(tag: str) -> str:
+    """Tag name without its XML namespace"""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _text(element: Optional[ET.Element]) -> str:
+    return (element.text or "").strip() if element is not None else ""
+
+
+def _join(*parts: str, sep: str = " ") -> str:
+    return sep.join(part for part in parts if part)
+
+
+def _clean(value: str) -> str:
+    """One-line field text that is safe in the pipe-delimited list format"""
+    return " ".join(value.replace("|", "/").split())
+
+
+def _person_name(element: ET.Element) -> str:
+    """'First Last' of an OFAC sdnEntry or aka; entities have only lastName"""
+    parts = {_local(child.tag): _text(child) for child in element}
+    return _join(parts.get("firstName", ""), parts.get("lastName", ""))
+
+
+def _entity_rows(names: list[str], list_name: str, details: str, address: str,
+                 identifiers: list[str]) -> Iterator[Row]:
+    """Rows for one listed entity: its primary name, then each distinct alias"""
+    names = list(dict.fromkeys(_clean(name) for name in names if name.strip()))
+    if not names:
+        return
+    list_name, details, address = _clean(list_name), _clean(details), _clean(address)
+    ids = ";".join(dict.fromkeys(_clean(value) for value in identifiers))
+    yield names[0], list_name, details, address, ids
+    for alias in names[1:]:
+        yield alias, list_name, _join(f"Alias of {names[0]}", details, sep="; "), address, ids
+
+
+def _iter_entries(path: Path, entry_tag: str) -> Iterator[ET.Element]:
+    """Complete entry elements of an XML file, each freed after use"""
+    context = ET.iterparse(str(path), events=("start", "end"))
+    _, root = next(context)
+    for event, element in context:
+        if event == "end" and _local(element.tag) == entry_tag:
+            yield element
+            # Drop the converted entry, and the root's reference to it
+            element.clear()
+            root.clear()
+
+
+def iter_ofac_xml(path: Path) -> Iterator[Row]:
+    """Rows of an OFAC SDN (or consolidated non-SDN) XML export"""
+    for entry in _iter_entries(path, "sdnEntry"):
+        fields = {_local(child.tag): child for child in entry}
+        names = [_person_name(entry)] + [_person_name(aka) for aka in fields.get("akaList", ())]
+
+        programs = [_text(program) for program in fields.get("programList", ())]
+        details = _join(
+            _text(fields.get("sdnType")),
+            f"Programs: {', '.join(programs)}" if programs else "",
+            _text(fields.get("remarks")),
+            sep="; ",
+        )
+
+        address = ""
+        for element in fields.get("addressList", ()):
+            parts = {_local(child.tag): _text(child) for child in element}
+            address = _join(
+                parts.get("address1", ""), parts.get("address2", ""), parts.get("address3", ""),
+                parts.get("city", ""), parts.get("postalCode", ""), parts.get("country", ""),
+                sep=", ",
+            )
+            if address:
+                break  # the first address is the one indexed
+
+        identifiers = []
+        for element in fields.get("idList", ()):
+            parts = {_local(child.tag): _text(child) for child in element}
+            if parts.get("idNumber"):
+                identifiers.append(parts["idNumber"])
+
+        yield from _entity_rows(names, OFAC_LIST, details, address, identifiers)
+
+
+def iter_eu_xml(path: Path) -> Iterator[Row]:
+    """Rows of an EU consolidated financial sanctions (FSF) XML export"""
+    for entity in _iter_entries(path, "sanctionEntity"):
+        names, programmes, identifiers = [], [], []
+        subject_type, remark, address = "", "", ""
+        for child in entity:
+            tag, attrs = _local(child.tag), child.attrib
+            if tag == "nameAlias":
+                names.append(attrs.get("wholeName") or _join(attrs.get("firstName", ""), attrs.get("lastName", "")))
+            elif tag == "regulation" and attrs.get("programme"):
+                programmes.append(attrs["programme"])
+            elif tag == "subjectType":
+                subject_type = attrs.get("code", "")
+            elif tag == "remark":
+                remark = _text(child)
+            elif tag == "address" and not address:
+                address = _join(
+                    attrs.get("street", ""), attrs.get("poBox", ""), attrs.get("city", ""),
+                    attrs.get("zipCode", ""), attrs.get("countryDescription", ""),
+                    sep=", ",
+                )
+            elif tag == "identification" and attrs.get("number"):
+                identifiers.append(attrs["number"])
+
+        details = _join(
+            subject_type,
+            f"Programmes: {', '.join(dict.fromkeys(programmes))}" if programmes else "",
+            remark,
+            sep="; ",
+        )
+        yield from _entity_rows(names, EU_LIST, details, address, identifiers)
+
+
+def iter_csv(path: Path, default_list: str = "Imported") -> Iterator[Row]:
+    """
+    Rows of a CSV list with a header row
+
+    Two layouts are understood: the EU consolidated CSV (one line per
+    entity x alias x address, grouped by Entity_LogicalId) and a plain
+    layout with a name column and optional aliases (';'-separated), list,
+    details, address and identifiers columns. The delimiter is sniffed.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        sample = f.readline()
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel  # a single column
+        reader = csv.DictReader(f, dialect=dialect)
+        columns = {name.strip().lower(): name for name in reader.fieldnames or ()}
+        if "entity_logicalid" in columns and "namealias_wholename" in columns:
+            yield from _iter_eu_csv(reader, columns)
+            return
+        if "name" not in columns:
+            raise ValueError(f"CSV sanctions list has no name column: {path}")
+
+        def get(record: dict, column: str) -> str:
+            return (record.get(columns[column]) or "").strip() if column in columns else ""
+
+        for record in reader:
+            aliases = get(record, "aliases").split(";")
+            yield from _entity_rows(
+                [get(record, "name")] + [alias.strip() for alias in aliases],
+                get(record, "list") or default_list,
+                get(record, "details"),
+                get(record, "address"),
+                [value.strip() for value in get(record, "identifiers").split(";") if value.strip()],
+            )
+
+
+def _iter_eu_csv(reader: csv.DictReader, columns: dict) -> Iterator[Row]:
+    """Rows of the EU consolidated CSV, one entity per run of Entity_LogicalId"""
+    def get(record: dict, column: str) -> str:
+        column = column.lower()
+        return (record.get(columns[column]) or "").strip() if column in columns else ""
+
+    def flush(group: list[dict]) -> Iterator[Row]:
+        first = group[0]
+        programmes = dict.fromkeys(get(r, "Entity_Regulation_Programme") for r in group)
+        details = _join(
+            get(first, "Entity_SubjectType"),
+            f"Programmes: {', '.join(p for p in programmes if p)}" if any(programmes) else "",
+            get(first, "Entity_Remark"),
+            sep="; ",
+        )
+        address = ""
+        for record in group:
+            address = _join(
+                get(record, "Address_Street"), get(record, "Address_City"),
+                get(record, "Address_ZipCode"), get(record, "Address_CountryDescription"),
+                sep=", ",
+            )
+            if address:
+                break
+        yield from _entity_rows(
+            [get(r, "NameAlias_WholeName") for r in group], EU_LIST, details, address,
+            [get(r, "Identification_Number") for r in group if get(r, "Identification_Number")],
+        )
+
+    group, current = [], None
+    for record in reader:
+        logical_id = get(record, "Entity_LogicalId")
+        if group and logical_id != current:
+            yield from flush(group)
+            group = []
+        current = logical_id
+        group.append(record)
+    if group:
+        yield from flush(group)
+
+
+def _sniff_xml(path: Path) -> str:
+    """Tag of the first element below the root: sdnEntry, sanctionEntity, ..."""
+    for event, element in ET.iterparse(str(path), events=("start",)):
+        tag = _local(element.tag)
+        if tag in ("sdnEntry", "sanctionEntity"):
+            return tag
+    return ""
+
+
+def detect_format(path: Path) -> str:
+    """"ofac_xml", "eu_xml", "csv" or "pipe", from the content of path"""
+    with open(path, "r", encoding="utf-8-sig", errors="replace") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("<"):
+                tag = _sniff_xml(Path(path))
+                if tag == "sdnEntry":
+                    return "ofac_xml"
+                if tag == "sanctionEntity":
+                    return "eu_xml"
+                raise ValueError(f"Unrecognised sanctions XML: {path}")
+            return "pipe" if "|" in line else "csv"
+    return "pipe"
+
+
+def import_rows(path: Path, fmt: Optional[str] = None) -> Iterable[Row]:
+    """Rows of an XML or CSV sanctions list, streamed"""
+    fmt = fmt or detect_format(path)
+    if fmt == "ofac_xml":
+        return iter_ofac_xml(path)
+    if fmt == "eu_xml":
+        return iter_eu_xml(path)
+    if fmt == "csv":
+        return iter_csv(path)
+    raise ValueError(f"Not an importable sanctions list format: {fmt}")
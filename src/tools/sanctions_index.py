@@ -0,0 +1,400 @@
+"""Character n-gram index for narrowing fuzzy sanctions screening"""
+import re
+from array import array
+from bisect import bisect_right
+from collections import Counter, defaultdict
+from functools import lru_cache
+from itertools import chain
+from typing import Iterable, Optional, Sequence
+
+import Levenshtein
+from rapidfuzz import process
+from rapidfuzz.distance import LCSseq
+
+# Gram size for the inverted index. Trigrams were the first choice, but at an
+# 85 threshold partial_ratio can lose more trigrams than a typical company
+# name has, which makes the count filter admit the whole list. Bigrams keep
+# the bound meaningful for names of 10+ characters.
+GRAM_SIZE = 2
+
+# Grams only use characters that fuzzywuzzy's full_process leaves untouched
+_GRAM_RE = re.compile(r'(?=([a-z0-9_]{%d}))' % GRAM_SIZE)
+
+
+def name_profile(text: str, key: str) -> tuple[int, int, int, int, frozenset]:
+    """
+    Profile a lowercased name and its normalize_name key for the index
+
+    Returns (length, gram count, key length, key gram count, grams) where
+    grams is the union of the name and key gram sets.
+    """
+    raw = set(_GRAM_RE.findall(text))
+    processed = set(_GRAM_RE.findall(key))
+    return len(text), len(raw), len(key), len(processed), frozenset(raw | processed)
+
+
+def _min_lcs(total: int, threshold: int) -> int:
+    """Smallest common subsequence for 2*lcs/total to round up to threshold"""
+    return -(-(2 * threshold - 1) * total // 400)
+
+
+def _ratio_floor(a: int, ia: int, b: int, ib: int, threshold: int) -> Optional[int]:
+    """
+    Minimum shared grams for ratio() of two strings to reach threshold
+
+    Every unmatched character destroys at most GRAM_SIZE grams on its own side
+    and GRAM_SIZE - 1 on the other. Returns None when the lengths alone rule
+    the pair out.
+    """
+    lcs = _min_lcs(a + b, threshold)
+    if lcs > min(a, b):
+        return None
+    q = GRAM_SIZE
+    return max(
+        ia - q * (a - lcs) - (q - 1) * (b - lcs),
+        ib - q * (b - lcs) - (q - 1) * (a - lcs),
+    )
+
+
+@lru_cache(maxsize=None)
+def _partial_slack(m: int, threshold: int) -> int:
+    """
+    Most grams of the shorter string partial_ratio can lose and still match
+
+    fuzzywuzzy truncates windows at the end of the longer string, so every
+    window length up to m has to be considered.
+    """
+    q = GRAM_SIZE
+    slack = 0
+    for w in range(m + 1):
+        lcs = _min_lcs(m + w, threshold)
+        if lcs <= w:
+            slack = max(slack, q * (m - lcs) + (q - 1) * (w - lcs))
+    return slack
+
+
+@lru_cache(maxsize=None)
+def _partial_min_lcs(m: int, threshold: int) -> int:
+    """Smallest common subsequence with which partial_ratio can still match"""
+    feasible = [_min_lcs(m + w, threshold) for w in range(m + 1)]
+    return min((lcs for w, lcs in enumerate(feasible) if lcs <= w), default=0)
+
+
+def score_upper_bound(query: str, query_key: str, name: str, name_key: str) -> float:
+    """
+    Upper bound on max(ratio, partial_ratio, key ratio) / 100
+
+    ratio on the names and on their keys are exact Levenshtein ratios. partial_ratio
+    compares the shorter string with a window of the longer one, whose common
+    subsequence can be no longer than that of the full strings.
+    """
+    ratio = Levenshtein.ratio(query, name)
+    a, b = len(query), len(name)
+    m = min(a, b)
+    lcs = min(ratio * (a + b) / 2, m)
+    partial = 2 * lcs / (m + lcs) if m else 1.0
+    return max(ratio, partial, Levenshtein.ratio(query_key, name_key))
+
+
+class _LengthBuckets:
+    """Entry ids grouped by string length, ordered by gram count"""
+
+    def __init__(self, lengths: list[int], counts: list[int]):
+        grouped = defaultdict(list)
+        for entry_id, (length, count) in enumerate(zip(lengths, counts)):
+            grouped[length].append((count, entry_id))
+        self.buckets = {}
+        for length, items in sorted(grouped.items()):
+            items.sort()
+            self.buckets[length] = (array('I', (c for c, _ in items)),
+                                    array('I', (i for _, i in items)))
+
+    @classmethod
+    def from_dict(cls, buckets: dict) -> "_LengthBuckets":
+        """Wrap prebuilt {length: (counts, ids)} buckets"""
+        instance = cls.__new__(cls)
+        instance.buckets = buckets
+        return instance
+
+    def add(self, length: int, count: int, entry_id: int) -> None:
+        """Insert an entry, keeping its bucket ordered by gram count"""
+        if length not in self.buckets:
+            self.buckets[length] = (array('I'), array('I'))
+        counts, ids = self.buckets[length]
+        if not isinstance(counts, array):
+            counts, ids = array('I', counts.tobytes()), array('I', ids.tobytes())
+            self.buckets[length] = (counts, ids)
+        pos = bisect_right(counts, count)
+        counts.insert(pos, count)
+        ids.insert(pos, entry_id)
+
+    def at_most(self, length: int, max_count: int) -> list[int]:
+        """Ids of entries with this length and at most max_count grams"""
+        counts, ids = self.buckets[length]
+        return ids[:bisect_right(counts, max_count)]
+
+    def min_count(self, length: int) -> int:
+        return self.buckets[length][0][0]
+
+
+class NGramIndex:
+    """
+    Inverted index from character n-grams to sanctions entries
+
+    Used as a filter in front of fuzzywuzzy: ``candidates`` returns every entry
+    whose best of ratio / partial_ratio on the lowercased names or ratio on
+    the normalize_name keys could reach the threshold, so scoring only the
+    candidates gives the same best match as scoring the whole list. Two sound
+    filters are applied in turn:
+
+    1. Gram counting - a pair that reaches the threshold must share a minimum
+       number of grams, derived from the string lengths and gram counts.
+    2. Levenshtein bound - the C-level ratio gives the exact ratio scores and
+       caps partial_ratio (see score_upper_bound).
+
+    names and keys are the store's own sequences and are not copied;
+    postings and per-entry counts are kept in typed arrays. Entries are
+    added with add() once appended to the store; remove() only marks an
+    entry as removed, so ids stay stable until the index is rebuilt.
+    """
+
+    def __init__(self, names: Sequence[str], keys: Sequence[str]):
+        self.names, self.keys = names, keys
+        postings = defaultdict(list)
+        self.raw_len, self.raw_grams = array('I'), array('I')
+        self.key_len, self.key_grams = array('I'), array('I')
+
+        for entry_id, (name, key) in enumerate(zip(names, keys)):
+            raw_len, raw_count, key_len, key_count, grams = name_profile(name, key)
+            self.raw_len.append(raw_len)
+            self.raw_grams.append(raw_count)
+            self.key_len.append(key_len)
+            self.key_grams.append(key_count)
+            for gram in grams:
+                postings[gram].append(entry_id)
+
+        self.postings = {gram: array('I', ids) for gram, ids in postings.items()}
+
+        self.raw_buckets = _LengthBuckets(self.raw_len, self.raw_grams)
+        self.key_buckets = _LengthBuckets(self.key_len, self.key_grams)
+        self.removed = set()
+        self._groups = None
+
+    @classmethod
+    def from_arrays(cls, names: Sequence[str], keys: Sequence[str], raw_len, raw_grams,
+                    key_len, key_grams, postings: dict, raw_buckets: dict,
+                    key_buckets: dict) -> "NGramIndex":
+        """Rebuild an index from prebuilt arrays (see sanctions_snapshot)"""
+        index = cls.__new__(cls)
+        index.names, index.keys = names, keys
+        index.raw_len, index.raw_grams = raw_len, raw_grams
+        index.key_len, index.key_grams = key_len, key_grams
+        index.postings = postings
+        index.raw_buckets = _LengthBuckets.from_dict(raw_buckets)
+        index.key_buckets = _LengthBuckets.from_dict(key_buckets)
+        index.removed = set()
+        index._groups = None
+        return index
+
+    def __len__(self) -> int:
+        return len(self.names) - len(self.removed)
+
+    def thaw(self, names: Sequence[str], keys: Sequence[str]) -> None:
+        """
+        Switch to the store's thawed columns and copy mapped arrays
+
+        Needed before add() on an index loaded from a snapshot, whose arrays
+        are read-only views of the mapped file.
+        """
+        self.names, self.keys = names, keys
+        for attr in ("raw_len", "raw_grams", "key_len", "key_grams"):
+            values = getattr(self, attr)
+            if not isinstance(values, array):
+                setattr(self, attr, array('I', values.tobytes()))
+        self.postings = {
+            gram: ids if isinstance(ids, array) else array('I', ids.tobytes())
+            for gram, ids in self.postings.items()
+        }
+
+    def add(self, entry_id: int) -> None:
+        """Index an entry the store has just appended"""
+        if entry_id != len(self.raw_len):
+            raise ValueError(f"Entries must be added in id order (expected {len(self.raw_len)})")
+        raw_len, raw_count, key_len, key_count, grams = name_profile(
+            self.names[entry_id], self.keys[entry_id])
+        self.raw_len.append(raw_len)
+        self.raw_grams.append(raw_count)
+        self.key_len.append(key_len)
+        self.key_grams.append(key_count)
+        for gram in grams:
+            self.postings.setdefault(gram, array('I')).append(entry_id)
+        self.raw_buckets.add(raw_len, raw_count, entry_id)
+        self.key_buckets.add(key_len, key_count, entry_id)
+        self._groups = None
+
+    def remove(self, entry_id: int) -> None:
+        """Exclude an entry from all future candidate sets"""
+        self.removed.add(entry_id)
+
+    def candidates(self, name: str, key: str, threshold: int) -> list[int]:
+        """Ids (in list order) of entries that may score >= threshold against name"""
+        return self._within_bound(name, key, self._select(name, key, threshold), threshold)
+
+    def ranked_candidates(self, name: str, key: str, threshold: int) -> list[tuple[float, int]]:
+        """
+        (score_upper_bound, id) of entries that may score >= threshold, highest bound first
+
+        The entries are the same as candidates() returns. They are found with
+        the bulk scan, which stays selective below the match threshold where
+        nearly every entry shares enough grams with the query. A threshold of
+        0 bounds every live entry.
+        """
+        if threshold <= 0:
+            selected = range(len(self.names))
+        else:
+            selected = self._bulk_select(name, key, threshold)
+        return sorted(self._bounds(name, key, selected, threshold), key=lambda b: (-b[0], b[1]))
+
+    def _select(self, name: str, key: str, threshold: int) -> set[int]:
+        """Entries passing the gram count filter"""
+        a, ia, sa, isa, grams = name_profile(name, key)
+        shared = Counter(chain.from_iterable(
+            self.postings[g] for g in grams if g in self.postings
+        ))
+
+        # Entries that can match without sharing a single gram
+        selected = set(self._zero_overlap(a, ia, sa, isa, threshold))
+
+        # Entries sharing grams: check the per-entry floor, visiting the highest
+        # overlaps first and stopping below the floor of the whole index
+        global_floor = max(self._global_floor(a, ia, sa, isa, threshold), 1)
+        floors = {}
+        for entry_id, count in shared.most_common():
+            if count < global_floor:
+                break
+            profile = (self.raw_len[entry_id], self.raw_grams[entry_id],
+                       self.key_len[entry_id], self.key_grams[entry_id])
+            if profile not in floors:
+                floors[profile] = self._entry_floor(profile, a, ia, sa, isa, threshold)
+            if floors[profile] is not None and count >= floors[profile]:
+                selected.add(entry_id)
+
+        return selected
+
+    def bulk_candidates(self, name: str, key: str, threshold: int) -> list[int]:
+        """
+        Same contract as candidates(), computed by a bulk scan
+
+        Every length group is scanned with rapidfuzz's C++ LCS kernel against
+        the smallest common subsequence any of the three scorers could match
+        with. Cheaper than gram counting when many names are screened.
+        """
+        return self._within_bound(name, key, self._bulk_select(name, key, threshold), threshold)
+
+    def _bulk_select(self, name: str, key: str, threshold: int) -> set[int]:
+        """Entries passing the bulk LCS scan"""
+        groups = self._length_groups()
+        selected = set()
+
+        a = len(name)
+        for b, (ids, names) in groups["raw"].items():
+            m = min(a, b)
+            cutoff = _partial_min_lcs(m, threshold)
+            ratio_lcs = _min_lcs(a + b, threshold)
+            if ratio_lcs <= m:
+                cutoff = min(cutoff, ratio_lcs)
+            for _, _, pos in process.extract(name, names, scorer=LCSseq.similarity,
+                                             score_cutoff=cutoff, limit=None):
+                selected.add(ids[pos])
+
+        sa = len(key)
+        for b, (ids, keys) in groups["key"].items():
+            ratio_lcs = _min_lcs(sa + b, threshold)
+            if ratio_lcs > min(sa, b):
+                continue
+            for _, _, pos in process.extract(key, keys, scorer=LCSseq.similarity,
+                                             score_cutoff=ratio_lcs, limit=None):
+                selected.add(ids[pos])
+
+        return selected
+
+    def _within_bound(self, name: str, key: str, selected: Iterable[int],
+                      threshold: int) -> list[int]:
+        """Sorted ids of live selected entries whose score_upper_bound reaches threshold"""
+        return sorted(entry_id for _, entry_id in self._bounds(name, key, selected, threshold))
+
+    def _bounds(self, name: str, key: str, selected: Iterable[int],
+                threshold: int) -> list[tuple[float, int]]:
+        """(score_upper_bound, id) of live selected entries whose bound reaches threshold"""
+        cutoff = (threshold - 0.5) / 100 - 1e-9
+        bounds = []
+        for entry_id in selected:
+            if entry_id in self.removed:
+                continue
+            bound = score_upper_bound(name, key, self.names[entry_id], self.keys[entry_id])
+            if bound >= cutoff:
+                bounds.append((bound, entry_id))
+        return bounds
+
+    def _length_groups(self) -> dict:
+        """Names and keys grouped by length, built on first use"""
+        if self._groups is None:
+            self._groups = {}
+            for key, buckets, names in (("raw", self.raw_buckets, self.names),
+                                        ("key", self.key_buckets, self.keys)):
+                self._groups[key] = {
+                    length: (ids, [names[i] for i in ids])
+                    for length, (_, ids) in buckets.buckets.items()
+                }
+        return self._groups
+
+    @staticmethod
+    def _entry_floor(profile: tuple, a: int, ia: int, sa: int, isa: int,
+                     threshold: int) -> Optional[int]:
+        """Fewest shared grams an entry profile needs under any of the three scorers"""
+        b, ib, sb, isb = profile
+        floors = [
+            _ratio_floor(a, ia, b, ib, threshold),
+            _ratio_floor(sa, isa, sb, isb, threshold),
+            ia - _partial_slack(a, threshold) if a <= b else ib - _partial_slack(b, threshold),
+        ]
+        floors = [f for f in floors if f is not None]
+        return min(floors) if floors else None
+
+    def _global_floor(self, a: int, ia: int, sa: int, isa: int, threshold: int) -> int:
+        """Lower bound of _entry_floor over the whole index"""
+        floor = ia - _partial_slack(a, threshold)
+        for b in self.raw_buckets.buckets:
+            ib = self.raw_buckets.min_count(b)
+            if b < a:
+                floor = min(floor, ib - _partial_slack(b, threshold))
+            ratio_floor = _ratio_floor(a, ia, b, ib, threshold)
+            if ratio_floor is not None:
+                floor = min(floor, ratio_floor)
+        for b in self.key_buckets.buckets:
+            ratio_floor = _ratio_floor(sa, isa, b, self.key_buckets.min_count(b), threshold)
+            if ratio_floor is not None:
+                floor = min(floor, ratio_floor)
+        return floor
+
+    def _zero_overlap(self, a: int, ia: int, sa: int, isa: int, threshold: int) -> list[int]:
+        """Entries whose floor is <= 0 and so need no shared grams at all"""
+        q = GRAM_SIZE
+        found = []
+        for buckets, length, count in ((self.raw_buckets, a, ia), (self.key_buckets, sa, isa)):
+            for b in buckets.buckets:
+                lcs = _min_lcs(length + b, threshold)
+                if lcs > min(length, b):
+                    continue
+                if count - q * (length - lcs) - (q - 1) * (b - lcs) > 0:
+                    continue
+                found.extend(buckets.at_most(b, q * (b - lcs) + (q - 1) * (length - lcs)))
+
+        query_side = ia - _partial_slack(a, threshold) <= 0
+        for b in self.raw_buckets.buckets:
+            if b >= a:
+                if query_side:
+                    found.extend(self.raw_buckets.buckets[b][1])
+            else:
+                found.extend(self.raw_buckets.at_most(b, _partial_slack(b, threshold)))
+        return found
@@ -0,0 +1,183 @@
+"""
+Phonetic secondary index for sanctions name variants
+
+Transliterations such as Mohammed / Muhammad or Khodorkovsky / Chodorkowski
+fall below the fuzzy threshold although they are the same name. Each token
+is reduced to Double Metaphone-style consonant codes (a primary and an
+alternate reading) after romanising Cyrillic and stripping accents, and
+entries are looked up by code instead of by lowering the fuzzy threshold.
+"""
+import re
+import unicodedata
+from array import array
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import Optional
+
+from fuzzywuzzy import fuzz, utils
+
+from src.tools.sanctions_store import strip_legal_suffixes
+
+# Romanisation of Russian / Ukrainian Cyrillic (close to BGN/PCGN)
+_CYRILLIC = {
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ё": "yo", "ж": "zh",
+    "з": "z", "и": "i", "й": "y", "к": "k", "л": "l", "м": "m", "н": "n", "о": "o",
+    "п": "p", "р": "r", "с": "s", "т": "t", "у": "u", "ф": "f", "х": "kh", "ц": "ts",
+    "ч": "ch", "ш": "sh", "щ": "shch", "ъ": "", "ы": "y", "ь": "", "э": "e", "ю": "yu",
+    "я": "ya", "і": "i", "ї": "yi", "є": "ye", "ґ": "g",
+}
+
+_VOWEL = "*"
+_VOWELS = frozenset("aeiouy")
+_SOFTENING = frozenset(("e", "i", "y"))
+
+# Letter groups read before single letters: spelling -> (primary, alternate)
+_GROUPS = {
+    "shch": ("X", "X"), "dzh": ("J", "J"), "sch": ("X", "X"), "tch": ("X", "X"),
+    "kh": ("K", ""), "zh": ("J", "J"), "sh": ("X", "X"), "ch": ("X", "K"),
+    "ph": ("F", "F"), "th": ("T", "T"), "ts": ("S", "S"), "tz": ("S", "S"),
+    "ck": ("K", "K"), "dj": ("J", "J"), "gh": ("K", "K"), "ks": ("KS", "KS"),
+}
+_SPELLING_RE = re.compile("|".join(sorted(_GROUPS, key=len, reverse=True)) + "|.")
+
+_LETTERS = {
+    "b": "B", "d": "T", "t": "T", "f": "F", "v": "F", "w": "F", "p": "P", "k": "K",
+    "q": "K", "s": "S", "z": "S", "x": "KS", "l": "L", "m": "M", "n": "N", "r": "R",
+    "h": "",
+}
+
+
+def transliterate(text: str) -> str:
+    """Lowercase Latin rendering of a name: Cyrillic romanised, accents stripped"""
+    text = "".join(_CYRILLIC.get(ch, ch) for ch in text.lower())
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in text if not unicodedata.combining(ch))
+
+
+@lru_cache(maxsize=65536)
+def phonetic_codes(token: str) -> frozenset:
+    """
+    Primary and alternate phonetic codes of a lowercase ASCII token
+
+    Vowels are dropped except at the start of a token (coded "A"), voiced
+    and unvoiced spellings of the same sound share a code, and a doubled
+    letter counts once. Digits are kept as they are.
+    """
+    codes = ([], [])
+    last = [None, None]
+    for match in _SPELLING_RE.finditer(token):
+        spelling, i = match.group(), match.start()
+        if spelling in _GROUPS:
+            primary, alternate = _GROUPS[spelling]
+        elif spelling in _VOWELS:
+            primary = alternate = _VOWEL
+        elif spelling == "c":
+            primary = alternate = "S" if token[i + 1:i + 2] in _SOFTENING else "K"
+        elif spelling == "g":
+            primary, alternate = ("J", "K") if token[i + 1:i + 2] in _SOFTENING else ("K", "K")
+        elif spelling == "j":
+            primary, alternate = "J", _VOWEL
+        else:
+            primary = alternate = _LETTERS.get(spelling, spelling if spelling.isdigit() else "")
+
+        for reading, code in enumerate((primary, alternate)):
+            if code == _VOWEL:
+                if i == 0:
+                    codes[reading].append("A")
+                last[reading] = None
+            elif code and code != last[reading]:
+                codes[reading].append(code)
+                last[reading] = code
+
+    return frozenset(code for code in ("".join(codes[0]), "".join(codes[1])) if code)
+
+
+def phonetic_tokens(name: str) -> tuple[str, list[frozenset]]:
+    """(transliterated name, code set per token) with legal suffixes dropped"""
+    text = utils.full_process(transliterate(name), force_ascii=True)
+    tokens = strip_legal_suffixes(text.split())
+    return " ".join(tokens), [phonetic_codes(token) for token in tokens]
+
+
+def _tokens_match(query: list[frozenset], entry: list[frozenset]) -> bool:
+    """Whether every query token pairs off with its own entry token sharing a code"""
+    if not query:
+        return True
+    first, rest = query[0], query[1:]
+    for i, codes in enumerate(entry):
+        if first & codes and _tokens_match(rest, entry[:i] + entry[i + 1:]):
+            return True
+    return False
+
+
+class PhoneticIndex:
+    """
+    Inverted index from phonetic token codes to sanctions entries
+
+    An entry is a phonetic hit for a query when both have the same number of
+    tokens (legal suffixes aside) and the tokens pair off, in any order, with
+    a shared code. names is the store's own sequence of original names;
+    entries are added and removed by id alongside NGramIndex.
+    """
+
+    def __init__(self, names: Sequence[str]):
+        self.names = names
+        self.tokens = []
+        self.postings = {}
+        self.removed = set()
+        for entry_id in range(len(names)):
+            self.add(entry_id)
+
+    def add(self, entry_id: int) -> None:
+        """Index an entry the store has just appended"""
+        if entry_id != len(self.tokens):
+            raise ValueError(f"Entries must be added in id order (expected {len(self.tokens)})")
+        _, tokens = phonetic_tokens(self.names[entry_id])
+        self.tokens.append(tuple(tokens))
+        for code in set().union(*tokens):
+            self.postings.setdefault(code, array('I')).append(entry_id)
+
+    def remove(self, entry_id: int) -> None:
+        """Exclude an entry from all future lookups"""
+        self.removed.add(entry_id)
+
+    def lookup(self, name: str) -> list[int]:
+        """Ids of phonetic hits for name, in list order"""
+        _, query = phonetic_tokens(name)
+        if not query or not all(query):
+            return []
+
+        # Entries holding a code of every query token, rarest token first
+        matches = None
+        for codes in sorted(query, key=lambda c: sum(len(self.postings.get(code, ())) for code in c)):
+            ids = set()
+            for code in codes:
+                ids.update(self.postings.get(code, ()))
+            matches = ids if matches is None else matches & ids
+            if not matches:
+                return []
+
+        return sorted(
+            entry_id for entry_id in matches
+            if entry_id not in self.removed
+            and len(self.tokens[entry_id]) == len(query)
+            and _tokens_match(query, list(self.tokens[entry_id]))
+        )
+
+    def best(self, name: str, threshold: int) -> tuple[int, Optional[int]]:
+        """
+        (score, id) of the best phonetic hit whose transliterated spelling
+        still scores >= threshold, or (0, None); the lowest id wins a tie
+
+        The score is the better of ratio and token sort ratio on the
+        transliterated names; partial_ratio is left out so short names do
+        not pull in longer ones.
+        """
+        text, _ = phonetic_tokens(name)
+        best_score, best_id = 0, None
+        for entry_id in self.lookup(name):
+            entry_text, _ = phonetic_tokens(self.names[entry_id])
+            score = max(fuzz.ratio(text, entry_text), fuzz.token_sort_ratio(text, entry_text))
+            if score >= threshold and score > best_score:
+                best_score, best_id = score, entry_id
+        return best_score, best_id
@@ -0,0 +1,125 @@
+"""
+Whole-document watchlist scan
+
+Sanctioned entities often appear in a document as a parent company,
+shareholder or bank rather than as the vendor's own name. WatchlistAutomaton
+is an Aho-Corasick automaton over the word tokens of every list name, so a
+document is scanned once, in time linear in its length plus the number of
+mentions, whatever the size of the list.
+
+Matching is on whole words, case and accents folded, with trailing legal
+suffixes dropped from list names while two words remain: "BadActor
+Industries Ltd" is found in "...a subsidiary of BadActor Industries." as
+well as with its suffix, but "Evil Corp" is not reduced to "evil".
+"""
+import re
+import unicodedata
+from array import array
+from collections.abc import Iterable, Sequence
+from typing import Iterator
+
+from src.tools.sanctions_store import strip_legal_suffixes
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+# Shorter patterns (after suffix stripping) would match ordinary words
+_MIN_PATTERN_CHARS = 4
+
+
+def fold_token(token: str) -> str:
+    """Lowercase a word and strip its accents"""
+    token = unicodedata.normalize("NFKD", token.lower())
+    return "".join(ch for ch in token if not unicodedata.combining(ch))
+
+
+def scan_tokens(text: str) -> Iterator[tuple[str, int, int]]:
+    """(folded word, start, end) for every word of text, offsets into text"""
+    for match in _TOKEN_RE.finditer(text):
+        yield fold_token(match.group()), match.start(), match.end()
+
+
+def name_pattern(name: str) -> tuple[str, ...]:
+    """Folded word sequence a list name is searched for as"""
+    tokens = [token for token, _, _ in scan_tokens(name)]
+    stripped = strip_legal_suffixes(tokens)
+    return tuple(stripped if len(stripped) > 1 else tokens)
+
+
+class WatchlistAutomaton:
+    """
+    Aho-Corasick automaton over list names, at word granularity
+
+    Node 0 is the root. goto[n] maps a word to the next node (None for a
+    leaf), fail[n] is the node of the longest proper suffix that is also a
+    pattern prefix, and outputs[n] holds the entry ids whose pattern ends at
+    n, with depth[n] words. next_output[n] skips to the nearest fail
+    ancestor with outputs, so reporting costs only the matches found.
+    """
+
+    def __init__(self, names: Sequence[str], removed: Iterable[int] = ()):
+        removed = set(removed)
+        self.goto = [{}]
+        depth = [0]
+        self.outputs = [()]
+        for entry_id, name in enumerate(names):
+            if entry_id in removed:
+                continue
+            pattern = name_pattern(name)
+            if sum(len(token) for token in pattern) < _MIN_PATTERN_CHARS:
+                continue
+            node = 0
+            for token in pattern:
+                if self.goto[node] is None:
+                    self.goto[node] = {}
+                child = self.goto[node].get(token)
+                if child is None:
+                    child = len(self.goto)
+                    self.goto[node][token] = child
+                    self.goto.append(None)
+                    depth.append(depth[node] + 1)
+                    self.outputs.append(())
+                node = child
+            self.outputs[node] += (entry_id,)
+        self.depth = array('I', depth)
+        self._link()
+
+    def _link(self) -> None:
+        """Failure and output links, breadth first"""
+        goto = self.goto
+        self.fail = array('I', bytes(4 * len(goto)))
+        self.next_output = array('I', bytes(4 * len(goto)))
+        queue = list(goto[0].values())
+        for node in queue:
+            if goto[node] is None:
+                continue
+            for token, child in goto[node].items():
+                state = self.fail[node]
+                while state and not (goto[state] and token in goto[state]):
+                    state = self.fail[state]
+                target = goto[state].get(token, 0) if goto[state] else 0
+                self.fail[child] = target
+                self.next_output[child] = target if self.outputs[target] else self.next_output[target]
+                queue.append(child)
+
+    def __len__(self) -> int:
+        return len(self.goto)
+
+    def scan(self, text: str) -> list[tuple[int, int, int]]:
+        """(entry_id, start, end) for every list name in text, in text order"""
+        goto = self.goto
+        mentions = []
+        starts = []
+        state = 0
+        for i, (token, start, end) in enumerate(scan_tokens(text)):
+            starts.append(start)
+            while state and not (goto[state] and token in goto[state]):
+                state = self.fail[state]
+            state = goto[state].get(token, 0) if goto[state] else 0
+
+            node = state if self.outputs[state] else self.next_output[state]
+            while node:
+                first = starts[i - self.depth[node] + 1]
+                mentions.extend((entry_id, first, end) for entry_id in self.outputs[node])
+                node = self.next_output[node]
+        mentions.sort(key=lambda m: (m[1], m[2], m[0]))
+        return mentions
@@ -0,0 +1,119 @@
+"""
+Sharded sanctions screening across a persistent process pool
+
+Fuzzy scoring holds the GIL, so one process uses one core. SanctionsShards
+splits the live entries into contiguous id ranges, one per worker process,
+and screens every query against all shards in parallel. Each worker keeps a
+SanctionsChecker over its shard for the life of the pool.
+
+Shard results carry global entry ids, and ids keep their relative order
+within a shard, so merging by (score, lowest id) gives exactly the results
+of a single-process checker.
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Sequence
+
+from src.tools.sanctions_store import SanctionsEntries
+
+# State of a worker process: the checker over its shard and the global id
+# of each shard entry
+_shard = None
+_shard_ids = None
+
+
+def _init_shard(rows: list[tuple[str, str, str]], entry_ids: list[int]) -> None:
+    global _shard, _shard_ids
+    # Imported here: sanctions_checker imports this module
+    from src.tools.sanctions_checker import SanctionsChecker
+    _shard = SanctionsChecker.from_rows(rows)
+    _shard_ids = entry_ids
+
+
+def _shard_size() -> int:
+    return len(_shard_ids)
+
+
+def _shard_best(company_name: str, name_key: str, threshold: int) -> tuple[int, Optional[int]]:
+    _shard.match_threshold = threshold
+    candidates = _shard.index.candidates(company_name, name_key, _shard.match_threshold)
+    score, entry_id = _shard._best(company_name, name_key, candidates)
+    return score, None if entry_id is None else _shard_ids[entry_id]
+
+
+def _shard_top(company_name: str, name_key: str, top_k: int, threshold: int) -> tuple[list[tuple], int]:
+    _shard.match_threshold = threshold
+    ranked, pruned = _shard._top(company_name, name_key, top_k)
+    return [(score, _shard_ids[entry_id], scores) for score, entry_id, scores in ranked], pruned
+
+
+def _shard_batch(queries: list[tuple[str, str]], threshold: int) -> list[tuple[int, Optional[int]]]:
+    _shard.match_threshold = threshold
+    results = []
+    for company_name, name_key in queries:
+        candidates = _shard.index.bulk_candidates(company_name, name_key, _shard.match_threshold)
+        score, entry_id = _shard._best(company_name, name_key, candidates)
+        results.append((score, None if entry_id is None else _shard_ids[entry_id]))
+    return results
+
+
+def _merge_best(results: list[tuple[int, Optional[int]]]) -> tuple[int, Optional[int]]:
+    """Highest score across shards, lowest entry id on a tie"""
+    found = [(score, entry_id) for score, entry_id in results if entry_id is not None]
+    if not found:
+        return 0, None
+    return min(found, key=lambda r: (-r[0], r[1]))
+
+
+class SanctionsShards:
+    """Live sanctions entries partitioned over one worker process per shard"""
+
+    def __init__(self, sanctions: SanctionsEntries, entry_ids: Sequence[int], workers: int):
+        entry_ids = list(entry_ids)
+        size = -(-len(entry_ids) // workers) if entry_ids else 1
+        # Spawned rather than forked: the parent may be running threads
+        context = multiprocessing.get_context("spawn")
+        self._pools = []
+        for start in range(0, max(len(entry_ids), 1), size):
+            ids = entry_ids[start:start + size]
+            rows = [(sanctions.names[i], sanctions.lists[i], sanctions.details[i]) for i in ids]
+            self._pools.append(ProcessPoolExecutor(
+                max_workers=1, mp_context=context,
+                initializer=_init_shard, initargs=(rows, ids),
+            ))
+
+        # Workers start on first use; build every shard now, in parallel
+        for future in [pool.submit(_shard_size) for pool in self._pools]:
+            future.result()
+
+    def __len__(self) -> int:
+        return len(self._pools)
+
+    def best(self, company_name: str, name_key: str, threshold: int) -> tuple[int, Optional[int]]:
+        """(best score, entry id) among the match candidates of every shard"""
+        futures = [pool.submit(_shard_best, company_name, name_key, threshold) for pool in self._pools]
+        return _merge_best([future.result() for future in futures])
+
+    def top(self, company_name: str, name_key: str, top_k: int, threshold: int) -> tuple[list[tuple], int]:
+        """Global top_k as (score, entry_id, scores), and entries pruned across shards"""
+        futures = [pool.submit(_shard_top, company_name, name_key, top_k, threshold)
+                   for pool in self._pools]
+        ranked, pruned = [], 0
+        for future in futures:
+            shard_ranked, shard_pruned = future.result()
+            ranked.extend(shard_ranked)
+            pruned += shard_pruned
+        ranked.sort(key=lambda r: (-r[0], r[1]))
+        return ranked[:top_k], pruned
+
+    def batch_best(self, queries: list[tuple[str, str]], threshold: int) -> list[tuple[int, Optional[int]]]:
+        """best() for each (name, key) query, every shard scanning the whole batch"""
+        futures = [pool.submit(_shard_batch, queries, threshold) for pool in self._pools]
+        per_shard = [future.result() for future in futures]
+        return [_merge_best(results) for results in zip(*per_shard)]
+
+    def close(self) -> None:
+        """Stop the worker processes"""
+        for pool in self._pools:
+            pool.shutdown(cancel_futures=True)
+        self._pools = []
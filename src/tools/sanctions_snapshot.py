@@ -0,0 +1,212 @@
+"""
+Compiled, memory-mappable sanctions list snapshots
+
+compile_snapshot() turns the pipe-delimited text list into one binary file
+holding a UTF-8 string table, per-entry offsets and the prebuilt n-gram
+index. load_snapshot() maps it read-only and wraps every section in a
+zero-copy memoryview, so start-up does no parsing and every process on a
+host shares the same physical pages.
+
+Layout: MAGIC | u64 header length | JSON header | sections (8-byte aligned)
+
+Compile with scripts/compile_sanctions_snapshot.py.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Optional
+
+from src.tools.sanctions_index import GRAM_SIZE, NGramIndex
+from src.tools.sanctions_store import SanctionsEntries, read_sanctions_file
+from src.tools.text_store import file_digest
+
+MAGIC = b"RLSNAP01"
+FORMAT_VERSION = 3
+_ALIGN = 8
+_COLUMNS = ("names", "lists", "details", "addresses", "identifiers", "lowered", "keys")
+_COUNTS = ("raw_len", "raw_grams", "key_len", "key_grams")
+
+
+class StringTable(Sequence):
+    """Strings decoded on access from a UTF-8 blob and start/end offsets"""
+
+    __slots__ = ("_blob", "_starts", "_ends")
+
+    def __init__(self, blob, starts, ends):
+        self._blob, self._starts, self._ends = blob, starts, ends
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return str(self._blob[self._starts[i]:self._ends[i]], "utf-8")
+
+
+def default_snapshot_path(source: Path) -> Path:
+    """Snapshot location used for a text list unless one is given"""
+    return Path(source).with_suffix(".snap")
+
+
+def source_digest(source: Path) -> str:
+    """SHA-256 of the text list a snapshot was compiled from, read in chunks"""
+    return file_digest(source)
+
+
+def compile_snapshot(source: Path, output: Optional[Path] = None) -> Path:
+    """Compile a text sanctions list into a snapshot file and return its path"""
+    source = Path(source)
+    output = Path(output) if output else default_snapshot_path(source)
+    entries = read_sanctions_file(source)
+    index = NGramIndex(entries.lowered, entries.keys)
+
+    sections = {}
+
+    # String table: identical strings (list names, details, names that are
+    # already lowercase) are stored once and shared through the offsets
+    blob = bytearray()
+    offsets = {}
+    for column in _COLUMNS:
+        starts, ends = array('I'), array('I')
+        for text in getattr(entries, column):
+            if text not in offsets:
+                data = text.encode("utf-8")
+                offsets[text] = (len(blob), len(blob) + len(data))
+                blob += data
+            start, end = offsets[text]
+            starts.append(start)
+            ends.append(end)
+        sections[f"{column}_start"] = starts
+        sections[f"{column}_end"] = ends
+    if len(blob) >= 2 ** 32:
+        raise ValueError("Sanctions list too large for a snapshot (string table over 4 GiB)")
+    sections["strings"] = bytes(blob)
+
+    for name in _COUNTS:
+        sections[name] = getattr(index, name)
+
+    # Postings: grams are fixed-width ASCII, lists are concatenated
+    grams = sorted(index.postings)
+    posting_offsets, postings = array('I', [0]), array('I')
+    for gram in grams:
+        postings.extend(index.postings[gram])
+        posting_offsets.append(len(postings))
+    sections["grams"] = "".join(grams).encode("ascii")
+    sections["posting_offsets"] = posting_offsets
+    sections["postings"] = postings
+
+    for prefix, buckets in (("raw", index.raw_buckets), ("key", index.key_buckets)):
+        lengths, bounds = array('I'), array('I', [0])
+        counts, ids = array('I'), array('I')
+        for length, (bucket_counts, bucket_ids) in buckets.buckets.items():
+            lengths.append(length)
+            counts.extend(bucket_counts)
+            ids.extend(bucket_ids)
+            bounds.append(len(ids))
+        sections[f"{prefix}_bucket_lengths"] = lengths
+        sections[f"{prefix}_bucket_bounds"] = bounds
+        sections[f"{prefix}_bucket_counts"] = counts
+        sections[f"{prefix}_bucket_ids"] = ids
+
+    header = {
+        "format": FORMAT_VERSION,
+        "gram_size": GRAM_SIZE,
+        "byteorder": sys.byteorder,
+        "entries": len(entries),
+        "source": str(source),
+        "source_sha256": source_digest(source),
+        "sections": {},
+    }
+    _write(output, header, sections)
+    return output
+
+
+def _write(output: Path, header: dict, sections: dict) -> None:
+    """Write sections after the header, replacing output atomically"""
+    offset = 0
+    for name, data in sections.items():
+        typecode = data.typecode if isinstance(data, array) else "B"
+        nbytes = len(data) * (data.itemsize if isinstance(data, array) else 1)
+        header["sections"][name] = [offset, nbytes, typecode]
+        offset = _aligned(offset + nbytes)
+
+    header_bytes = json.dumps(header).encode("utf-8")
+    base = _aligned(len(MAGIC) + 8 + len(header_bytes))
+
+    tmp = output.with_name(output.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header_bytes)))
+        f.write(header_bytes)
+        for name, data in sections.items():
+            f.write(b"\0" * (base + header["sections"][name][0] - f.tell()))
+            f.write(data.tobytes() if isinstance(data, array) else data)
+    # Readers that already mapped the old file keep its inode
+    os.replace(tmp, output)
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+def load_snapshot(path: Path) -> tuple[dict, SanctionsEntries, NGramIndex]:
+    """
+    Map a snapshot read-only
+
+    Returns (header, entries, index). Raises ValueError if the file is not a
+    snapshot this build can read.
+    """
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+
+    if bytes(view[:len(MAGIC)]) != MAGIC:
+        raise ValueError(f"Not a sanctions snapshot: {path}")
+    (header_len,) = struct.unpack_from("<Q", view, len(MAGIC))
+    start = len(MAGIC) + 8
+    header = json.loads(bytes(view[start:start + header_len]))
+    if header["format"] != FORMAT_VERSION or header["gram_size"] != GRAM_SIZE \
+            or header["byteorder"] != sys.byteorder:
+        raise ValueError(f"Incompatible sanctions snapshot: {path}")
+    base = _aligned(start + header_len)
+
+    def section(name: str) -> memoryview:
+        offset, nbytes, typecode = header["sections"][name]
+        return view[base + offset:base + offset + nbytes].cast(typecode)
+
+    strings = section("strings")
+    columns = {
+        column: StringTable(strings, section(f"{column}_start"), section(f"{column}_end"))
+        for column in _COLUMNS
+    }
+    entries = SanctionsEntries.from_columns(**columns)
+
+    grams = bytes(section("grams")).decode("ascii")
+    posting_offsets, postings = section("posting_offsets"), section("postings")
+    posting_map = {
+        grams[i * GRAM_SIZE:(i + 1) * GRAM_SIZE]: postings[posting_offsets[i]:posting_offsets[i + 1]]
+        for i in range(len(posting_offsets) - 1)
+    }
+
+    buckets = {}
+    for prefix in ("raw", "key"):
+        lengths, bounds = section(f"{prefix}_bucket_lengths"), section(f"{prefix}_bucket_bounds")
+        counts, ids = section(f"{prefix}_bucket_counts"), section(f"{prefix}_bucket_ids")
+        buckets[prefix] = {
+            length: (counts[bounds[i]:bounds[i + 1]], ids[bounds[i]:bounds[i + 1]])
+            for i, length in enumerate(lengths)
+        }
+
+    index = NGramIndex.from_arrays(
+        entries.lowered, entries.keys,
+        *(section(name) for name in _COUNTS),
+        postings=posting_map, raw_buckets=buckets["raw"], key_buckets=buckets["key"],
+    )
+    return header, entries, index
+
@@ -0,0 +1,141 @@
+"""Compact store of normalised sanctions entries"""
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence
+
+from fuzzywuzzy import utils
+
+from src.tools.sanctions_import import detect_format, import_rows
+
+# Legal-form suffixes the phonetic and free-text matchers drop from the end
+# of a name, so "Blocked Enterprises LLC" and "Blocked Enterprises Inc" agree
+LEGAL_SUFFIXES = frozenset({
+    "ltd", "limited", "llc", "llp", "lp", "inc", "incorporated",
+    "corp", "corporation", "co", "company", "plc", "gmbh", "ag", "sa", "bv", "nv",
+})
+
+
+def normalize_name(name: str) -> str:
+    """
+    Matching key for a lowercased name
+
+    Strips punctuation (fuzzywuzzy's full_process) and sorts the tokens, the
+    form token_sort_ratio compares, so fuzz.ratio on two keys is the names'
+    token_sort_ratio.
+    """
+    return " ".join(sorted(utils.full_process(name, force_ascii=True).split()))
+
+
+def strip_legal_suffixes(tokens: list[str]) -> list[str]:
+    """Drop trailing legal-form tokens, keeping at least one token"""
+    end = len(tokens)
+    while end > 1 and tokens[end - 1] in LEGAL_SUFFIXES:
+        end -= 1
+    return tokens[:end]
+
+
+class SanctionsEntries:
+    """
+    Sanctions entries held as parallel arrays
+
+    Entry i is (names[i], lists[i], details[i], addresses[i], identifiers[i]);
+    the last two are "" when the list line has none. The lowercased name and the
+    normalize_name key are computed once on append, so screening never
+    re-normalises list entries. List names and details repeat heavily and are
+    interned.
+    """
+
+    __slots__ = ("names", "lists", "details", "addresses", "identifiers", "lowered", "keys")
+
+    def __init__(self):
+        self.names: Sequence[str] = []
+        self.lists: Sequence[str] = []
+        self.details: Sequence[str] = []
+        self.addresses: Sequence[str] = []
+        self.identifiers: Sequence[str] = []
+        self.lowered: Sequence[str] = []
+        self.keys: Sequence[str] = []
+
+    @classmethod
+    def from_columns(cls, names: Sequence[str], lists: Sequence[str], details: Sequence[str],
+                     addresses: Sequence[str], identifiers: Sequence[str],
+                     lowered: Sequence[str], keys: Sequence[str]) -> "SanctionsEntries":
+        """Read-only store over prebuilt columns, e.g. a mapped snapshot"""
+        entries = cls()
+        entries.names, entries.lists, entries.details = names, lists, details
+        entries.addresses, entries.identifiers = addresses, identifiers
+        entries.lowered, entries.keys = lowered, keys
+        return entries
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def thaw(self) -> None:
+        """Copy read-only (mapped) columns into lists so entries can be appended"""
+        for column in self.__slots__:
+            if not isinstance(getattr(self, column), list):
+                setattr(self, column, list(getattr(self, column)))
+
+    def append(self, name: str, list_name: str, details: str = "", address: str = "",
+               identifiers: str = "") -> None:
+        lowered = name.lower()
+        self.names.append(name)
+        self.lists.append(sys.intern(list_name))
+        self.details.append(sys.intern(details))
+        self.addresses.append(sys.intern(address))
+        self.identifiers.append(sys.intern(identifiers))
+        self.lowered.append(lowered)
+        self.keys.append(normalize_name(lowered))
+
+    def entry(self, entry_id: int) -> dict:
+        """Entry as the {"name", "list", "details"} dict used by callers"""
+        return {
+            "name": self.names[entry_id],
+            "list": self.lists[entry_id],
+            "details": self.details[entry_id],
+        }
+
+    def row(self, entry_id: int) -> tuple[str, str, str, str, str]:
+        """Entry as the (name, list, details, address, identifiers) row it was parsed from"""
+        return (self.names[entry_id], self.lists[entry_id], self.details[entry_id],
+                self.addresses[entry_id], self.identifiers[entry_id])
+
+
+def parse_sanctions_file(path: Path) -> Iterator[tuple[str, str, str, str, str]]:
+    """
+    Rows (name, list, details, address, identifiers) of a sanctions list file
+
+    The pipe-delimited list is parsed here; OFAC / EU XML and CSV lists are
+    recognised from their content and streamed by sanctions_import.
+    """
+    fmt = detect_format(path)
+    if fmt != "pipe":
+        yield from import_rows(path, fmt)
+        return
+
+    # Entity Name | List Name | Details | Address | Identifiers
+    # Details, address and identifiers (';'-separated accounts, IBANs or
+    # registration numbers) are optional and default to ""
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                parts = line.split('|')
+                if len(parts) >= 2:
+                    parts = [part.strip() for part in parts[:5]]
+                    yield tuple(parts + [""] * (5 - len(parts)))
+
+
+def read_sanctions_file(path: Path) -> SanctionsEntries:
+    """Parse a pipe-delimited list into a SanctionsEntries store"""
+    sanctions = SanctionsEntries()
+    for row in parse_sanctions_file(path):
+        sanctions.append(*row)
+    return sanctions
+
+
+def diff_rows(old: Iterable[tuple], new: Iterable[tuple]) -> tuple[list[tuple], list[tuple]]:
+    """Rows (added, removed) going from old to new, compared as multisets"""
+    old_counts, new_counts = Counter(old), Counter(new)
+    return list((new_counts - old_counts).elements()), list((old_counts - new_counts).elements())
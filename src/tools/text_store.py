@@ -0,0 +1,113 @@
+"""
+Compressed store of extracted document text, kept next to each upload
+
+PDF text used to be thrown away once the fields were matched, so a
+reprocessed session, the risk explanation prompt or anything else wanting
+the document's words had to parse the PDF again. The text is kept per
+document instead, zlib-compressed, in a ".text" directory beside the
+upload and named by the SHA-256 of the document bytes:
+
+    uploads/acme_20240101_120000_ab12cd34.pdf
+    uploads/.text/<sha256>.txt.z
+
+Copies of one document in the same directory share a file, and the text
+lives exactly as long as the uploads it sits next to; unlike
+PDFExtractionCache nothing is evicted. Each file starts with a JSON
+header recording the text version it was extracted with, why the read
+stopped early, if it did, and any fields matched as it was read; text
+from another version is not served.
+"""
+import hashlib
+import json
+import os
+import threading
+import zlib
+from pathlib import Path
+from typing import Optional
+
+
+def file_digest(path) -> str:
+    """SHA-256 of a file's bytes, read in 1 MiB chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(2**20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DocumentTextStore:
+    """
+    Extracted text per document, compressed, beside the document
+
+    A truncated read is kept with its reason, so a document that hit the
+    extractor's page, size or text limits once is not read to the limit
+    again on every re-run. The caller leaves out reads cut short by a time
+    budget, which depend on the clock.
+    """
+
+    def __init__(self, dirname: str = ".text", level: int = 6):
+        self.dirname = dirname
+        self.level = level
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def path_for(self, document_path, digest: str) -> Path:
+        """Where the text of a document with this digest is kept"""
+        return Path(document_path).parent / self.dirname / f"{digest}.txt.z"
+
+    def get(self, document_path, digest: str, text_version: str,
+            truncation: Optional[list] = None) -> Optional[tuple[str, Optional[dict]]]:
+        """
+        (text, fields stored with it or None) of a document, or None unless
+        it was extracted with text_version
+
+        If the stored read was truncated, its reason is appended to
+        truncation.
+        """
+        try:
+            data = zlib.decompress(self.path_for(document_path, digest).read_bytes())
+            header, text = data.decode("utf-8").split("\n", 1)
+            header = json.loads(header)
+        except (OSError, ValueError, zlib.error):
+            header, text = None, None
+
+        with self._lock:
+            if not header or header.get("text_version") != text_version:
+                self.misses += 1
+                return None
+            self.hits += 1
+        if header.get("truncated") and truncation is not None:
+            truncation.append(header["truncated"])
+        return text, header.get("fields")
+
+    def put(self, document_path, digest: str, text_version: str, text: str,
+            truncated: Optional[str] = None, fields: Optional[dict] = None) -> Path:
+        """
+        Store a document's text, replacing any stored with another version
+
+        fields are for values that cannot be matched again from the text
+        alone, such as those matched page by page.
+        """
+        path = self.path_for(document_path, digest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        header = {"text_version": text_version, "truncated": truncated}
+        if fields is not None:
+            header["fields"] = fields
+        header = json.dumps(header)
+        data = zlib.compress(f"{header}\n{text}".encode("utf-8"), self.level)
+        # Written aside and renamed, so a concurrent reader never sees half a file
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        return path
+
+    def stats(self) -> dict:
+        """Hit and miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }